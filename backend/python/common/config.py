@@ -7,6 +7,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, Optional, Any
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +95,13 @@ class SOAPConfig:
                 f"corp_user={self.corp_user})")
 
 
+# DataLayerConfig.from_env() memo: cls -> (source sections, built_at, config).
+# 30 s matches the secrets vault's value cache.
+_FROM_ENV_TTL_SECONDS = 30.0
+_from_env_cache: Dict[type, tuple] = {}
+_from_env_lock = threading.Lock()
+
+
 @dataclass
 class DataLayerConfig:
     """
@@ -124,12 +133,33 @@ class DataLayerConfig:
         """
         Load configuration from unified config system (YAML + vault).
 
+        Request handlers call this on every SOAP call, so the built config is
+        shared while the database/apis sections are the same objects (an
+        update_config or reload swaps them) and for at most
+        _FROM_ENV_TTL_SECONDS, so rotated secrets are picked up on the same
+        schedule as the vault's own cache. Treat the result as read-only.
+
         Returns:
             DataLayerConfig: Configuration loaded from config system
         """
         from common.config_loader import get_config
 
         app_config = get_config()
+        sections = (app_config.database, app_config.apis)
+        with _from_env_lock:
+            cached = _from_env_cache.get(cls)
+        if (cached is not None
+                and all(a is b for a, b in zip(cached[0], sections))
+                and time.monotonic() - cached[1] < _FROM_ENV_TTL_SECONDS):
+            return cached[2]
+
+        config = cls._build_from_app_config(app_config)
+        with _from_env_lock:
+            _from_env_cache[cls] = (sections, time.monotonic(), config)
+        return config
+
+    @classmethod
+    def _build_from_app_config(cls, app_config) -> 'DataLayerConfig':
         databases = {}
 
         # Load PostgreSQL/PBI configuration from database.yaml
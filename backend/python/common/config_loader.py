@@ -5,15 +5,33 @@ Loads configuration from YAML files and resolves secrets from vault.
 Provides a single source of truth for all application configuration.
 """
 
+import copy
+import json
 import os
+import tempfile
+import threading
 import yaml
 import logging
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, Optional
 from dataclasses import dataclass, field
 
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes — no advisory locking, writes stay atomic
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader/dumper when PyYAML was built against it (several
+# times faster); same safe-subset semantics as yaml.safe_load/safe_dump,
+# pure-Python fallback otherwise.
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+if _YAML_LOADER is yaml.SafeLoader:
+    logger.warning("PyYAML built without libyaml; config YAML uses the pure-Python parser")
+
 
 def _load_root_env():
     """Load root .env file for bootstrap secrets (VAULT_MASTER_KEY)."""
@@ -33,6 +51,159 @@ def _load_root_env():
 _load_root_env()
 
 
+# Parsed YAML keyed by path -> ((st_mtime_ns, st_size), data), least recently
+# used first. Edits go through write_yaml_atomic (os.replace), which always
+# changes the stat key and writes the new parse through to the cache.
+_YAML_CACHE_MAX_ENTRIES = 32
+_yaml_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_yaml_cache_lock = threading.Lock()
+
+
+def _yaml_cache_put(cache_key: str, stat_key: tuple, data: Any) -> None:
+    with _yaml_cache_lock:
+        _yaml_cache[cache_key] = (stat_key, data)
+        _yaml_cache.move_to_end(cache_key)
+        while len(_yaml_cache) > _YAML_CACHE_MAX_ENTRIES:
+            _yaml_cache.popitem(last=False)
+
+
+def parse_yaml(text: str) -> Any:
+    """Parse YAML text with the same (libyaml when available) safe loader as the config files."""
+    return yaml.load(text, Loader=_YAML_LOADER)
+
+
+def dump_yaml(data: Any, stream=None):
+    """Dump `data` the way config files are written; returns a str when no stream is given."""
+    return yaml.dump(data, stream, Dumper=_YAML_DUMPER, default_flow_style=False, sort_keys=False)
+
+
+def _sidecar_path(path: Path) -> Path:
+    return path.with_name(f'.{path.name}.json')
+
+
+def _read_sidecar(path: Path, stat_key: tuple) -> Optional[Any]:
+    """Return the sidecar's data if it was generated from this exact YAML file."""
+    try:
+        with open(_sidecar_path(path), 'rb') as f:
+            sidecar = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(sidecar, dict) or sidecar.get('source') != list(stat_key):
+        return None
+    return sidecar.get('data')
+
+
+def _write_sidecar(path: Path, stat_key: tuple, data: Any) -> None:
+    """
+    Best-effort JSON copy of a parsed YAML file, tagged with the YAML's stat key.
+
+    Only written when the data survives a JSON round-trip unchanged (no dates,
+    non-string keys, ...) so a sidecar read is always equivalent to a YAML
+    parse; otherwise any stale sidecar is removed. Never raises.
+    """
+    sidecar = _sidecar_path(path)
+    tmp_path = None
+    try:
+        encoded = json.dumps({'source': list(stat_key), 'data': data}, separators=(',', ':'))
+        if json.loads(encoded)['data'] != data:
+            raise ValueError("not JSON round-trippable")
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(encoded)
+        os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        os.replace(tmp_path, sidecar)
+    except (TypeError, ValueError):
+        try:
+            sidecar.unlink()
+        except OSError:
+            pass
+    except OSError as e:
+        logger.debug(f"Could not write JSON sidecar for {path.name}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def load_yaml_cached(path: Path) -> Dict[str, Any]:
+    """
+    Parse a YAML file, reusing the previous parse while the file is unchanged.
+
+    The file is stat'ed on every call and only re-parsed when its
+    (mtime_ns, size) differs from the cached entry. Callers get a deep copy,
+    so mutating the result (the admin editor does) never leaks into the cache.
+
+    A cold read (new process, or the file changed) first tries the hidden
+    `.<name>.json` sidecar, which is only trusted when it was generated from
+    the current (mtime_ns, size); otherwise the YAML is parsed and the
+    sidecar regenerated. JSON decoding skips the YAML state machine entirely.
+    """
+    path = Path(path)
+    st = path.stat()
+    stat_key = (st.st_mtime_ns, st.st_size)
+    cache_key = str(path)
+
+    with _yaml_cache_lock:
+        entry = _yaml_cache.get(cache_key)
+        if entry is not None and entry[0] == stat_key:
+            _yaml_cache.move_to_end(cache_key)
+    if entry is not None and entry[0] == stat_key:
+        return copy.deepcopy(entry[1])
+
+    data = _read_sidecar(path, stat_key)
+    if data is None:
+        with open(path, 'r') as f:
+            data = yaml.load(f, Loader=_YAML_LOADER) or {}
+        _write_sidecar(path, stat_key, data)
+    _yaml_cache_put(cache_key, stat_key, data)
+    return copy.deepcopy(data)
+
+
+def write_yaml_atomic(path: Path, data: Any) -> None:
+    """
+    Write `data` as YAML to `path` without ever exposing a partial file.
+
+    Concurrent writers are serialized with an exclusive flock on a sibling
+    `<name>.lock` file (the config file itself is replaced, so it can't hold
+    the lock). The new content goes to a temp file in the same directory and
+    is swapped in with os.replace, so readers see either the old or the new
+    file, and a crash mid-write leaves the original untouched.
+
+    On success the written data is stored in the load_yaml_cached cache under
+    the new file's stat key, so the next read doesn't re-parse what we just
+    wrote, and the JSON sidecar is refreshed for other processes' cold reads.
+    On failure the entry is dropped.
+    """
+    path = Path(path)
+    cache_key = str(path)
+    lock_path = path.with_name(path.name + '.lock')
+    with open(lock_path, 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    dump_yaml(data, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                if path.exists():
+                    os.chmod(tmp_path, path.stat().st_mode & 0o777)
+                os.replace(tmp_path, path)
+                st = path.stat()
+                stat_key = (st.st_mtime_ns, st.st_size)
+                _yaml_cache_put(cache_key, stat_key,
+                                copy.deepcopy(data) if data is not None else {})
+                _write_sidecar(path, stat_key, data if data is not None else {})
+            except BaseException:
+                with _yaml_cache_lock:
+                    _yaml_cache.pop(cache_key, None)
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
 class ConfigSection:
     """
     Dynamic configuration section that allows dot-notation access.
@@ -176,8 +347,7 @@ class AppConfig:
         for yaml_file in self._config_dir.glob("*.yaml"):
             section_name = yaml_file.stem  # filename without extension
             try:
-                with open(yaml_file, 'r') as f:
-                    data = yaml.safe_load(f) or {}
+                data = load_yaml_cached(yaml_file)
                 self._sections[section_name] = ConfigSection(data, self._vault)
                 logger.debug(f"Loaded config: {section_name}")
             except Exception as e:
@@ -277,8 +447,7 @@ class AppConfig:
         """
         yaml_file = self._config_dir / f"{section}.yaml"
         try:
-            with open(yaml_file, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            write_yaml_atomic(yaml_file, data)
 
             # Reload the section
             self._sections[section] = ConfigSection(data, self._vault)
@@ -292,8 +461,7 @@ class AppConfig:
         """Get raw config data for a section (for editing)."""
         yaml_file = self._config_dir / f"{section}.yaml"
         if yaml_file.exists():
-            with open(yaml_file, 'r') as f:
-                return yaml.safe_load(f) or {}
+            return load_yaml_cached(yaml_file)
         return {}
 
 
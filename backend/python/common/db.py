@@ -54,10 +54,20 @@ logger = logging.getLogger(__name__)
 # idle connections aggressively and stale-conn errors otherwise surface
 # in callers. pool_recycle=300 keeps idle conns young enough that Azure
 # never beats us to closing them.
+#
+# pbi serves the analytics reads (ECRI, rentroll, pricing). Their big row
+# estimates push them past jit_above_cost while the queries themselves are
+# short, so JIT compile time is overhead rather than a win — it is turned off
+# per connection. The larger compiled-statement cache keeps the many distinct
+# report queries from evicting each other.
 POOL_CONFIG: dict[str, dict] = {
     'backend':    {'pool_size': 5, 'max_overflow': 10},
     'middleware': {'pool_size': 5, 'max_overflow': 10},
-    'pbi':        {'pool_size': 5, 'max_overflow': 10},
+    'pbi':        {
+        'pool_size': 5, 'max_overflow': 10,
+        'connect_args': {'options': '-c jit=off'},
+        'query_cache_size': 1200,
+    },
 }
 _POOL_DEFAULTS = {
     'pool_pre_ping': True,
@@ -205,6 +205,12 @@ class RentRoll(Base, BaseModel, TimestampMixin):
         Index('idx_rentroll_tenant', 'TenantID'),
         Index('idx_rentroll_rented', 'bRented'),
         Index('idx_rentroll_site_rented', 'SiteID', 'bRented'),
+        # Per-ledger snapshot history (ECRI rent-bump windows).
+        Index(
+            'idx_rentroll_site_ledger_extract',
+            'SiteID', 'LedgerID', 'extract_date',
+            postgresql_include=['dcRent', 'bRented'],
+        ),
     )
 
 
@@ -1545,6 +1551,16 @@ class CcwsLedger(Base, BaseModel, TimestampMixin):
         Index('idx_ccws_ledger_paid_thru', 'dPaidThru'),
         Index('idx_ccws_ledger_moved_in', 'dMovedIn'),
         Index('idx_ccws_ledger_sched_out', 'dSchedOut'),
+        # ECRI eligibility (vw_ecri_eligible_ledgers): site filter + ledger
+        # order, carrying the ledger columns the view reads.
+        Index(
+            'idx_ccws_ledger_active_site',
+            'SiteID', 'LedgerID',
+            postgresql_include=[
+                'UnitID', 'TenantID', 'TenantName', 'dMovedIn', 'dSchedOut',
+                'dcRent', 'dPaidThru', 'dAnniv', 'extract_date',
+            ],
+        ),
     )
 
 
@@ -2513,31 +2529,39 @@ class ECRIBatch(Base, BaseModel):
     __table_args__ = (
         Index('idx_ecri_batches_status', 'status'),
         Index('idx_ecri_batches_created', 'created_at'),
+        # Executed-batch listing ordered by executed_at (analytics summary).
+        Index('idx_ecri_batches_status_executed', 'status', 'executed_at'),
     )
 
     def to_dict(self):
+        return self.dict_from_row(self)
+
+    @staticmethod
+    def dict_from_row(r):
+        """to_dict() for an ECRIBatch or a plain row of its columns (list views
+        select the columns directly and skip ORM hydration)."""
         return {
-            'batch_id': str(self.batch_id),
-            'name': self.name,
-            'batch_type': self.batch_type or 'standard',
-            'site_ids': self.site_ids,
-            'target_increase_pct': float(self.target_increase_pct) if self.target_increase_pct else None,
-            'control_group_enabled': self.control_group_enabled,
-            'group_config': self.group_config,
-            'total_ledgers': self.total_ledgers,
-            'status': self.status,
-            'created_by': self.created_by,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'executed_at': self.executed_at.isoformat() if self.executed_at else None,
-            'cancelled_at': self.cancelled_at.isoformat() if self.cancelled_at else None,
-            'min_tenure_months': self.min_tenure_months,
-            'notice_period_days': self.notice_period_days,
-            'discount_reference_pct': float(self.discount_reference_pct) if self.discount_reference_pct else None,
-            'attribution_window_days': self.attribution_window_days,
-            'notes': self.notes,
-            'site_review_deadline': self.site_review_deadline.isoformat() if self.site_review_deadline else None,
-            'submitted_for_review_at': self.submitted_for_review_at.isoformat() if self.submitted_for_review_at else None,
-            'submitted_for_review_by': self.submitted_for_review_by,
+            'batch_id': str(r.batch_id),
+            'name': r.name,
+            'batch_type': r.batch_type or 'standard',
+            'site_ids': r.site_ids,
+            'target_increase_pct': float(r.target_increase_pct) if r.target_increase_pct else None,
+            'control_group_enabled': r.control_group_enabled,
+            'group_config': r.group_config,
+            'total_ledgers': r.total_ledgers,
+            'status': r.status,
+            'created_by': r.created_by,
+            'created_at': r.created_at.isoformat() if r.created_at else None,
+            'executed_at': r.executed_at.isoformat() if r.executed_at else None,
+            'cancelled_at': r.cancelled_at.isoformat() if r.cancelled_at else None,
+            'min_tenure_months': r.min_tenure_months,
+            'notice_period_days': r.notice_period_days,
+            'discount_reference_pct': float(r.discount_reference_pct) if r.discount_reference_pct else None,
+            'attribution_window_days': r.attribution_window_days,
+            'notes': r.notes,
+            'site_review_deadline': r.site_review_deadline.isoformat() if r.site_review_deadline else None,
+            'submitted_for_review_at': r.submitted_for_review_at.isoformat() if r.submitted_for_review_at else None,
+            'submitted_for_review_by': r.submitted_for_review_by,
         }
 
 
@@ -2610,6 +2634,13 @@ class ECRIBatchLedger(Base, BaseModel):
     discount_expires = Column(Date, nullable=True,
                               comment="derived move-in discount expiration (recent_movein segment only)")
 
+    # Latest ecri_outcomes row for this ledger, copied by the
+    # trg_ecri_outcomes_sync_ledger trigger (migration
+    # 20261018_ecri_ledger_outcome_type_pbi.sql). Never written from Python.
+    outcome_type = Column(String(20), nullable=True,
+                          comment="copy of the latest ecri_outcomes.outcome_type (trigger-maintained)")
+    outcome_recorded_at = Column(DateTime, nullable=True)
+
     # API execution
     api_status = Column(String(20), nullable=False, default='pending', comment="pending/success/failed/skipped")
     api_response = Column(JSONB, nullable=True)
@@ -2632,6 +2663,7 @@ class ECRIBatchLedger(Base, BaseModel):
         Index('idx_ecri_bl_api_status', 'api_status'),
         Index('idx_ecri_bl_control_group', 'batch_id', 'control_group'),
         Index('idx_ecri_bl_exclusion_status', 'batch_id', 'exclusion_status'),
+        Index('idx_ecri_bl_batch_outcome', 'batch_id', 'outcome_type'),
     )
 
     def to_dict(self):
@@ -2706,6 +2738,13 @@ class ECRIOutcome(Base, BaseModel):
         Index('idx_ecri_outcomes_batch', 'batch_id'),
         Index('idx_ecri_outcomes_ledger', 'site_id', 'ledger_id'),
         Index('idx_ecri_outcomes_type', 'outcome_type'),
+        # Latest outcome per (batch, ledger): the lookup the
+        # trg_ecri_outcomes_sync_ledger trigger runs on every outcome write.
+        Index(
+            'idx_ecri_outcomes_batch_ledger',
+            'batch_id', 'ledger_id', 'id',
+            postgresql_include=['outcome_type'],
+        ),
     )
 
     def to_dict(self):
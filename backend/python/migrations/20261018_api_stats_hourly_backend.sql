@@ -0,0 +1,47 @@
+-- Target DB: esa_backend
+-- Hourly rollup of api_statistics for the /api/statistics summary, endpoints
+-- and timeline views. Each of those used to re-aggregate every raw row in
+-- the 1d-90d window on a cache miss; they now sum at most one row per
+-- (endpoint, method, classification, hour) and only read raw rows for the
+-- partial hours at either edge of the window (see _api_stats_hourly in
+-- web/routes/api.py).
+--
+-- is_probe mirrors _apply_classification (status_code = 404).
+-- sum_rt_sq is kept so a stddev can be derived without touching raw rows.
+--
+-- Refreshed every 5 minutes by the api_stats_rollup sync_service pipeline
+-- (migrations/mw_seed_api_stats_rollup.py). Apply this before deploying the
+-- web change: the statistics endpoints read the view unconditionally.
+--
+-- Run from dev machine:
+--   PGPASSWORD=<DB_PASSWORD> psql -h <backend-host> -U <user> -d esa_backend \
+--     -f backend/python/migrations/20261018_api_stats_hourly_backend.sql
+
+BEGIN;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS api_stats_hourly AS
+SELECT endpoint,
+       method,
+       (status_code = 404)                                   AS is_probe,
+       date_trunc('hour', called_at)                         AS h,
+       count(*)                                              AS calls,
+       sum(response_time_ms)                                 AS sum_rt,
+       sum(response_time_ms * response_time_ms)              AS sum_rt_sq,
+       max(response_time_ms)                                 AS max_rt,
+       sum(CASE WHEN status_code >= 400 THEN 1 ELSE 0 END)   AS errors
+  FROM api_statistics
+ GROUP BY 1, 2, 3, 4
+WITH NO DATA;
+
+-- Required for REFRESH ... CONCURRENTLY.
+CREATE UNIQUE INDEX IF NOT EXISTS ux_api_stats_hourly
+    ON api_stats_hourly (endpoint, method, is_probe, h);
+
+-- Window filters and the max(h) watermark lookup.
+CREATE INDEX IF NOT EXISTS ix_api_stats_hourly_h
+    ON api_stats_hourly (h);
+
+-- Initial load (non-concurrent; the view is empty).
+REFRESH MATERIALIZED VIEW api_stats_hourly;
+
+COMMIT;
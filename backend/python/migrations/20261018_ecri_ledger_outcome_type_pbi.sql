@@ -0,0 +1,83 @@
+-- Target DB: esa_pbi
+-- Denormalises each ledger's ECRI outcome onto ecri_batch_ledgers
+-- (outcome_type, outcome_recorded_at) so the analytics endpoints
+-- (api_analytics_summary, api_batch_outcomes) group one table instead of
+-- joining ecri_outcomes and picking the latest row per ledger.
+--
+-- A trigger on ecri_outcomes keeps the copy in step with every writer (the
+-- ecri_outcome_tracking pipeline, manual fixes): on insert/update/delete the
+-- affected ledger rows take the latest remaining outcome for their
+-- (batch_id, site_id, ledger_id), or NULL when none is left.
+--
+-- Run from dev machine:
+--   PGPASSWORD=<VM_SSH_PASSWORD> psql -h esapbi.postgres.database.azure.com \
+--     -U esa_pbi_admin -d esa_pbi \
+--     -f backend/python/migrations/20261018_ecri_ledger_outcome_type_pbi.sql
+
+BEGIN;
+
+ALTER TABLE ecri_batch_ledgers
+    ADD COLUMN IF NOT EXISTS outcome_type VARCHAR(20),
+    ADD COLUMN IF NOT EXISTS outcome_recorded_at TIMESTAMP;
+
+COMMENT ON COLUMN ecri_batch_ledgers.outcome_type IS
+    'copy of the latest ecri_outcomes.outcome_type (trigger-maintained)';
+
+-- Re-derive one ledger's copy from its latest remaining outcome. With no
+-- outcome left the subquery yields no row and both columns go NULL.
+CREATE OR REPLACE FUNCTION ecri_ledger_outcome_refresh(
+    p_batch_id uuid, p_site_id int, p_ledger_id int
+) RETURNS void AS $$
+    UPDATE ecri_batch_ledgers bl
+       SET (outcome_type, outcome_recorded_at) = (
+            SELECT o.outcome_type, o.created_at
+              FROM ecri_outcomes o
+             WHERE o.batch_id = p_batch_id
+               AND o.site_id = p_site_id
+               AND o.ledger_id = p_ledger_id
+             ORDER BY o.id DESC
+             LIMIT 1
+       )
+     WHERE bl.batch_id = p_batch_id
+       AND bl.site_id = p_site_id
+       AND bl.ledger_id = p_ledger_id;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION ecri_outcomes_sync_ledger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM ecri_ledger_outcome_refresh(OLD.batch_id, OLD.site_id, OLD.ledger_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM ecri_ledger_outcome_refresh(NEW.batch_id, NEW.site_id, NEW.ledger_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_ecri_outcomes_sync_ledger ON ecri_outcomes;
+
+CREATE TRIGGER trg_ecri_outcomes_sync_ledger
+    AFTER INSERT OR UPDATE OR DELETE ON ecri_outcomes
+    FOR EACH ROW
+    EXECUTE FUNCTION ecri_outcomes_sync_ledger();
+
+-- Backfill from the outcomes already recorded.
+UPDATE ecri_batch_ledgers bl
+   SET outcome_type = o.outcome_type,
+       outcome_recorded_at = o.created_at
+  FROM (
+        SELECT DISTINCT ON (batch_id, site_id, ledger_id)
+               batch_id, site_id, ledger_id, outcome_type, created_at
+          FROM ecri_outcomes
+         ORDER BY batch_id, site_id, ledger_id, id DESC
+  ) o
+ WHERE bl.batch_id = o.batch_id
+   AND bl.site_id = o.site_id
+   AND bl.ledger_id = o.ledger_id;
+
+COMMIT;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ecri_bl_batch_outcome
+    ON ecri_batch_ledgers (batch_id, outcome_type);
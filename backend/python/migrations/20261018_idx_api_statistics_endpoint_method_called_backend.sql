@@ -0,0 +1,15 @@
+-- Target DB: esa_backend
+-- Covering index for GET /api/statistics/slow-endpoints. The query filters
+-- called_at >= since, optionally on status_code (internal/probes
+-- classification), groups by (endpoint, method) and computes avg, max and
+-- p50/p95/p99 of response_time_ms. With every column it reads in the index
+-- the aggregate runs as an index-only scan in group order instead of
+-- visiting the heap row by row.
+--
+-- Run from dev machine:
+--   PGPASSWORD=<DB_PASSWORD> psql -h <backend-host> -U <user> -d esa_backend \
+--     -f backend/python/migrations/20261018_idx_api_statistics_endpoint_method_called_backend.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_api_stats_endpoint_method_called
+    ON api_statistics (endpoint, method, called_at)
+    INCLUDE (response_time_ms, status_code);
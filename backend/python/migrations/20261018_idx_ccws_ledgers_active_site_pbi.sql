@@ -0,0 +1,25 @@
+-- Target DB: esa_pbi
+-- Adds a covering index on ccws_ledgers for the ECRI eligibility query
+-- (vw_ecri_eligible_ledgers, filtered by "SiteID" = ANY(...), ordered by
+-- SiteID, LedgerID). Not partial: the same scan also feeds the exclusion
+-- counts, which look at every ledger of the requested sites.
+--
+-- The primary key leads with LedgerID, so a multi-site eligibility call
+-- could only use idx_ccws_ledger_site and then visit the heap for every
+-- ledger column the view reads. This index is keyed (SiteID, LedgerID) —
+-- the query's filter and sort order — and INCLUDEs those columns, so the
+-- ccws side of the view can run index-only.
+--
+-- The tenure / pending-increase predicates (dRentLastChanged,
+-- dSchedRentStrt) come from the rentroll side of the view and are served by
+-- idx_rentroll_composite on the latest snapshot, not by ccws_ledgers.
+--
+-- Run from dev machine:
+--   PGPASSWORD=<VM_SSH_PASSWORD> psql -h esapbi.postgres.database.azure.com \
+--     -U esa_pbi_admin -d esa_pbi \
+--     -f backend/python/migrations/20261018_idx_ccws_ledgers_active_site_pbi.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ccws_ledger_active_site
+    ON ccws_ledgers ("SiteID", "LedgerID")
+    INCLUDE ("UnitID", "TenantID", "TenantName", "dMovedIn", "dSchedOut",
+             "dcRent", "dPaidThru", "dAnniv", extract_date);
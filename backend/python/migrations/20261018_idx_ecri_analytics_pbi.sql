@@ -0,0 +1,23 @@
+-- Target DB: esa_pbi
+-- Indexes for the ECRI analytics endpoints (api_analytics_summary and
+-- api_batch_outcomes in web/routes/ecri.py):
+--   * ecri_outcomes (batch_id, ledger_id, id) INCLUDE (outcome_type): the
+--     latest outcome per (batch_id, ledger_id), ORDER BY id DESC, served
+--     from the index alone. Used by the ledger outcome_type sync trigger
+--     (20261018_ecri_ledger_outcome_type_pbi.sql). The existing
+--     (site_id, ledger_id) index doesn't lead with batch_id.
+--   * ecri_batches (status, executed_at): executed-batch listing ordered by
+--     executed_at.
+-- ecri_batch_ledgers already has idx_ecri_bl_batch for the batch_id filter.
+--
+-- Run from dev machine:
+--   PGPASSWORD=<VM_SSH_PASSWORD> psql -h esapbi.postgres.database.azure.com \
+--     -U esa_pbi_admin -d esa_pbi \
+--     -f backend/python/migrations/20261018_idx_ecri_analytics_pbi.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ecri_outcomes_batch_ledger
+    ON ecri_outcomes (batch_id, ledger_id, id)
+    INCLUDE (outcome_type);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ecri_batches_status_executed
+    ON ecri_batches (status, executed_at);
@@ -0,0 +1,15 @@
+-- Target DB: esa_middleware
+-- Expression index backing GET /api/smart-lock/refresh/<chain_id>, which
+-- the smart-lock page polls while a refresh chain runs. The lookup is
+-- WHERE scope->>'chain_id' = :chain_id; without an index on that
+-- expression every poll walks all of mw_sync_runs. Partial on
+-- IS NOT NULL so only chain-triggered runs are indexed (the equality
+-- predicate implies it, so the planner still picks the index).
+--
+-- Run from dev machine:
+--   PGPASSWORD=<DB_PASSWORD> psql -h <middleware-host> -U <user> -d esa_middleware \
+--     -f backend/python/migrations/20261018_idx_mw_sync_runs_chain_id_middleware.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sync_runs_chain_id
+    ON mw_sync_runs ((scope->>'chain_id'))
+    WHERE (scope->>'chain_id') IS NOT NULL;
@@ -0,0 +1,15 @@
+-- Target DB: esa_middleware
+-- Index backing GET /api/orchestrator/runs. Every call filters
+-- queued_at >= now() - since_hours and sorts by queued_at DESC, optionally
+-- narrowing by status (the dashboard's failures panel asks for 7 days of
+-- status = 'failed') and pipeline_name. Neither existing index leads with
+-- queued_at, so PG scans and sorts the whole history. Leading with queued_at
+-- lets the LIMIT stop early on a backward scan; status and pipeline_name as
+-- trailing keys are checked in the index before touching the heap.
+--
+-- Run from dev machine:
+--   PGPASSWORD=<DB_PASSWORD> psql -h <middleware-host> -U <user> -d esa_middleware \
+--     -f backend/python/migrations/20261018_idx_mw_sync_runs_queued_middleware.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sync_runs_queued
+    ON mw_sync_runs (queued_at DESC, status, pipeline_name);
@@ -0,0 +1,13 @@
+-- Target DB: esa_middleware
+-- Partial index backing the running-run count in /api/orchestrator/status.
+-- The endpoint is polled by the services page; without this the COUNT(*)
+-- WHERE status = 'running' walks every row of mw_sync_runs. The partial
+-- index only holds in-flight rows, so the count is O(#running).
+--
+-- Run from dev machine:
+--   PGPASSWORD=<DB_PASSWORD> psql -h <middleware-host> -U <user> -d esa_middleware \
+--     -f backend/python/migrations/20261018_idx_mw_sync_runs_running_middleware.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sync_runs_running
+    ON mw_sync_runs (status)
+    WHERE status = 'running';
@@ -0,0 +1,16 @@
+-- Target DB: esa_pbi
+-- Adds a (SiteID, LedgerID, extract_date) index on rentroll, covering dcRent
+-- and bRented, for the ECRI rent-bump history (_ledger_bump_history in
+-- web/routes/ecri.py). Its LAG/ROW_NUMBER windows all partition by
+-- (SiteID, LedgerID) and order by extract_date, so with this index the
+-- planner can walk the snapshots in window order instead of sorting ~3 years
+-- of rentroll rows on every eligibility request.
+--
+-- Run from dev machine:
+--   PGPASSWORD=<VM_SSH_PASSWORD> psql -h esapbi.postgres.database.azure.com \
+--     -U esa_pbi_admin -d esa_pbi \
+--     -f backend/python/migrations/20261018_idx_rentroll_site_ledger_extract_pbi.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rentroll_site_ledger_extract
+    ON rentroll ("SiteID", "LedgerID", extract_date)
+    INCLUDE ("dcRent", "bRented");
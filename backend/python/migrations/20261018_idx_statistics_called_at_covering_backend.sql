@@ -0,0 +1,28 @@
+-- Target DB: esa_backend
+-- Covering indexes for the /api/statistics views. Every one of them filters
+-- called_at >= since and reads a handful of narrow columns; leading with
+-- called_at and carrying those columns in the index lets the range be read
+-- index-only instead of visiting each heap row.
+--
+-- api_statistics: the raw edges of the hourly rollup (_api_stats_hourly) and
+--   top-consumers (client_ip).
+-- external_api_statistics: the external summary and services views.
+--
+-- No BRIN index: these btrees already lead with called_at, so a BRIN on the
+-- same column would not be chosen for these queries.
+--
+-- Run from dev machine (outside a transaction — CONCURRENTLY):
+--   PGPASSWORD=<DB_PASSWORD> psql -h <backend-host> -U <user> -d esa_backend \
+--     -f backend/python/migrations/20261018_idx_statistics_called_at_covering_backend.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_api_stats_called_covering
+    ON api_statistics (called_at, endpoint, method)
+    INCLUDE (response_time_ms, status_code, client_ip);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ext_api_called_covering
+    ON external_api_statistics (called_at, service_name)
+    INCLUDE (endpoint, method, response_time_ms, success);
+
+-- Index-only scans depend on the visibility map being current.
+VACUUM (ANALYZE) api_statistics;
+VACUUM (ANALYZE) external_api_statistics;
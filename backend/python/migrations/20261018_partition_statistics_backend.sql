@@ -0,0 +1,196 @@
+-- Target DB: esa_backend
+-- Convert api_statistics and external_api_statistics to weekly RANGE
+-- partitions on called_at, with 91 days of retention.
+--
+-- Both tables are append-only and were never pruned, so every
+-- "called_at >= since" scan and every rollup refresh walked an ever-growing
+-- heap. Partitioned, a 1d/7d query prunes to one or two weekly children and
+-- retention is a DROP TABLE instead of a bulk DELETE.
+--
+-- Partition upkeep is stats_partitions_maintain(parent, weeks_ahead,
+-- retain_days): creates the weekly children from the retention cutoff to
+-- `weeks_ahead` weeks out, drops children wholly older than the cutoff and
+-- deletes DEFAULT-partition rows older than the cutoff.
+-- The stats_partitions sync_service pipeline calls it daily
+-- (migrations/mw_seed_stats_partitions.py). A DEFAULT partition catches rows
+-- if that job ever stops, so inserts never fail; when the job next creates
+-- those weeks it moves their rows out of the DEFAULT partition into the new
+-- child (both tables partition on called_at, which the function assumes).
+--
+-- What this script does, per table, in one transaction:
+--   1. rename the existing table (and its pkey/indexes) to *_legacy
+--   2. create the partitioned parent, same columns, PK (id, called_at), and
+--      hand it the id sequence
+--   3. create the weekly children and copy the last 91 days over
+-- api_stats_hourly depends on api_statistics, so it is dropped first and
+-- recreated (same definition as 20261018_api_stats_hourly_backend.sql).
+--
+-- The *_legacy tables keep the full history; drop them by hand once the
+-- dashboards are verified:
+--   DROP TABLE api_statistics_legacy; DROP TABLE external_api_statistics_legacy;
+--
+-- The copy holds an ACCESS EXCLUSIVE lock on both tables while it runs;
+-- the stats writers queue and retry, but run this off-peak.
+--
+-- Run from dev machine:
+--   PGPASSWORD=<DB_PASSWORD> psql -h <backend-host> -U <user> -d esa_backend \
+--     -f backend/python/migrations/20261018_partition_statistics_backend.sql
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION stats_partitions_maintain(
+    parent text, weeks_ahead int DEFAULT 4, retain_days int DEFAULT 91
+) RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    cutoff date := (now() - make_interval(days => retain_days))::date;
+    dflt text := parent || '_default';
+    wk date;
+    child text;
+    stranded boolean;
+BEGIN
+    FOR wk IN
+        SELECT generate_series(
+            date_trunc('week', cutoff::timestamp),
+            date_trunc('week', now()::timestamp) + make_interval(weeks => weeks_ahead),
+            interval '1 week'
+        )::date
+    LOOP
+        child := parent || '_p' || to_char(wk, 'YYYYMMDD');
+        CONTINUE WHEN to_regclass(child) IS NOT NULL;
+
+        -- Rows for this week may already sit in the DEFAULT partition (the
+        -- job was off and the week was never created). CREATE ... PARTITION
+        -- OF would then fail on the default's implicit constraint, so build
+        -- the child standalone, move those rows into it, and attach it.
+        EXECUTE format(
+            'SELECT EXISTS (SELECT 1 FROM %I WHERE called_at >= %L AND called_at < %L)',
+            dflt, wk, wk + 7
+        ) INTO stranded;
+
+        IF NOT stranded THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                child, parent, wk, wk + 7
+            );
+        ELSE
+            -- Hold off writers to the default until the child is attached, or
+            -- a row landing after the DELETE would make the ATTACH fail.
+            EXECUTE format('LOCK TABLE %I IN EXCLUSIVE MODE', dflt);
+            EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)', child, parent);
+            -- Lets ATTACH skip its validation scan of the child.
+            EXECUTE format(
+                'ALTER TABLE %I ADD CONSTRAINT %I CHECK (called_at >= %L AND called_at < %L)',
+                child, child || '_range', wk, wk + 7
+            );
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM %I WHERE called_at >= %L AND called_at < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                dflt, wk, wk + 7, child
+            );
+            EXECUTE format(
+                'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                parent, child, wk, wk + 7
+            );
+            EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', child, child || '_range');
+        END IF;
+    END LOOP;
+
+    FOR child IN
+        SELECT c.relname
+          FROM pg_inherits i
+          JOIN pg_class c ON c.oid = i.inhrelid
+         WHERE i.inhparent = parent::regclass
+           AND c.relname ~ ('^' || parent || '_p[0-9]{8}$')
+           AND to_date(right(c.relname, 8), 'YYYYMMDD') + 7 <= cutoff
+    LOOP
+        EXECUTE format('DROP TABLE %I', child);
+    END LOOP;
+
+    -- Weeks older than the cutoff are never created, so rows the DEFAULT
+    -- partition caught for them would otherwise stay there for good.
+    EXECUTE format('DELETE FROM %I WHERE called_at < %L', dflt, cutoff);
+END $$;
+
+-- ---------------------------------------------------------------------------
+-- api_statistics
+-- ---------------------------------------------------------------------------
+DROP MATERIALIZED VIEW IF EXISTS api_stats_hourly;
+
+ALTER TABLE api_statistics RENAME TO api_statistics_legacy;
+ALTER TABLE api_statistics_legacy RENAME CONSTRAINT api_statistics_pkey TO api_statistics_legacy_pkey;
+ALTER INDEX IF EXISTS ix_api_stats_called_at RENAME TO ix_api_stats_legacy_called_at;
+ALTER INDEX IF EXISTS ix_api_stats_endpoint RENAME TO ix_api_stats_legacy_endpoint;
+ALTER INDEX IF EXISTS ix_api_stats_endpoint_called RENAME TO ix_api_stats_legacy_endpoint_called;
+ALTER INDEX IF EXISTS ix_api_stats_endpoint_method_called RENAME TO ix_api_stats_legacy_endpoint_method_called;
+ALTER INDEX IF EXISTS ix_api_stats_called_covering RENAME TO ix_api_stats_legacy_called_covering;
+
+CREATE TABLE api_statistics (
+    LIKE api_statistics_legacy INCLUDING DEFAULTS,
+    PRIMARY KEY (id, called_at)
+) PARTITION BY RANGE (called_at);
+ALTER SEQUENCE api_statistics_id_seq OWNED BY api_statistics.id;
+
+CREATE INDEX ix_api_stats_called_at ON api_statistics (called_at);
+CREATE INDEX ix_api_stats_endpoint ON api_statistics (endpoint);
+CREATE INDEX ix_api_stats_endpoint_called ON api_statistics (endpoint, called_at);
+CREATE INDEX ix_api_stats_endpoint_method_called ON api_statistics (endpoint, method, called_at)
+    INCLUDE (response_time_ms, status_code);
+CREATE INDEX ix_api_stats_called_covering ON api_statistics (called_at, endpoint, method)
+    INCLUDE (response_time_ms, status_code, client_ip);
+
+CREATE TABLE api_statistics_default PARTITION OF api_statistics DEFAULT;
+SELECT stats_partitions_maintain('api_statistics');
+
+INSERT INTO api_statistics
+SELECT * FROM api_statistics_legacy
+ WHERE called_at >= date_trunc('week', now() - interval '91 days');
+
+CREATE MATERIALIZED VIEW api_stats_hourly AS
+SELECT endpoint,
+       method,
+       (status_code = 404)                                   AS is_probe,
+       date_trunc('hour', called_at)                         AS h,
+       count(*)                                              AS calls,
+       sum(response_time_ms)                                 AS sum_rt,
+       sum(response_time_ms * response_time_ms)              AS sum_rt_sq,
+       max(response_time_ms)                                 AS max_rt,
+       sum(CASE WHEN status_code >= 400 THEN 1 ELSE 0 END)   AS errors
+  FROM api_statistics
+ GROUP BY 1, 2, 3, 4;
+CREATE UNIQUE INDEX ux_api_stats_hourly ON api_stats_hourly (endpoint, method, is_probe, h);
+CREATE INDEX ix_api_stats_hourly_h ON api_stats_hourly (h);
+
+-- ---------------------------------------------------------------------------
+-- external_api_statistics
+-- ---------------------------------------------------------------------------
+ALTER TABLE external_api_statistics RENAME TO external_api_statistics_legacy;
+ALTER TABLE external_api_statistics_legacy
+    RENAME CONSTRAINT external_api_statistics_pkey TO external_api_statistics_legacy_pkey;
+ALTER INDEX IF EXISTS ix_ext_api_called_at RENAME TO ix_ext_api_legacy_called_at;
+ALTER INDEX IF EXISTS ix_ext_api_service RENAME TO ix_ext_api_legacy_service;
+ALTER INDEX IF EXISTS ix_ext_api_service_called RENAME TO ix_ext_api_legacy_service_called;
+ALTER INDEX IF EXISTS ix_ext_api_called_covering RENAME TO ix_ext_api_legacy_called_covering;
+
+CREATE TABLE external_api_statistics (
+    LIKE external_api_statistics_legacy INCLUDING DEFAULTS,
+    PRIMARY KEY (id, called_at)
+) PARTITION BY RANGE (called_at);
+ALTER SEQUENCE external_api_statistics_id_seq OWNED BY external_api_statistics.id;
+
+CREATE INDEX ix_ext_api_called_at ON external_api_statistics (called_at);
+CREATE INDEX ix_ext_api_service ON external_api_statistics (service_name);
+CREATE INDEX ix_ext_api_service_called ON external_api_statistics (service_name, called_at);
+CREATE INDEX ix_ext_api_called_covering ON external_api_statistics (called_at, service_name)
+    INCLUDE (endpoint, method, response_time_ms, success);
+
+CREATE TABLE external_api_statistics_default PARTITION OF external_api_statistics DEFAULT;
+SELECT stats_partitions_maintain('external_api_statistics');
+
+INSERT INTO external_api_statistics
+SELECT * FROM external_api_statistics_legacy
+ WHERE called_at >= date_trunc('week', now() - interval '91 days');
+
+COMMIT;
+
+ANALYZE api_statistics;
+ANALYZE external_api_statistics;
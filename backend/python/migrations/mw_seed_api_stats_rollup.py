@@ -0,0 +1,70 @@
+"""
+Register sync_service.pipelines.api_stats_rollup.ApiStatsRollupPipeline
+in mw_sync_pipelines so the orchestrator refreshes api_stats_hourly every
+5 minutes.
+
+Apply migrations/20261018_api_stats_hourly_backend.sql first.
+
+Run from backend/python:
+    python3 migrations/mw_seed_api_stats_rollup.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+from common.db import get_engine
+
+
+def main():
+    mw_engine = get_engine('middleware')
+
+    print('[1] Seeding mw_sync_pipelines row for api_stats_rollup...')
+    with mw_engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO mw_sync_pipelines (
+                pipeline_name, display_name, description, pipeline_class,
+                enabled, schedule_type, schedule_config,
+                freshness_table, freshness_column, freshness_scope_column,
+                freshness_ttl_seconds, freshness_database,
+                max_concurrency, resource_group, max_db_connections,
+                timeout_seconds, max_retries, retry_delay_seconds,
+                default_args
+            ) VALUES (
+                :name, :display, :desc, :cls,
+                TRUE, 'cron', CAST(:sched AS jsonb),
+                NULL, NULL, NULL,
+                :ttl, 'backend',
+                1, 'db_pool', 1,
+                300, 1, 60,
+                '{}'::jsonb
+            )
+            ON CONFLICT (pipeline_name) DO UPDATE SET
+                display_name = EXCLUDED.display_name,
+                description = EXCLUDED.description,
+                pipeline_class = EXCLUDED.pipeline_class,
+                schedule_type = EXCLUDED.schedule_type,
+                schedule_config = EXCLUDED.schedule_config,
+                freshness_database = EXCLUDED.freshness_database,
+                resource_group = EXCLUDED.resource_group,
+                max_db_connections = EXCLUDED.max_db_connections,
+                timeout_seconds = EXCLUDED.timeout_seconds,
+                max_retries = EXCLUDED.max_retries,
+                retry_delay_seconds = EXCLUDED.retry_delay_seconds,
+                enabled = TRUE,
+                updated_at = NOW()
+        """), {
+            'name': 'api_stats_rollup',
+            'display': 'API Statistics Rollup',
+            'desc': 'REFRESH MATERIALIZED VIEW CONCURRENTLY api_stats_hourly '
+                    '(esa_backend). Feeds the /api/statistics dashboards.',
+            'cls': 'sync_service.pipelines.api_stats_rollup.ApiStatsRollupPipeline',
+            'sched': '{"cron": "*/5 * * * *"}',
+            'ttl': 300,
+        })
+    print('    done')
+
+
+if __name__ == '__main__':
+    main()
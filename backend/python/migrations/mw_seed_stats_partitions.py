@@ -0,0 +1,70 @@
+"""
+Register sync_service.pipelines.stats_partitions.StatsPartitionsPipeline
+in mw_sync_pipelines so the orchestrator rolls the weekly statistics
+partitions forward (and drops expired ones) once a day.
+
+Apply migrations/20261018_partition_statistics_backend.sql first.
+
+Run from backend/python:
+    python3 migrations/mw_seed_stats_partitions.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+from common.db import get_engine
+
+
+def main():
+    mw_engine = get_engine('middleware')
+
+    print('[1] Seeding mw_sync_pipelines row for stats_partitions...')
+    with mw_engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO mw_sync_pipelines (
+                pipeline_name, display_name, description, pipeline_class,
+                enabled, schedule_type, schedule_config,
+                freshness_table, freshness_column, freshness_scope_column,
+                freshness_ttl_seconds, freshness_database,
+                max_concurrency, resource_group, max_db_connections,
+                timeout_seconds, max_retries, retry_delay_seconds,
+                default_args
+            ) VALUES (
+                :name, :display, :desc, :cls,
+                TRUE, 'cron', CAST(:sched AS jsonb),
+                NULL, NULL, NULL,
+                :ttl, 'backend',
+                1, 'db_pool', 1,
+                300, 1, 60,
+                '{}'::jsonb
+            )
+            ON CONFLICT (pipeline_name) DO UPDATE SET
+                display_name = EXCLUDED.display_name,
+                description = EXCLUDED.description,
+                pipeline_class = EXCLUDED.pipeline_class,
+                schedule_type = EXCLUDED.schedule_type,
+                schedule_config = EXCLUDED.schedule_config,
+                freshness_database = EXCLUDED.freshness_database,
+                resource_group = EXCLUDED.resource_group,
+                max_db_connections = EXCLUDED.max_db_connections,
+                timeout_seconds = EXCLUDED.timeout_seconds,
+                max_retries = EXCLUDED.max_retries,
+                retry_delay_seconds = EXCLUDED.retry_delay_seconds,
+                enabled = TRUE,
+                updated_at = NOW()
+        """), {
+            'name': 'stats_partitions',
+            'display': 'API Statistics Partitions',
+            'desc': 'Create upcoming weekly partitions and drop expired ones '
+                    'for api_statistics / external_api_statistics (esa_backend).',
+            'cls': 'sync_service.pipelines.stats_partitions.StatsPartitionsPipeline',
+            'sched': '{"cron": "15 2 * * *"}',
+            'ttl': 20 * 3600,
+        })
+    print('    done')
+
+
+if __name__ == '__main__':
+    main()
@@ -14,28 +14,49 @@ Endpoints:
 """
 
 import logging
-from datetime import datetime, timedelta, timezone
-
-from flask import Blueprint, jsonify, request, current_app
+import os
+import re
+import time as _time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+
+from croniter import croniter
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
+from sqlalchemy import select, text, update
 
 from web.auth.jwt_auth import require_auth, require_api_scope
 from web.utils.rate_limit import rate_limit_api
 
-from sync_service.config import session_scope
+from sync_service.cadence import next_fire
+from sync_service.config import get_engine, session_scope
 from sync_service.executor import get_executor
 from sync_service.freshness import check_freshness
 from sync_service.models import SyncPipeline, SyncRun
-from sync_service.registry import get_pipeline, list_pipelines
+from sync_service.registry import get_pipeline, invalidate_pipeline_cache, list_pipelines
 
 logger = logging.getLogger(__name__)
 
 sync_service_bp = Blueprint('orchestrator', __name__, url_prefix='/api/orchestrator')
 
+try:
+    from zoneinfo import ZoneInfo
+    _SGT = ZoneInfo('Asia/Singapore')
+except ImportError:
+    _SGT = timezone(timedelta(hours=8))
+
 
 # ----- Validation -----
 
 _MAX_TIMEOUT = 300.0
+_MAX_RUN_WAIT = 30.0
+_RUN_POLL_INTERVAL = 1.0
+_LIVE_RUN_STATUSES = ('queued', 'running')
+_MAX_NDJSON_RUNS = 10000
+_NDJSON_BATCH = 200
 _MAX_SCOPE_KEYS = 20
+_IDENT_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
 
 
 def _validate_scope(scope):
@@ -65,16 +86,79 @@ def _parse_timeout(raw, default: float) -> float:
 
 # ----- Pipeline registry endpoints -----
 
+# The pipeline list is polled by the dashboards but only changes on edit.
+# Keep the serialized response keyed on a cheap registry version (row count +
+# newest updated_at, both maintained by PATCH) and skip hydrating and
+# re-encoding every row while it matches. Writes that bypass the ORM and
+# don't touch updated_at are picked up once the entry ages out.
+_PIPELINES_VERSION_SQL = text(
+    "SELECT COUNT(*), MAX(updated_at) FROM mw_sync_pipelines"
+)
+_PIPELINES_RESPONSE_MAX_AGE = 300.0
+_pipelines_response = None  # (version, built_at_monotonic, body_bytes)
+
+
+# Encoded to_dict() per pipeline: name -> (updated_at, built_at_monotonic,
+# json_str). When the list version changes (usually one PATCH), only the
+# edited pipeline is re-serialized; the rest are spliced in as-is.
+_pipeline_json = {}
+
+
+def _invalidate_pipelines_response():
+    global _pipelines_response
+    _pipelines_response = None
+
+
+def _pipelines_body_response(body):
+    """Encoded list body with a content ETag; an empty 304 when the dashboard
+    already holds this version (If-None-Match)."""
+    response = current_app.response_class(body, mimetype=current_app.json.mimetype)
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def _pipeline_json_fragment(row, now):
+    entry = _pipeline_json.get(row.pipeline_name)
+    if (entry is not None and entry[0] == row.updated_at
+            and now - entry[1] < _PIPELINES_RESPONSE_MAX_AGE):
+        return entry[2]
+    encoded = current_app.json.dumps(row.to_dict(), separators=(',', ':'))
+    _pipeline_json[row.pipeline_name] = (row.updated_at, now, encoded)
+    return encoded
+
+
 @sync_service_bp.route('/pipelines')
 @require_auth
 @require_api_scope('sync:read')
 def list_pipelines_endpoint():
     """List all sync_service pipelines."""
+    global _pipelines_response
+    with session_scope() as session:
+        version = tuple(session.execute(_PIPELINES_VERSION_SQL).one())
+
+    cached = _pipelines_response
+    if (cached is not None and cached[0] == version
+            and _time.monotonic() - cached[1] < _PIPELINES_RESPONSE_MAX_AGE):
+        return _pipelines_body_response(cached[2])
+
     rows = list_pipelines(enabled_only=False)
-    return jsonify({
-        'pipelines': [r.to_dict() for r in rows],
-        'count': len(rows),
-    })
+    json_provider = current_app.json
+    if json_provider.compact is False or (json_provider.compact is None and current_app.debug):
+        # Pretty-printed debug output: let jsonify lay it out.
+        return jsonify({
+            'pipelines': [r.to_dict() for r in rows],
+            'count': len(rows),
+        })
+
+    now = _time.monotonic()
+    fragments = [_pipeline_json_fragment(r, now) for r in rows]
+    live = {r.pipeline_name for r in rows}
+    for name in [n for n in _pipeline_json if n not in live]:
+        _pipeline_json.pop(name, None)
+    # Same bytes jsonify would produce: sorted keys, compact, trailing newline.
+    body = f'{{"count":{len(rows)},"pipelines":[{",".join(fragments)}]}}\n'.encode()
+    _pipelines_response = (version, now, body)
+    return _pipelines_body_response(body)
 
 
 @sync_service_bp.route('/pipelines/<name>')
@@ -222,11 +306,18 @@ def run_endpoint(name):
 @require_auth
 @require_api_scope('sync:read')
 def list_runs_endpoint():
-    """Recent sync_runs. Query params: pipeline, status, limit, since_hours."""
+    """Recent sync_runs. Query params: pipeline, status, limit, since_hours, format.
+
+    format=ndjson streams one run per line (application/x-ndjson) straight
+    from a server-side cursor instead of building the whole list in memory,
+    and raises the limit cap to _MAX_NDJSON_RUNS for exports.
+    """
     pipeline_name = request.args.get('pipeline')
     status = (request.args.get('status') or '').strip().lower() or None
+    ndjson = (request.args.get('format') or '').lower() == 'ndjson'
+    max_limit = _MAX_NDJSON_RUNS if ndjson else 500
     try:
-        limit = min(500, max(1, int(request.args.get('limit', 50))))
+        limit = min(max_limit, max(1, int(request.args.get('limit', 50))))
     except (TypeError, ValueError):
         limit = 50
     try:
@@ -236,15 +327,33 @@ def list_runs_endpoint():
 
     since = datetime.now(timezone.utc) - timedelta(hours=since_hours)
 
+    # Served by idx_sync_runs_queued (queued_at DESC, status, pipeline_name):
+    # a backward range scan that stops at `limit`.
+    q = select(*SyncRun.api_columns()).where(SyncRun.queued_at >= since)
+    if pipeline_name:
+        q = q.where(SyncRun.pipeline_name == pipeline_name)
+    if status:
+        q = q.where(SyncRun.status == status)
+    q = q.order_by(SyncRun.queued_at.desc()).limit(limit)
+
+    if ndjson:
+        dumps = current_app.json.dumps
+
+        def generate():
+            with session_scope() as session:
+                result = session.execute(
+                    q.execution_options(yield_per=_NDJSON_BATCH)
+                )
+                for r in result:
+                    yield dumps(SyncRun.serialize(r)) + '\n'
+
+        return Response(stream_with_context(generate()),
+                        mimetype='application/x-ndjson')
+
     with session_scope() as session:
-        q = session.query(SyncRun).filter(SyncRun.queued_at >= since)
-        if pipeline_name:
-            q = q.filter(SyncRun.pipeline_name == pipeline_name)
-        if status:
-            q = q.filter(SyncRun.status == status)
-        rows = q.order_by(SyncRun.queued_at.desc()).limit(limit).all()
+        rows = session.execute(q).all()
         return jsonify({
-            'runs': [r.to_dict() for r in rows],
+            'runs': [SyncRun.serialize(r) for r in rows],
             'count': len(rows),
         })
 
@@ -253,11 +362,87 @@ def list_runs_endpoint():
 @require_auth
 @require_api_scope('sync:read')
 def get_run_endpoint(execution_id):
-    with session_scope() as session:
-        row = session.query(SyncRun).filter_by(execution_id=execution_id).first()
+    """Return one run.
+
+    Query params:
+        wait: seconds (max 30) to hold the request while the run is still
+              queued or running; returns as soon as it finishes. Lets clients
+              long-poll for completion instead of re-polling. A run in flight
+              in this worker wakes the request immediately; one owned by
+              another worker is noticed on the next re-read of its row (every
+              second).
+    """
+    # Parse up front: a malformed id can never match, and letting it through
+    # turns into a DB-side cast error instead of a 404.
+    try:
+        exec_uuid = uuid.UUID(execution_id)
+    except ValueError:
+        return jsonify({'error': 'Run not found'}), 404
+
+    try:
+        wait = min(_MAX_RUN_WAIT, max(0.0, float(request.args.get('wait', 0))))
+    except (TypeError, ValueError):
+        wait = 0.0
+    deadline = _time.monotonic() + wait
+
+    while True:
+        with session_scope() as session:
+            row = session.execute(
+                select(*SyncRun.api_columns()).where(SyncRun.execution_id == exec_uuid)
+            ).first()
         if row is None:
             return jsonify({'error': 'Run not found'}), 404
-        return jsonify(row.to_dict())
+        remaining = deadline - _time.monotonic()
+        if row.status not in _LIVE_RUN_STATUSES or remaining <= 0:
+            return jsonify(SyncRun.serialize(row))
+        step = min(_RUN_POLL_INTERVAL, remaining)
+        if not get_executor().wait_for_run(str(exec_uuid), step):
+            _time.sleep(step)
+
+
+# A 'running' row whose run has outlived every caller's wait can't still be
+# live: the executor records the outcome when the caller's timeout fires, so
+# the row was orphaned by a process that died mid-run (deploy, OOM, restart).
+# The age floor covers callers that wait longer than the pipeline's own
+# timeout_seconds (the daemon falls back to 30 min); the grace absorbs
+# clock skew and the final write. One set-based UPDATE, served by the
+# idx_sync_runs_running partial index.
+_STALE_RUN_FLOOR_SECONDS = 1800
+_STALE_RUN_GRACE_SECONDS = 600
+
+_CLEANUP_STALE_SQL = text("""
+    UPDATE mw_sync_runs r
+    SET status = 'failed',
+        error_message = 'Interrupted - run was orphaned before it finished',
+        completed_at = now(),
+        duration_ms = (EXTRACT(EPOCH FROM now() - COALESCE(r.started_at, r.queued_at)) * 1000)::int
+    FROM mw_sync_pipelines p
+    WHERE p.pipeline_name = r.pipeline_name
+      AND r.status = 'running'
+      AND COALESCE(r.started_at, r.queued_at)
+          < now() - make_interval(secs => GREATEST(p.timeout_seconds, :floor) + :grace)
+    RETURNING r.pipeline_name, r.execution_id
+""")
+
+
+@sync_service_bp.route('/runs/cleanup-stale', methods=['POST'])
+@require_auth
+@require_api_scope('sync:write')
+@rate_limit_api(max_requests=10, window_seconds=60)
+def cleanup_stale_runs_endpoint():
+    """Mark orphaned 'running' rows as failed. Returns the runs that were fixed."""
+    with session_scope() as session:
+        rows = session.execute(_CLEANUP_STALE_SQL, {
+            'floor': _STALE_RUN_FLOOR_SECONDS,
+            'grace': _STALE_RUN_GRACE_SECONDS,
+        }).all()
+    fixed = [
+        {'pipeline_name': r.pipeline_name, 'execution_id': str(r.execution_id)}
+        for r in rows
+    ]
+    if fixed:
+        logger.info(f"cleanup-stale: marked {len(fixed)} orphaned run(s) failed")
+    return jsonify({'fixed': fixed, 'count': len(fixed)})
 
 
 # ----- Stats -----
@@ -271,15 +456,33 @@ def stats_endpoint():
     return jsonify(executor.stats())
 
 
+# Daemon writes its heartbeat every 30s (see OrchestratorDaemon.run); three
+# missed beats means the daemon is gone even if the state row says 'running'.
+_HEARTBEAT_STALE_SECONDS = 90
+
+# One round trip for everything /status reads from the DB. The LEFT JOIN off a
+# one-row derived table keeps the counts even before the daemon has ever
+# written its singleton state row. runs_running is served by the partial
+# idx_sync_runs_running index, so it stays O(#running) as history grows.
+_STATUS_SQL = text("""
+    SELECT
+        (SELECT COUNT(*) FROM mw_sync_pipelines) AS pipelines_total,
+        (SELECT COUNT(*) FROM mw_sync_pipelines WHERE enabled) AS pipelines_enabled,
+        (SELECT COUNT(*) FROM mw_sync_runs WHERE status = 'running') AS runs_running,
+        s.status, s.started_at, s.host_name, s.pid, s.last_heartbeat
+    FROM (SELECT 1) AS one
+    LEFT JOIN mw_sync_service_state s ON s.id = 1
+""")
+
+
 @sync_service_bp.route('/status')
 def status_endpoint():
     """Public health endpoint for admin/services page (no auth — like /health).
 
     Returns service status + counts, used by /api/services/status aggregator.
+    Daemon liveness is derived from heartbeat age rather than probing the pid,
+    so the endpoint stays a single DB read.
     """
-    import os
-    from sync_service.models import SyncServiceState
-
     try:
         executor = get_executor()
         exec_stats = executor.stats()
@@ -288,24 +491,30 @@ def status_endpoint():
         exec_stats = {'in_flight': 0, 'registered_pipelines': []}
 
     daemon_info = {}
+    total = enabled = running = 0
     try:
         with session_scope() as session:
-            rows = session.query(SyncPipeline).all()
-            total = len(rows)
-            enabled = sum(1 for r in rows if r.enabled)
-
-            state = session.query(SyncServiceState).filter_by(id=1).first()
-            if state:
+            row = session.execute(_STATUS_SQL).mappings().first()
+        if row:
+            total = int(row['pipelines_total'] or 0)
+            enabled = int(row['pipelines_enabled'] or 0)
+            running = int(row['runs_running'] or 0)
+            if row['status'] is not None:
+                heartbeat = row['last_heartbeat']
+                age = None
+                if heartbeat is not None:
+                    age = int((datetime.now(timezone.utc) - heartbeat).total_seconds())
                 daemon_info = {
-                    'pid': state.pid,
-                    'host': state.host_name,
-                    'started_at': state.started_at.isoformat() if state.started_at else None,
-                    'last_heartbeat': state.last_heartbeat.isoformat() if state.last_heartbeat else None,
-                    'daemon_status': state.status,
+                    'pid': row['pid'],
+                    'host': row['host_name'],
+                    'started_at': row['started_at'].isoformat() if row['started_at'] else None,
+                    'last_heartbeat': heartbeat.isoformat() if heartbeat else None,
+                    'heartbeat_age_seconds': age,
+                    'heartbeat_stale': age is None or age > _HEARTBEAT_STALE_SECONDS,
+                    'daemon_status': row['status'],
                 }
     except Exception as e:
         logger.warning(f"orchestrator status: registry read failed: {e}")
-        total = enabled = 0
 
     return jsonify({
         'service': 'Sync Orchestrator',
@@ -313,6 +522,7 @@ def status_endpoint():
         'pid': os.getpid(),
         'pipelines_total': total,
         'pipelines_enabled': enabled,
+        'runs_running': running,
         'in_flight': exec_stats.get('in_flight', 0),
         'registered': len(exec_stats.get('registered_pipelines', [])),
         'daemon': daemon_info,
@@ -322,33 +532,68 @@ def status_endpoint():
 
 # ----- Dashboard helpers -----
 
-def _query_destination_freshness(db_name: str, table: str, col: str, ttl_seconds: int, now):
-    """Run MAX(date_column) against (db_name.table) and return a freshness entry."""
-    from sqlalchemy import text as _text
-    from sync_service.config import get_engine
-    from datetime import date as _date, time as _time
+def _freshness_entry(latest, ttl_seconds: int, now) -> dict:
+    """Turn a MAX(date_column) value into a freshness entry."""
     entry = {'latest_date': None, 'age_seconds': None, 'status': 'unknown'}
-    if not table:
+    if latest is None:
         return entry
+    if not isinstance(latest, datetime) and isinstance(latest, date):
+        latest = datetime.combine(latest, time.min)
+    if latest.tzinfo is None:
+        latest = latest.replace(tzinfo=timezone.utc)
+    age = (now - latest).total_seconds()
+    entry['latest_date'] = latest.isoformat()
+    entry['age_seconds'] = int(age)
+    entry['status'] = 'fresh' if age <= ttl_seconds else 'stale'
+    return entry
+
+
+# The destination set only changes when a pipeline is edited, so build each
+# statement once and let SQLAlchemy's compiled cache key off the same object.
+@lru_cache(maxsize=64)
+def _max_dates_stmt(targets: tuple):
+    return text('SELECT ' + ', '.join(
+        f'(SELECT MAX("{col}") FROM "{table}") AS d{i}'
+        for i, (table, col) in enumerate(targets)
+    ))
+
+
+@lru_cache(maxsize=256)
+def _max_date_stmt(table: str, col: str):
+    return text(f'SELECT MAX("{col}") FROM "{table}"')
+
+
+def _query_max_dates(db_name: str, targets: list) -> dict:
+    """Return {(table, col): MAX(col)} for every target on db_name.
+
+    All targets go out in one round-trip as
+    ``SELECT (SELECT MAX("c") FROM "t") AS d0, ...``. Scalar subqueries
+    (rather than UNION ALL) keep each column's native type, so date,
+    timestamp and timestamptz columns come back exactly as a lone MAX()
+    would. If the batch fails — typically one misconfigured table — fall
+    back to one query per target so a single bad destination doesn't
+    blank the rest.
+    """
+    eng = get_engine(db_name)
+    targets = tuple(targets)
     try:
-        eng = get_engine(db_name)
         with eng.connect() as conn:
-            row = conn.execute(_text(
-                f'SELECT MAX("{col}") FROM "{table}"'
-            )).first()
-            latest = row[0] if row else None
-        if latest is not None:
-            if not isinstance(latest, datetime) and isinstance(latest, _date):
-                latest = datetime.combine(latest, _time.min)
-            if latest.tzinfo is None:
-                latest = latest.replace(tzinfo=timezone.utc)
-            age = (now - latest).total_seconds()
-            entry['latest_date'] = latest.isoformat()
-            entry['age_seconds'] = int(age)
-            entry['status'] = 'fresh' if age <= ttl_seconds else 'stale'
+            row = conn.execute(_max_dates_stmt(targets)).first()
+        return dict(zip(targets, row))
     except Exception as e:
-        logger.warning(f"freshness query failed for {db_name}.{table}: {e}")
-    return entry
+        logger.warning(f"batched freshness query failed for {db_name}, "
+                       f"falling back to per-table queries: {e}")
+
+    latest = {}
+    for table, col in targets:
+        latest[(table, col)] = None
+        try:
+            with eng.connect() as conn:
+                row = conn.execute(_max_date_stmt(table, col)).first()
+            latest[(table, col)] = row[0] if row else None
+        except Exception as e:
+            logger.warning(f"freshness query failed for {db_name}.{table}: {e}")
+    return latest
 
 
 @sync_service_bp.route('/data-freshness')
@@ -367,15 +612,14 @@ def data_freshness_endpoint():
             ],
         }
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-
     out = {}
     now = datetime.now(timezone.utc)
 
-    # Build the full list of (pipeline_name, ttl, destination_dict) jobs first
-    # so we can fan them out in parallel. With 18 pipelines × up to 2
-    # destinations, a serial loop becomes ~10s if any single MAX() is slow.
+    # Collect every (pipeline, destination) first, then group the distinct
+    # (table, column) pairs by database so each database is hit with a
+    # single batched MAX() query instead of one round-trip per destination.
     jobs = []
+    targets_by_db = {}
     with session_scope() as session:
         pipelines = session.query(SyncPipeline).all()
         for p in pipelines:
@@ -393,23 +637,40 @@ def data_freshness_endpoint():
                 table = (d.get('table') or '').strip()
                 col = (d.get('column') or 'updated_at').strip()
                 jobs.append((p.pipeline_name, ttl, db_name, table, col))
+                if not (_IDENT_RE.match(table) and _IDENT_RE.match(col)):
+                    if table:
+                        logger.warning(f"freshness: skipping non-identifier "
+                                       f"destination {db_name}.{table}.{col}")
+                    continue
+                targets = targets_by_db.setdefault(db_name, [])
+                if (table, col) not in targets:
+                    targets.append((table, col))
+
+    # One query per database; the databases themselves are still queried in
+    # parallel so the slowest one bounds the response time.
+    latest_by_db = {}
+    if targets_by_db:
+        with ThreadPoolExecutor(max_workers=len(targets_by_db)) as pool:
+            futures = {
+                db_name: pool.submit(_query_max_dates, db_name, targets)
+                for db_name, targets in targets_by_db.items()
+            }
+            for db_name, fut in futures.items():
+                try:
+                    latest_by_db[db_name] = fut.result()
+                except Exception as e:
+                    logger.warning(f"freshness queries failed for {db_name}: {e}")
+                    latest_by_db[db_name] = {}
 
-    def _worker(job):
-        pname, ttl, db_name, table, col = job
-        fresh = _query_destination_freshness(db_name, table, col, ttl, now)
-        return pname, {
+    for pname, ttl, db_name, table, col in jobs:
+        latest = latest_by_db.get(db_name, {}).get((table, col))
+        out[pname]['destinations'].append({
             'database': db_name,
             'table': table,
             'column': col,
             'destination': f"{db_name}.{table}".rstrip('.'),
-            **fresh,
-        }
-
-    # Cap concurrency at ~8 — most queries are 5-20ms; the bottleneck is the
-    # slowest, not throughput.
-    with ThreadPoolExecutor(max_workers=8) as pool:
-        for pname, entry in pool.map(_worker, jobs):
-            out[pname]['destinations'].append(entry)
+            **_freshness_entry(latest, ttl, now),
+        })
 
     return jsonify(out)
 
@@ -419,15 +680,8 @@ def data_freshness_endpoint():
 @require_api_scope('sync:read')
 def upcoming_endpoint():
     """Return upcoming cron-scheduled runs sorted by next_run ascending."""
-    from croniter import croniter
-    try:
-        from zoneinfo import ZoneInfo
-    except ImportError:
-        ZoneInfo = None
-
-    sgt = ZoneInfo('Asia/Singapore') if ZoneInfo else timezone(timedelta(hours=8))
     now_utc = datetime.now(timezone.utc)
-    now_sgt = now_utc.astimezone(sgt)
+    now_sgt = now_utc.astimezone(_SGT)
     items = []
     with session_scope() as session:
         pipelines = (session.query(SyncPipeline)
@@ -445,9 +699,9 @@ def upcoming_endpoint():
                 try:
                     # Compute next fire in SGT so cron is interpreted in the
                     # same timezone the daemon uses.
-                    next_sgt = croniter(cron_expr, now_sgt).get_next(datetime)
+                    next_sgt = next_fire(cron_expr, now_sgt)
                     if next_sgt.tzinfo is None:
-                        next_sgt = next_sgt.replace(tzinfo=sgt)
+                        next_sgt = next_sgt.replace(tzinfo=_SGT)
                     next_run = next_sgt.astimezone(timezone.utc)
                     schedule_human = f"cron: {cron_expr} (SGT)"
                 except Exception as e:
@@ -503,10 +757,9 @@ def update_pipeline_endpoint(name):
         if not isinstance(cfg, dict):
             return jsonify({'error': 'schedule_config must be an object'}), 400
         if 'cron' in cfg:
-            from croniter import croniter, CroniterBadCronError
             try:
                 croniter(cfg['cron'])
-            except (CroniterBadCronError, Exception) as e:
+            except Exception as e:
                 return jsonify({'error': f'Invalid cron: {e}'}), 400
     if 'default_args' in payload and not isinstance(payload['default_args'], dict):
         return jsonify({'error': 'default_args must be an object'}), 400
@@ -522,15 +775,13 @@ def update_pipeline_endpoint(name):
     if 'freshness_database' in payload and payload['freshness_database'] not in ('middleware', 'pbi', 'backend'):
         return jsonify({'error': 'freshness_database must be middleware|pbi|backend'}), 400
 
-    import re
-    _IDENT = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
     for ident_field in ('freshness_table', 'freshness_column'):
         if ident_field in payload:
             v = payload[ident_field]
             if v in (None, ''):
                 payload[ident_field] = None
                 continue
-            if not isinstance(v, str) or len(v) > 100 or not _IDENT.match(v):
+            if not isinstance(v, str) or len(v) > 100 or not _IDENT_RE.match(v):
                 return jsonify({'error': f'{ident_field} must be a valid SQL identifier (≤100 char)'}), 400
 
     _NUMERIC_BOUNDS = {
@@ -564,19 +815,28 @@ def update_pipeline_endpoint(name):
                 col = d.get('column') or 'updated_at'
                 if db not in ('middleware', 'pbi', 'backend'):
                     return jsonify({'error': f'destinations[{i}].database must be middleware|pbi|backend'}), 400
-                if not isinstance(tbl, str) or not _IDENT.match(tbl) or len(tbl) > 100:
+                if not isinstance(tbl, str) or not _IDENT_RE.match(tbl) or len(tbl) > 100:
                     return jsonify({'error': f'destinations[{i}].table must be a valid SQL identifier (≤100)'}), 400
-                if not isinstance(col, str) or not _IDENT.match(col) or len(col) > 100:
+                if not isinstance(col, str) or not _IDENT_RE.match(col) or len(col) > 100:
                     return jsonify({'error': f'destinations[{i}].column must be a valid SQL identifier (≤100)'}), 400
                 cleaned.append({'database': db, 'table': tbl, 'column': col})
             payload['destinations'] = cleaned
 
+    # One UPDATE ... RETURNING touching only the submitted columns, rather
+    # than loading the row, mutating it and flushing — a toggle like
+    # {"enabled": false} is a single round trip.
+    if payload:
+        stmt = (update(SyncPipeline)
+                .where(SyncPipeline.pipeline_name == name)
+                .values(**payload)
+                .returning(SyncPipeline))
+    else:
+        stmt = select(SyncPipeline).where(SyncPipeline.pipeline_name == name)
     with session_scope() as session:
-        row = session.query(SyncPipeline).filter_by(pipeline_name=name).first()
+        row = session.execute(stmt).scalar_one_or_none()
         if row is None:
             return jsonify({'error': 'Pipeline not found'}), 404
-        for k, v in payload.items():
-            setattr(row, k, v)
-        session.flush()
         result = row.to_dict()
+    invalidate_pipeline_cache(name)
+    _invalidate_pipelines_response()
     return jsonify({'status': 'updated', 'pipeline': result})
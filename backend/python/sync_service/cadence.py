@@ -12,24 +12,43 @@ Boundaries:
   - delta > 86400s                                → 'low'
 
 Returns None for on_demand pipelines or any cron we can't parse.
+
+Parsed cron expressions are memoized per expression string (see
+next_fire), so listing endpoints don't re-parse every pipeline's cron on
+every request.
 """
 
+import threading
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 
-def derive_frequency_category(schedule_config: Optional[dict]) -> Optional[str]:
-    if not schedule_config:
-        return None
-    cron = schedule_config.get('cron')
-    if not cron:
-        return None
+@lru_cache(maxsize=256)
+def _compiled_cron(cron: str):
+    """Parse a cron expression once. croniter objects are stateful, so each
+    one is paired with a lock that callers hold while repositioning it."""
+    from croniter import croniter
+    return croniter(cron), threading.Lock()
+
+
+def next_fire(cron: str, base: datetime) -> datetime:
+    """Return the first fire time of `cron` after `base`.
+
+    The result carries `base`'s tzinfo, exactly as `croniter(cron, base)`
+    would. Raises whatever croniter raises for an invalid expression.
+    """
+    it, lock = _compiled_cron(cron)
+    with lock:
+        it.set_current(base, force=True)
+        return it.get_next(datetime)
+
+
+@lru_cache(maxsize=256)
+def _category_for_cron(cron: str) -> Optional[str]:
     try:
-        from croniter import croniter
-        base = datetime(2026, 1, 1)
-        c = croniter(cron, base)
-        t1 = c.get_next(datetime)
-        t2 = c.get_next(datetime)
+        t1 = next_fire(cron, datetime(2026, 1, 1))
+        t2 = next_fire(cron, t1)
         delta_seconds = (t2 - t1).total_seconds()
     except Exception:
         return None
@@ -38,3 +57,12 @@ def derive_frequency_category(schedule_config: Optional[dict]) -> Optional[str]:
     if delta_seconds <= 86400:
         return 'med'
     return 'low'
+
+
+def derive_frequency_category(schedule_config: Optional[dict]) -> Optional[str]:
+    if not schedule_config:
+        return None
+    cron = schedule_config.get('cron')
+    if not cron:
+        return None
+    return _category_for_cron(cron)
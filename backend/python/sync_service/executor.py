@@ -24,11 +24,18 @@ from sync_service.config import session_scope
 from sync_service.freshness import check_freshness, is_stale
 from sync_service.models import SyncPipeline, SyncRun
 from sync_service.pipelines.base import BasePipeline, RunResult
-from sync_service.registry import get_pipeline, instantiate_pipeline
+from sync_service.registry import get_pipeline_cached, instantiate_pipeline
 from sync_service.resource_pool import ResourcePool, get_pool
 
 logger = logging.getLogger(__name__)
 
+_DISPATCH_WORKERS = 4
+
+
+def _log_background_failure(future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("background sync task failed", exc_info=future.exception())
+
 
 def _hash_scope(scope: Dict[str, Any]) -> str:
     """Stable, short hash of a scope dict for dedup keying."""
@@ -55,7 +62,19 @@ class OnDemandExecutor:
             max_workers=max_workers,
             thread_name_prefix='sync-exec',
         )
+        # Fire-and-forget callers (web routes kicking off a refresh) park a
+        # thread in run() while the pipeline executes. Give them their own
+        # bounded pool rather than a fresh Thread per request; it must be
+        # separate from _thread_pool or blocked dispatchers could starve
+        # the workers they are waiting on.
+        self._dispatch_pool = ThreadPoolExecutor(
+            max_workers=_DISPATCH_WORKERS,
+            thread_name_prefix='sync-dispatch',
+        )
         self._in_flight: Dict[Tuple[str, str], Future] = {}
+        # execution_id -> Event set once the run's final row is written.
+        # Lets API callers block on completion instead of re-polling.
+        self._run_done: Dict[str, threading.Event] = {}
         self._in_flight_lock = threading.Lock()
         self._registered_pipelines: set = set()
         self._shutdown = False
@@ -94,7 +113,7 @@ class OnDemandExecutor:
             RunResult with status='fresh' (skipped), 'refreshed' (ran), or
             'failed' (error).
         """
-        pipeline_row = get_pipeline(pipeline_name)
+        pipeline_row = get_pipeline_cached(pipeline_name)
         if pipeline_row is None:
             return RunResult(status='failed', scope=scope or {}, error='Pipeline not found')
         if not pipeline_row.enabled:
@@ -154,7 +173,7 @@ class OnDemandExecutor:
         triggered_by_detail: Optional[str] = None,
     ) -> RunResult:
         """Force-run a pipeline regardless of freshness."""
-        pipeline_row = get_pipeline(pipeline_name)
+        pipeline_row = get_pipeline_cached(pipeline_name)
         if pipeline_row is None:
             return RunResult(status='failed', scope=scope or {}, error='Pipeline not found')
         if not pipeline_row.enabled:
@@ -175,6 +194,16 @@ class OnDemandExecutor:
             skip_freshness_check=True,
         )
 
+    def submit_background(self, fn, *args, **kwargs) -> Future:
+        """Schedule fn(*args, **kwargs) on the bounded dispatch pool.
+
+        For web routes that trigger runs without waiting on them. fn
+        typically calls run(); exceptions are logged, not raised.
+        """
+        future = self._dispatch_pool.submit(fn, *args, **kwargs)
+        future.add_done_callback(_log_background_failure)
+        return future
+
     def _run_with_dedup(
         self,
         pipeline_row: SyncPipeline,
@@ -227,6 +256,9 @@ class OnDemandExecutor:
                 triggered_by_detail=triggered_by_detail,
                 started_at=started_at,
             )
+            if execution_id is not None:
+                with self._in_flight_lock:
+                    self._run_done[str(execution_id)] = threading.Event()
 
         try:
             result = future.result(timeout=timeout)
@@ -246,13 +278,19 @@ class OnDemandExecutor:
 
         # Record the run — every caller records their own perspective
         if execution_id is not None:
-            self._record_run_finish(
-                execution_id=execution_id,
-                result=result,
-                was_fresh=(result.status == 'fresh'),
-                freshness_age_seconds=freshness_age_seconds,
-                started_at=started_at,
-            )
+            try:
+                self._record_run_finish(
+                    execution_id=execution_id,
+                    result=result,
+                    was_fresh=(result.status == 'fresh'),
+                    freshness_age_seconds=freshness_age_seconds,
+                    started_at=started_at,
+                )
+            finally:
+                with self._in_flight_lock:
+                    done = self._run_done.pop(str(execution_id), None)
+                if done is not None:
+                    done.set()
         else:
             # Dedup'd caller (needs its own dedup-flagged row), OR
             # _record_run_start failed (fallback: still record the outcome).
@@ -415,6 +453,19 @@ class OnDemandExecutor:
         except Exception:
             logger.exception(f"Failed to record sync run for {pipeline_name}")
 
+    def wait_for_run(self, execution_id: str, timeout: float) -> bool:
+        """Block until the run finishes or `timeout` seconds pass.
+
+        Returns False immediately if the run is not in flight in this process
+        (already finished, or started by another worker), True otherwise.
+        """
+        with self._in_flight_lock:
+            done = self._run_done.get(execution_id)
+        if done is None:
+            return False
+        done.wait(timeout)
+        return True
+
     def stats(self) -> Dict[str, Any]:
         """Current executor state for observability."""
         with self._in_flight_lock:
@@ -428,8 +479,9 @@ class OnDemandExecutor:
         }
 
     def shutdown(self, wait: bool = True):
-        """Shut down the thread pool."""
+        """Shut down the thread pools."""
         self._shutdown = True
+        self._dispatch_pool.shutdown(wait=wait)
         self._thread_pool.shutdown(wait=wait)
 
 
@@ -5,6 +5,7 @@ Own declarative_base — no shared metadata with scheduler/ or sync/.
 """
 
 from datetime import datetime
+from operator import attrgetter
 from typing import Optional
 from sqlalchemy import (
     Column, Integer, BigInteger, String, Boolean, DateTime, Text,
@@ -12,7 +13,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 Base = declarative_base()
 
@@ -81,34 +82,54 @@ class SyncPipeline(Base):
             }]
         return []
 
+    # Everything to_dict() reads, fetched with one attrgetter call. Shared by
+    # the list and detail endpoints, so the per-pipeline cost of a listing is
+    # a single C-level gather plus the dict build.
+    _DICT_VALUES = attrgetter(
+        'pipeline_name', 'display_name', 'description', 'pipeline_class',
+        'enabled', 'schedule_type', 'schedule_config',
+        'freshness_table', 'freshness_column', 'freshness_scope_column',
+        'freshness_ttl_seconds', 'freshness_database',
+        'max_concurrency', 'resource_group', 'max_db_connections',
+        'timeout_seconds', 'max_retries', 'retry_delay_seconds',
+        'default_args', 'frequency_category', 'destinations',
+    )
+
     def to_dict(self) -> dict:
+        (pipeline_name, display_name, description, pipeline_class,
+         enabled, schedule_type, schedule_config,
+         freshness_table, freshness_column, freshness_scope_column,
+         freshness_ttl_seconds, freshness_database,
+         max_concurrency, resource_group, max_db_connections,
+         timeout_seconds, max_retries, retry_delay_seconds,
+         default_args, frequency_category, destinations) = SyncPipeline._DICT_VALUES(self)
         return {
-            'pipeline_name': self.pipeline_name,
-            'display_name': self.display_name,
-            'description': self.description,
-            'pipeline_class': self.pipeline_class,
-            'enabled': self.enabled,
-            'schedule_type': self.schedule_type,
-            'schedule_config': self.schedule_config or {},
+            'pipeline_name': pipeline_name,
+            'display_name': display_name,
+            'description': description,
+            'pipeline_class': pipeline_class,
+            'enabled': enabled,
+            'schedule_type': schedule_type,
+            'schedule_config': schedule_config or {},
             'freshness': {
-                'table': self.freshness_table,
-                'column': self.freshness_column,
-                'scope_column': self.freshness_scope_column,
-                'ttl_seconds': self.freshness_ttl_seconds,
-                'database': self.freshness_database,
+                'table': freshness_table,
+                'column': freshness_column,
+                'scope_column': freshness_scope_column,
+                'ttl_seconds': freshness_ttl_seconds,
+                'database': freshness_database,
             },
             'execution': {
-                'max_concurrency': self.max_concurrency,
-                'resource_group': self.resource_group,
-                'max_db_connections': self.max_db_connections,
-                'timeout_seconds': self.timeout_seconds,
-                'max_retries': self.max_retries,
-                'retry_delay_seconds': self.retry_delay_seconds,
+                'max_concurrency': max_concurrency,
+                'resource_group': resource_group,
+                'max_db_connections': max_db_connections,
+                'timeout_seconds': timeout_seconds,
+                'max_retries': max_retries,
+                'retry_delay_seconds': retry_delay_seconds,
             },
-            'default_args': self.default_args or {},
-            'frequency_category': self.frequency_category,
+            'default_args': default_args or {},
+            'frequency_category': frequency_category,
             'resolved_frequency_category': self.resolved_frequency_category,
-            'destinations': self.destinations,
+            'destinations': destinations,
             'resolved_destinations': self.resolved_destinations,
         }
 
@@ -152,27 +173,44 @@ class SyncRun(Base):
     __table_args__ = (
         Index('idx_sync_runs_pipeline', 'pipeline_name', 'started_at'),
         Index('idx_sync_runs_scope_hash', 'pipeline_name', 'scope_hash', 'status'),
+        Index('idx_sync_runs_running', 'status', postgresql_where=text("status = 'running'")),
+        Index('idx_sync_runs_queued', text('queued_at DESC'), 'status', 'pipeline_name'),
+        Index('idx_sync_runs_chain_id', text("(scope->>'chain_id')"),
+              postgresql_where=text("(scope->>'chain_id') IS NOT NULL")),
+    )
+
+    # Columns read by serialize(). Selecting just these (instead of the whole
+    # entity) keeps read-only run listings off the ORM hydration path.
+    API_COLUMNS = (
+        'execution_id', 'pipeline_name', 'scope', 'triggered_by', 'status',
+        'queued_at', 'started_at', 'completed_at', 'duration_ms',
+        'records_processed', 'result', 'error_message',
+        'freshness_age_seconds', 'was_fresh', 'was_deduplicated',
+        'attempt_number',
     )
 
+    @classmethod
+    def api_columns(cls) -> list:
+        return [getattr(cls, c) for c in cls.API_COLUMNS]
+
+    # serialize() runs once per row on every listing; one attrgetter call
+    # fetches all columns instead of a Python-level attribute read each.
+    _API_VALUES = attrgetter(*API_COLUMNS)
+    _API_DATETIMES = ('queued_at', 'started_at', 'completed_at')
+
+    @staticmethod
+    def serialize(row) -> dict:
+        """Build the API dict from a SyncRun instance or a Row of api_columns()."""
+        d = dict(zip(SyncRun.API_COLUMNS, SyncRun._API_VALUES(row)))
+        d['execution_id'] = str(d['execution_id'])
+        d['scope'] = d['scope'] or {}
+        for c in SyncRun._API_DATETIMES:
+            v = d[c]
+            d[c] = v.isoformat() if v else None
+        return d
+
     def to_dict(self) -> dict:
-        return {
-            'execution_id': str(self.execution_id),
-            'pipeline_name': self.pipeline_name,
-            'scope': self.scope or {},
-            'triggered_by': self.triggered_by,
-            'status': self.status,
-            'queued_at': self.queued_at.isoformat() if self.queued_at else None,
-            'started_at': self.started_at.isoformat() if self.started_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'duration_ms': self.duration_ms,
-            'records_processed': self.records_processed,
-            'result': self.result,
-            'error_message': self.error_message,
-            'freshness_age_seconds': self.freshness_age_seconds,
-            'was_fresh': self.was_fresh,
-            'was_deduplicated': self.was_deduplicated,
-            'attempt_number': self.attempt_number,
-        }
+        return SyncRun.serialize(self)
 
 
 class SyncStateEntry(Base):
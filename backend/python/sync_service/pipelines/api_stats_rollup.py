@@ -0,0 +1,39 @@
+"""
+ApiStatsRollupPipeline — refresh the api_stats_hourly materialized view.
+
+Reads/writes esa_backend: api_statistics → api_stats_hourly (created by
+migrations/20261018_api_stats_hourly_backend.sql). The /api/statistics
+summary, endpoints and timeline views read complete hours from the view and
+only touch raw rows newer than its latest hour, so a missed refresh costs
+speed, not correctness.
+
+Scope keys: none.
+"""
+
+import logging
+from typing import Any, Dict
+
+from sqlalchemy import text
+
+from sync_service.config import get_engine
+from sync_service.pipelines.base import BasePipeline, RunResult
+
+logger = logging.getLogger(__name__)
+
+
+class ApiStatsRollupPipeline(BasePipeline):
+
+    def _execute(self, scope: Dict[str, Any]) -> RunResult:
+        engine = get_engine('backend')
+        with engine.begin() as conn:
+            # CONCURRENTLY keeps the view readable during the refresh (uses
+            # ux_api_stats_hourly).
+            conn.execute(text('REFRESH MATERIALIZED VIEW CONCURRENTLY api_stats_hourly'))
+            rows, latest = conn.execute(text(
+                'SELECT count(*), max(h) FROM api_stats_hourly'
+            )).one()
+
+        return RunResult(
+            status='refreshed', records=int(rows or 0), scope=scope,
+            metadata={'latest_hour': latest.isoformat() if latest else None},
+        )
@@ -0,0 +1,49 @@
+"""
+StatsPartitionsPipeline — keep the weekly called_at partitions of the API
+statistics tables rolling.
+
+Writes esa_backend: api_statistics, external_api_statistics (partitioned by
+migrations/20261018_partition_statistics_backend.sql). Calls
+stats_partitions_maintain() for each table, which creates the children
+`weeks_ahead` weeks out and drops those wholly older than `retain_days`.
+
+Scope keys honoured (all optional):
+  - weeks_ahead: int  (default 4)
+  - retain_days: int  (default 91 — the longest dashboard period is 90d)
+"""
+
+import logging
+from typing import Any, Dict
+
+from sqlalchemy import text
+
+from sync_service.config import get_engine
+from sync_service.pipelines.base import BasePipeline, RunResult
+
+logger = logging.getLogger(__name__)
+
+STATS_TABLES = ('api_statistics', 'external_api_statistics')
+
+
+class StatsPartitionsPipeline(BasePipeline):
+
+    def _execute(self, scope: Dict[str, Any]) -> RunResult:
+        weeks_ahead = int(scope.get('weeks_ahead', 4))
+        retain_days = int(scope.get('retain_days', 91))
+
+        engine = get_engine('backend')
+        partitions = {}
+        with engine.begin() as conn:
+            for table in STATS_TABLES:
+                conn.execute(
+                    text('SELECT stats_partitions_maintain(:parent, :ahead, :retain)'),
+                    {'parent': table, 'ahead': weeks_ahead, 'retain': retain_days},
+                )
+                partitions[table] = conn.execute(text(
+                    'SELECT count(*) FROM pg_inherits WHERE inhparent = CAST(:parent AS regclass)'
+                ), {'parent': table}).scalar()
+
+        return RunResult(
+            status='refreshed', records=sum(partitions.values()), scope=scope,
+            metadata={'partitions': partitions},
+        )
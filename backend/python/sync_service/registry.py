@@ -4,7 +4,10 @@ Pipeline registry — load/resolve SyncPipeline rows and instantiate classes.
 
 import importlib
 import logging
-from typing import List, Optional
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 from sync_service.config import session_scope
 from sync_service.models import SyncPipeline
@@ -34,9 +37,48 @@ def get_pipeline(pipeline_name: str) -> Optional[SyncPipeline]:
         return row
 
 
+# ensure_fresh()/run() resolve the registry row on every call, and middleware
+# callers hit ensure_fresh once per request. Rows only change through the
+# PATCH endpoint, so a short per-process TTL is safe: edits made in this
+# process invalidate immediately, other workers converge within the TTL.
+_ROW_CACHE_TTL_SECONDS = 5.0
+_row_cache: Dict[str, Tuple[float, Optional[SyncPipeline]]] = {}
+_row_cache_lock = threading.Lock()
+
+
+def get_pipeline_cached(pipeline_name: str) -> Optional[SyncPipeline]:
+    """get_pipeline() behind a short per-process TTL cache.
+
+    The returned row is shared between callers — treat it as read-only.
+    """
+    now = time.monotonic()
+    with _row_cache_lock:
+        hit = _row_cache.get(pipeline_name)
+    if hit is not None and now - hit[0] < _ROW_CACHE_TTL_SECONDS:
+        return hit[1]
+    row = get_pipeline(pipeline_name)
+    with _row_cache_lock:
+        _row_cache[pipeline_name] = (now, row)
+    return row
+
+
+def invalidate_pipeline_cache(pipeline_name: Optional[str] = None) -> None:
+    """Drop one cached row, or all of them."""
+    with _row_cache_lock:
+        if pipeline_name is None:
+            _row_cache.clear()
+        else:
+            _row_cache.pop(pipeline_name, None)
+
+
+@lru_cache(maxsize=256)
 def resolve_pipeline_class(dotted_path: str) -> type:
     """Import and return a BasePipeline subclass by its fully-qualified dotted path.
 
+    Memoized per path: every run instantiates its pipeline through here, and
+    the answer for a given path never changes within a process. Failures
+    raise and so are not cached.
+
     Example:
         resolve_pipeline_class('sync_service.pipelines.reservations.ReservationsPipeline')
     """
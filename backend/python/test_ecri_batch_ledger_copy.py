@@ -0,0 +1,156 @@
+"""Unit tests for the COPY path of web.routes.ecri._insert_batch_ledgers.
+
+Run:
+    cd backend/python && python -m pytest test_ecri_batch_ledger_copy.py -v
+or directly:
+    cd backend/python && python test_ecri_batch_ledger_copy.py
+"""
+import json
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+
+from web.routes.ecri import _COPY_MIN_ROWS, _copy_value, _insert_batch_ledgers
+
+
+class _FakeCursor:
+    def __init__(self):
+        self.sql = None
+        self.data = None
+        self.closed = False
+
+    def copy_expert(self, sql, buf):
+        self.sql = sql
+        self.data = buf.read()
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeSession:
+    """Just enough of a Session for _insert_batch_ledgers."""
+
+    def __init__(self):
+        self.cursor = _FakeCursor()
+        self.executed = []
+
+    def execute(self, stmt, params=None):
+        self.executed.append((stmt, params))
+
+    def connection(self):
+        cursor = self.cursor
+
+        class _DBAPIConnection:
+            def cursor(self):
+                return cursor
+
+        class _Connection:
+            connection = _DBAPIConnection()
+
+        return _Connection()
+
+
+class CopyValueTests(unittest.TestCase):
+    """COPY text-format rendering of single values."""
+
+    def test_none_is_null_marker(self):
+        self.assertEqual(_copy_value(None), '\\N')
+
+    def test_bool(self):
+        self.assertEqual(_copy_value(True), 't')
+        self.assertEqual(_copy_value(False), 'f')
+
+    def test_numbers(self):
+        self.assertEqual(_copy_value(0), '0')
+        self.assertEqual(_copy_value(Decimal('12.50')), '12.50')
+
+    def test_dates(self):
+        self.assertEqual(_copy_value(date(2026, 5, 1)), '2026-05-01')
+        self.assertEqual(_copy_value(datetime(2026, 5, 1, 8, 30)), '2026-05-01T08:30:00')
+
+    def test_backslash_escaped(self):
+        self.assertEqual(_copy_value('a\\b'), 'a\\\\b')
+
+    def test_tab_escaped(self):
+        self.assertEqual(_copy_value('a\tb'), 'a\\tb')
+
+    def test_newlines_escaped(self):
+        self.assertEqual(_copy_value('a\nb\r\nc'), 'a\\nb\\r\\nc')
+
+    def test_dict_rendered_as_json(self):
+        v = {'note': 'x\ty', 'n': 1}
+        self.assertEqual(_copy_value(v), json.dumps(v).replace('\\', '\\\\'))
+
+    def test_list_rendered_as_json(self):
+        self.assertEqual(_copy_value([1, 'a']), '[1, "a"]')
+
+
+class InsertBatchLedgersTests(unittest.TestCase):
+    """ORM insert for small batches, COPY with defaults filled for large ones."""
+
+    def _rows(self, n):
+        return [
+            {'batch_id': 7, 'site_id': 1, 'ledger_id': i, 'unit_name': f'A{i}\t1',
+             'new_rent': Decimal('100.00'), 'notice_date': date(2026, 5, 1)}
+            for i in range(n)
+        ]
+
+    def test_small_batch_uses_orm_insert(self):
+        session = _FakeSession()
+        rows = self._rows(3)
+        _insert_batch_ledgers(session, rows)
+        self.assertEqual(len(session.executed), 1)
+        self.assertIs(session.executed[0][1], rows)
+        self.assertIsNone(session.cursor.sql)
+
+    def test_large_batch_streams_copy(self):
+        session = _FakeSession()
+        _insert_batch_ledgers(session, self._rows(_COPY_MIN_ROWS))
+        self.assertEqual(session.executed, [])
+        self.assertTrue(session.cursor.closed)
+
+        sql = session.cursor.sql
+        self.assertTrue(sql.startswith('COPY ecri_batch_ledgers ('))
+        self.assertTrue(sql.endswith(') FROM STDIN'))
+        cols = sql[sql.index('(') + 1:sql.index(')')].split(', ')
+
+        lines = session.cursor.data.split('\n')
+        self.assertEqual(lines[-1], '')
+        lines = lines[:-1]
+        self.assertEqual(len(lines), _COPY_MIN_ROWS)
+        first = dict(zip(cols, lines[0].split('\t')))
+        self.assertEqual(len(first), len(cols))
+        self.assertEqual(first['ledger_id'], '0')
+        self.assertEqual(first['unit_name'], 'A0\\t1')
+        self.assertEqual(first['notice_date'], '2026-05-01')
+
+    def test_large_batch_fills_scalar_defaults(self):
+        session = _FakeSession()
+        _insert_batch_ledgers(session, self._rows(_COPY_MIN_ROWS))
+        sql = session.cursor.sql
+        cols = sql[sql.index('(') + 1:sql.index(')')].split(', ')
+        first = dict(zip(cols, session.cursor.data.split('\n')[0].split('\t')))
+        self.assertEqual(first['control_group'], '0')
+        self.assertEqual(first['api_status'], 'pending')
+        self.assertEqual(first['exclusion_status'], 'none')
+        # Columns without a Python-side default are left to the database.
+        self.assertNotIn('id', cols)
+        self.assertNotIn('api_response', cols)
+
+    def test_explicit_value_beats_default(self):
+        session = _FakeSession()
+        rows = self._rows(_COPY_MIN_ROWS)
+        for r in rows:
+            r['control_group'] = 1
+            r['api_response'] = None
+        _insert_batch_ledgers(session, rows)
+        sql = session.cursor.sql
+        cols = sql[sql.index('(') + 1:sql.index(')')].split(', ')
+        first = dict(zip(cols, session.cursor.data.split('\n')[0].split('\t')))
+        self.assertEqual(cols.count('control_group'), 1)
+        self.assertEqual(first['control_group'], '1')
+        self.assertEqual(first['api_response'], '\\N')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Unit tests for the process-wide SiteCode cache in web.routes.ecri._site_code_map.
+
+Run:
+    cd backend/python && python -m pytest test_ecri_site_code_map.py -v
+or directly:
+    cd backend/python && python test_ecri_site_code_map.py
+"""
+import unittest
+from unittest import mock
+
+from web.routes import ecri
+
+
+class _FakeSession:
+    """Counts siteinfo reads and returns a fixed (SiteID, SiteCode) list."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def execute(self, stmt, params=None):
+        self.queries += 1
+        rows = self.rows
+
+        class _Result:
+            def fetchall(self):
+                return list(rows)
+
+        return _Result()
+
+
+class SiteCodeMapTests(unittest.TestCase):
+    """TTL and known-missing bookkeeping of the SiteCode cache."""
+
+    def setUp(self):
+        self.clock = 1000.0
+        patcher = mock.patch.object(ecri.time, 'monotonic', lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache = mock.patch.dict(ecri._site_codes_cache,
+                                {'codes': None, 'missing': frozenset(), 'fetched_at': 0.0})
+        cache.start()
+        self.addCleanup(cache.stop)
+        self.session = _FakeSession([(1, 'L001'), (2, 'L002')])
+
+    def test_cold_cache_fetches_once(self):
+        self.assertEqual(ecri._site_code_map(self.session, [1, 2]), {1: 'L001', 2: 'L002'})
+        self.assertEqual(self.session.queries, 1)
+
+    def test_fresh_hit_does_not_query(self):
+        ecri._site_code_map(self.session, [1, 2])
+        self.clock += 10
+        self.assertEqual(ecri._site_code_map(self.session, ['1']), {1: 'L001'})
+        self.assertEqual(self.session.queries, 1)
+
+    def test_unknown_id_forces_one_refetch(self):
+        ecri._site_code_map(self.session, [1])
+        self.session.rows.append((3, 'L003'))
+        self.assertEqual(ecri._site_code_map(self.session, [1, 3]), {1: 'L001', 3: 'L003'})
+        self.assertEqual(self.session.queries, 2)
+        ecri._site_code_map(self.session, [3])
+        self.assertEqual(self.session.queries, 2)
+
+    def test_known_missing_id_does_not_refetch(self):
+        self.assertEqual(ecri._site_code_map(self.session, [1, 99]), {1: 'L001'})
+        self.assertEqual(ecri._site_code_map(self.session, [99]), {})
+        self.assertEqual(ecri._site_code_map(self.session, [2, 99]), {2: 'L002'})
+        self.assertEqual(self.session.queries, 1)
+
+    def test_missing_ids_accumulate_within_ttl(self):
+        ecri._site_code_map(self.session, [98])
+        ecri._site_code_map(self.session, [99])
+        self.assertEqual(self.session.queries, 2)
+        # Both stay known-missing; alternating between them doesn't refetch.
+        ecri._site_code_map(self.session, [98])
+        ecri._site_code_map(self.session, [99])
+        self.assertEqual(self.session.queries, 2)
+
+    def test_ttl_expiry_refetches_and_resets_missing(self):
+        ecri._site_code_map(self.session, [1, 99])
+        self.clock += ecri._SITE_CODES_TTL
+        self.session.rows = [(1, 'L001-NEW')]
+        self.assertEqual(ecri._site_code_map(self.session, [1]), {1: 'L001-NEW'})
+        self.assertEqual(self.session.queries, 2)
+        # 99 was forgotten with the expired entry, so asking for it refetches.
+        ecri._site_code_map(self.session, [99])
+        self.assertEqual(self.session.queries, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
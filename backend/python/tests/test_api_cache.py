@@ -0,0 +1,169 @@
+"""
+Tests for the shared file-based response cache in web.routes.api.
+
+Run:
+    cd backend/python
+    PYTHONPATH=. pytest tests/test_api_cache.py -v
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from web.routes import api
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, '_CACHE_DIR', str(tmp_path))
+    return Flask(__name__)
+
+
+def _counting_endpoint(ttl, delay=0.0):
+    calls = []
+
+    @api.cached(ttl_seconds=ttl)
+    def endpoint():
+        calls.append(1)
+        time.sleep(delay)
+        return jsonify({'n': len(calls)})
+
+    return endpoint, calls
+
+
+def test_fresh_entry_is_served_from_cache(app):
+    endpoint, calls = _counting_endpoint(ttl=60)
+    with app.test_request_context('/api/x?p=1'):
+        assert endpoint().get_json() == {'n': 1}
+        assert endpoint().get_json() == {'n': 1}
+    assert len(calls) == 1
+
+
+def test_stale_entry_served_while_another_caller_refreshes(app):
+    endpoint, calls = _counting_endpoint(ttl=0)
+    with app.test_request_context('/api/x'):
+        endpoint()
+        path = api._cache_path('endpoint:/api/x:')
+        with api._refresh_lock(path, block=True):
+            # Someone else holds the refresh lock: the expired copy is returned
+            # without recomputing.
+            assert endpoint().get_json() == {'n': 1}
+    assert len(calls) == 1
+
+
+def test_cold_cache_computes_once_under_concurrency(app):
+    endpoint, calls = _counting_endpoint(ttl=60, delay=0.2)
+    results = []
+
+    def hit():
+        with app.test_request_context('/api/cold'):
+            results.append(endpoint().get_json())
+
+    threads = [threading.Thread(target=hit) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{'n': 1}] * 5
+
+
+def test_cache_files_written_atomically(app, tmp_path):
+    endpoint, _ = _counting_endpoint(ttl=60)
+    with app.test_request_context('/api/y'):
+        endpoint()
+    names = os.listdir(tmp_path)
+    assert not [n for n in names if n.endswith('.tmp')]
+    assert len([n for n in names if n.endswith('.json')]) == 1
+
+
+def test_cache_serves_stored_bytes_verbatim(app, tmp_path):
+    endpoint, calls = _counting_endpoint(ttl=60)
+    with app.test_request_context('/api/z'):
+        first = endpoint().get_data()
+        second = endpoint()
+    assert second.get_data() == first
+    assert second.mimetype == 'application/json'
+    assert len(calls) == 1
+
+
+def test_error_responses_are_not_cached(app):
+    calls = []
+
+    @api.cached(ttl_seconds=60)
+    def missing():
+        calls.append(1)
+        return jsonify({'error': 'Site not found'}), 404
+
+    with app.test_request_context('/api/missing'):
+        assert missing()[1] == 404
+        assert missing()[1] == 404
+    assert len(calls) == 2
+
+
+def test_matching_etag_gets_304(app):
+    endpoint, calls = _counting_endpoint(ttl=60)
+    with app.test_request_context('/api/e'):
+        etag = endpoint().headers['ETag']
+    with app.test_request_context('/api/e', headers={'If-None-Match': etag}):
+        response = endpoint()
+    # Werkzeug drops the body when the 304 is sent.
+    assert response.status_code == 304
+    assert len(calls) == 1
+
+
+def test_version_token_keys_the_entry(app):
+    calls = []
+    token = {'v': 'd1'}
+
+    @api.cached(ttl_seconds=60, version=lambda site_id: token['v'])
+    def by_site(site_id):
+        calls.append(site_id)
+        return jsonify({'n': len(calls)})
+
+    with app.test_request_context('/api/billing-day/7'):
+        assert by_site(7).get_json() == {'n': 1}
+        assert by_site(7).get_json() == {'n': 1}
+        token['v'] = 'd2'  # a new extract landed
+        assert by_site(7).get_json() == {'n': 2}
+    assert calls == [7, 7]
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def _age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_stale_entry_is_served_and_refreshed_in_background(app):
+    endpoint, calls = _counting_endpoint(ttl=10, delay=0.1)
+    with app.test_request_context('/api/swr'):
+        endpoint()
+        _age(api._cache_path('endpoint:/api/swr:'), 15)
+        # Inside ttl + stale: the old body comes back without waiting.
+        assert endpoint().get_json() == {'n': 1}
+    assert _wait_for(lambda: len(calls) == 2)
+    with app.test_request_context('/api/swr'):
+        assert _wait_for(lambda: endpoint().get_json() == {'n': 2})
+    assert len(calls) == 2
+
+
+def test_entry_past_stale_window_is_recomputed_inline(app):
+    endpoint, calls = _counting_endpoint(ttl=10)
+    with app.test_request_context('/api/old'):
+        endpoint()
+        _age(api._cache_path('endpoint:/api/old:'), 25)
+        assert endpoint().get_json() == {'n': 2}
+    assert len(calls) == 2
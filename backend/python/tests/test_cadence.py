@@ -0,0 +1,44 @@
+"""
+Tests for sync_service.cadence cron helpers.
+
+Run:
+    cd backend/python
+    PYTHONPATH=. pytest tests/test_cadence.py -v
+"""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+croniter = pytest.importorskip('croniter').croniter
+
+from sync_service.cadence import derive_frequency_category, next_fire
+
+
+def test_next_fire_matches_fresh_croniter():
+    sgt = timezone(timedelta(hours=8))
+    base = datetime(2026, 10, 18, 10, 30, tzinfo=sgt)
+    for cron in ('0 9 * * *', '*/15 * * * *', '0 2 * * 1'):
+        assert next_fire(cron, base) == croniter(cron, base).get_next(datetime)
+
+
+def test_next_fire_reuses_parse_across_bases():
+    cron = '0 9 * * *'
+    early = datetime(2026, 10, 18, 8, 0)
+    late = datetime(2026, 10, 18, 10, 0)
+
+    assert next_fire(cron, late) == datetime(2026, 10, 19, 9, 0)
+    # Repositioning the cached iterator backwards must not carry state over.
+    assert next_fire(cron, early) == datetime(2026, 10, 18, 9, 0)
+
+
+def test_derive_frequency_category_buckets():
+    assert derive_frequency_category({'cron': '*/15 * * * *'}) == 'high'
+    assert derive_frequency_category({'cron': '0 9 * * *'}) == 'med'
+    assert derive_frequency_category({'cron': '0 9 * * 1'}) == 'low'
+    assert derive_frequency_category({'cron': 'not a cron'}) is None
+    assert derive_frequency_category({}) is None
+    assert derive_frequency_category(None) is None
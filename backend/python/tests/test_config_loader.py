@@ -0,0 +1,176 @@
+"""
+Tests for common.config_loader YAML persistence helpers.
+
+Run:
+    cd backend/python
+    PYTHONPATH=. pytest tests/test_config_loader.py -v
+"""
+import os
+import sys
+
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from common.config_loader import load_yaml_cached, write_yaml_atomic
+
+
+def test_write_yaml_atomic_round_trips_and_keeps_order(tmp_path):
+    path = tmp_path / 'scheduler.yaml'
+    data = {'pipelines': {'rentroll': {'enabled': True}}, 'alpha': 1}
+
+    write_yaml_atomic(path, data)
+
+    assert yaml.safe_load(path.read_text()) == data
+    assert path.read_text().startswith('pipelines:')
+
+
+def test_write_yaml_atomic_replaces_existing_and_keeps_mode(tmp_path):
+    path = tmp_path / 'app.yaml'
+    path.write_text('old: true\n')
+    os.chmod(path, 0o640)
+
+    write_yaml_atomic(path, {'new': True})
+
+    assert yaml.safe_load(path.read_text()) == {'new': True}
+    assert (path.stat().st_mode & 0o777) == 0o640
+
+
+def test_write_yaml_atomic_leaves_no_temp_files(tmp_path):
+    path = tmp_path / 'app.yaml'
+    write_yaml_atomic(path, {'a': 1})
+
+    leftovers = [p.name for p in tmp_path.iterdir() if p.name.endswith('.tmp')]
+    assert leftovers == []
+    # Config loader globs *.yaml — the lock sidecar must not match it.
+    assert sorted(p.name for p in tmp_path.glob('*.yaml')) == ['app.yaml']
+
+
+def test_write_yaml_atomic_keeps_original_on_dump_failure(tmp_path, monkeypatch):
+    path = tmp_path / 'app.yaml'
+    path.write_text('keep: me\n')
+
+    def _boom(*args, **kwargs):
+        raise yaml.YAMLError('dump failed')
+
+    monkeypatch.setattr(yaml, 'dump', _boom)
+    with pytest.raises(yaml.YAMLError):
+        write_yaml_atomic(path, {'new': True})
+
+    assert path.read_text() == 'keep: me\n'
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith('.tmp')] == []
+
+
+def test_load_yaml_cached_skips_reparse_until_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / 'scheduler.yaml'
+    write_yaml_atomic(path, {'pipelines': {'rentroll': {'sql_chunk_size': 500}}})
+
+    assert load_yaml_cached(path)['pipelines']['rentroll']['sql_chunk_size'] == 500
+
+    calls = []
+    real_load = yaml.load
+    monkeypatch.setattr(yaml, 'load', lambda f, Loader: calls.append(1) or real_load(f, Loader=Loader))
+
+    load_yaml_cached(path)
+    assert calls == []
+
+    # Our own writes go straight into the cache...
+    write_yaml_atomic(path, {'pipelines': {'rentroll': {'sql_chunk_size': 1000}}})
+    assert load_yaml_cached(path)['pipelines']['rentroll']['sql_chunk_size'] == 1000
+    assert calls == []
+
+    # ...while an out-of-band edit changes the stat key and forces a re-parse.
+    path.write_text('pipelines:\n  rentroll:\n    sql_chunk_size: 25000\n')
+    assert load_yaml_cached(path)['pipelines']['rentroll']['sql_chunk_size'] == 25000
+    assert calls == [1]
+
+
+def test_load_yaml_cached_evicts_least_recently_used(tmp_path, monkeypatch):
+    import common.config_loader as config_loader
+    monkeypatch.setattr(config_loader, '_YAML_CACHE_MAX_ENTRIES', 2)
+    monkeypatch.setattr(config_loader, '_yaml_cache', config_loader.OrderedDict())
+
+    paths = []
+    for name in ('a', 'b', 'c'):
+        p = tmp_path / f'{name}.yaml'
+        p.write_text(f'{name}: 1\n')
+        paths.append(p)
+
+    load_yaml_cached(paths[0])
+    load_yaml_cached(paths[1])
+    load_yaml_cached(paths[0])  # a is now most recently used
+    load_yaml_cached(paths[2])
+
+    assert list(config_loader._yaml_cache) == [str(paths[0]), str(paths[2])]
+
+
+def test_load_yaml_cached_returns_independent_copies(tmp_path):
+    path = tmp_path / 'mcp.yaml'
+    write_yaml_atomic(path, {'tools': {'enabled': ['a']}})
+
+    first = load_yaml_cached(path)
+    first['tools']['enabled'].append('b')
+
+    assert load_yaml_cached(path) == {'tools': {'enabled': ['a']}}
+
+
+def test_load_yaml_cached_stays_on_the_safe_subset(tmp_path):
+    path = tmp_path / 'evil.yaml'
+    path.write_text('x: !!python/object/apply:os.system ["true"]\n')
+
+    with pytest.raises(yaml.YAMLError):
+        load_yaml_cached(path)
+
+
+def test_write_yaml_atomic_refuses_python_objects(tmp_path):
+    path = tmp_path / 'app.yaml'
+    path.write_text('keep: me\n')
+
+    # Safe dumper: anything load_yaml_cached couldn't read back is rejected
+    # up front instead of being written as a python/object tag.
+    with pytest.raises(yaml.YAMLError):
+        write_yaml_atomic(path, {'bad': object()})
+
+    assert path.read_text() == 'keep: me\n'
+
+
+def test_load_yaml_cached_cold_read_uses_json_sidecar(tmp_path, monkeypatch):
+    import common.config_loader as config_loader
+    path = tmp_path / 'app.yaml'
+    write_yaml_atomic(path, {'pipelines': {'rentroll': {'enabled': True}}})
+    assert (tmp_path / '.app.yaml.json').exists()
+
+    # Simulate a fresh worker process: empty in-memory cache, no YAML parsing.
+    monkeypatch.setattr(config_loader, '_yaml_cache', config_loader.OrderedDict())
+    calls = []
+    real_load = yaml.load
+    monkeypatch.setattr(yaml, 'load', lambda f, Loader: calls.append(1) or real_load(f, Loader=Loader))
+
+    assert load_yaml_cached(path) == {'pipelines': {'rentroll': {'enabled': True}}}
+    assert calls == []
+
+
+def test_load_yaml_cached_ignores_stale_sidecar(tmp_path, monkeypatch):
+    import common.config_loader as config_loader
+    path = tmp_path / 'app.yaml'
+    write_yaml_atomic(path, {'a': 1})
+    path.write_text('a: 22\n')
+    monkeypatch.setattr(config_loader, '_yaml_cache', config_loader.OrderedDict())
+
+    assert load_yaml_cached(path) == {'a': 22}
+
+    # The YAML parse regenerated the sidecar for the next cold read.
+    monkeypatch.setattr(config_loader, '_yaml_cache', config_loader.OrderedDict())
+    monkeypatch.setattr(yaml, 'load', lambda *a, **k: pytest.fail('re-parsed YAML'))
+    assert load_yaml_cached(path) == {'a': 22}
+
+
+def test_load_yaml_cached_skips_sidecar_for_non_json_types(tmp_path):
+    path = tmp_path / 'app.yaml'
+    path.write_text('since: 2024-01-01\n1: numeric key\n')
+
+    data = load_yaml_cached(path)
+
+    assert data['since'].isoformat() == '2024-01-01'
+    assert not (tmp_path / '.app.yaml.json').exists()
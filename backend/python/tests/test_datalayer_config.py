@@ -0,0 +1,57 @@
+"""
+Tests for the DataLayerConfig.from_env() memo in common.config.
+
+Run:
+    cd backend/python
+    PYTHONPATH=. pytest tests/test_datalayer_config.py -v
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import common.config as config_mod
+import common.config_loader as config_loader
+from common.config import DataLayerConfig
+from common.config_loader import ConfigSection
+
+
+class _FakeAppConfig:
+    def __init__(self, base_url):
+        self.database = ConfigSection({})
+        self.apis = ConfigSection({'soap': {'base_url': base_url, 'corp_code': 'C'}})
+
+
+@pytest.fixture
+def app_config(monkeypatch):
+    holder = {'config': _FakeAppConfig('https://a/ReportingWs.asmx')}
+    monkeypatch.setattr(config_loader, 'get_config', lambda: holder['config'])
+    config_mod._from_env_cache.clear()
+    yield holder
+    config_mod._from_env_cache.clear()
+
+
+def test_from_env_is_shared_while_sections_unchanged(app_config):
+    first = DataLayerConfig.from_env()
+
+    assert DataLayerConfig.from_env() is first
+    assert first.soap.base_url == 'https://a/ReportingWs.asmx'
+
+
+def test_from_env_rebuilds_when_sections_are_replaced(app_config):
+    first = DataLayerConfig.from_env()
+    app_config['config'] = _FakeAppConfig('https://b/ReportingWs.asmx')
+
+    second = DataLayerConfig.from_env()
+
+    assert second is not first
+    assert second.soap.base_url == 'https://b/ReportingWs.asmx'
+
+
+def test_from_env_rebuilds_after_ttl(app_config, monkeypatch):
+    first = DataLayerConfig.from_env()
+    monkeypatch.setattr(config_mod, '_FROM_ENV_TTL_SECONDS', 0.0)
+
+    assert DataLayerConfig.from_env() is not first
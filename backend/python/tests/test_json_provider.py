@@ -0,0 +1,87 @@
+"""
+Tests for web.utils.json_provider — orjson output must match Flask's default.
+
+Run:
+    cd backend/python
+    PYTHONPATH=. pytest tests/test_json_provider.py -v
+"""
+import os
+import sys
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask import Flask, json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip('orjson')
+
+from web.utils.json_provider import OrjsonProvider, install_json_provider
+
+
+@dataclass
+class _Point:
+    x: int
+    y: int
+
+
+@pytest.fixture
+def apps():
+    default_app = Flask('default')
+    orjson_app = Flask('orjson')
+    assert install_json_provider(orjson_app)
+    assert isinstance(orjson_app.json, OrjsonProvider)
+    return default_app, orjson_app
+
+
+PAYLOADS = [
+    {'b': 1, 'a': [1.5, None, True], 'c': {'z': 'é', 'y': 'x'}},
+    {'when': datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc), 'day': date(2026, 10, 18)},
+    {'amount': Decimal('12.50'), 'id': uuid.UUID('12345678-1234-5678-1234-567812345678')},
+    {'point': _Point(1, 2)},
+    {2: 'two', 10: 'ten'},
+    [{'big': 2 ** 70}],
+]
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+def test_jsonify_matches_default_provider(apps, payload):
+    default_app, orjson_app = apps
+    with default_app.app_context():
+        expected = json.loads(default_app.json.response(payload).get_data())
+    with orjson_app.app_context():
+        got = json.loads(orjson_app.json.response(payload).get_data())
+    assert got == expected
+
+
+def test_indent_falls_back_to_stdlib(apps):
+    _, orjson_app = apps
+    assert orjson_app.json.dumps({'a': 1}, indent=2) == '{\n  "a": 1\n}'
+
+
+def test_unserializable_still_raises_type_error(apps):
+    _, orjson_app = apps
+    with pytest.raises(TypeError):
+        orjson_app.json.dumps({'x': object()})
+
+
+def test_response_body_matches_default_provider_bytes(apps):
+    default_app, orjson_app = apps
+    rows = [{'endpoint': f'/api/e{i}', 'avg_ms': i / 3, 'errors': i % 4} for i in range(500)]
+    with default_app.app_context():
+        expected = default_app.json.response({'data': rows}).get_data()
+    with orjson_app.app_context():
+        got = orjson_app.json.response({'data': rows}).get_data()
+    # Floats may differ in repr between encoders; compare structure and framing.
+    assert got.endswith(b'\n') and not got.endswith(b'\n\n')
+    assert json.loads(got) == json.loads(expected)
+
+
+def test_debug_response_is_still_indented(apps):
+    _, orjson_app = apps
+    orjson_app.debug = True
+    with orjson_app.app_context():
+        assert orjson_app.json.response({'a': 1}).get_data() == b'{\n  "a": 1\n}\n'
@@ -0,0 +1,69 @@
+"""
+Tests for the encoded /api/orchestrator/pipelines response.
+
+Run:
+    cd backend/python
+    PYTHONPATH=. pytest tests/test_pipelines_response.py -v
+"""
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sync_service.api import routes
+from web.utils.json_provider import install_json_provider
+
+
+class _Row:
+    def __init__(self, name, updated_at):
+        self.pipeline_name = name
+        self.updated_at = updated_at
+        self.encodes = 0
+
+    def to_dict(self):
+        self.encodes += 1
+        return {
+            'pipeline_name': self.pipeline_name,
+            'schedule_config': {'cron': '*/5 * * * *', 'enabled': True},
+            'freshness': {'ttl_seconds': 300, 'table': None},
+            'display_name': 'Unit – availability',
+        }
+
+
+@pytest.fixture(params=['stdlib', 'orjson'])
+def app(request):
+    app = Flask(__name__)
+    if request.param == 'orjson' and not install_json_provider(app):
+        pytest.skip('orjson not installed')
+    routes._pipeline_json.clear()
+    yield app
+    routes._pipeline_json.clear()
+
+
+def _assemble(rows, now=0.0):
+    fragments = [routes._pipeline_json_fragment(r, now) for r in rows]
+    return f'{{"count":{len(rows)},"pipelines":[{",".join(fragments)}]}}\n'.encode()
+
+
+def test_spliced_body_matches_jsonify(app):
+    ts = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    rows = [_Row('rentroll', ts), _Row('units', ts)]
+    with app.app_context():
+        expected = jsonify({'pipelines': [r.to_dict() for r in rows], 'count': 2}).get_data()
+        assert _assemble(rows) == expected
+
+
+def test_only_changed_pipeline_is_reencoded(app):
+    ts = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    rentroll, units = _Row('rentroll', ts), _Row('units', ts)
+    with app.app_context():
+        _assemble([rentroll, units])
+        units.updated_at = datetime(2026, 10, 2, tzinfo=timezone.utc)
+        _assemble([rentroll, units])
+
+    assert rentroll.encodes == 1
+    assert units.encodes == 2
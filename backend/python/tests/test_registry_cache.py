@@ -0,0 +1,75 @@
+"""
+Tests for the sync_service.registry per-process pipeline row cache.
+
+Run:
+    cd backend/python
+    PYTHONPATH=. pytest tests/test_registry_cache.py -v
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sync_service import registry
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = []
+
+    def fake_get_pipeline(name):
+        calls.append(name)
+        return {'pipeline_name': name, 'n': len(calls)}
+
+    monkeypatch.setattr(registry, 'get_pipeline', fake_get_pipeline)
+    registry.invalidate_pipeline_cache()
+    yield calls
+    registry.invalidate_pipeline_cache()
+
+
+def test_cached_lookup_hits_db_once_within_ttl(lookups):
+    first = registry.get_pipeline_cached('rentroll')
+    second = registry.get_pipeline_cached('rentroll')
+
+    assert first is second
+    assert lookups == ['rentroll']
+
+
+def test_cache_expires_after_ttl(lookups, monkeypatch):
+    registry.get_pipeline_cached('rentroll')
+    monkeypatch.setattr(registry, '_ROW_CACHE_TTL_SECONDS', 0.0)
+    registry.get_pipeline_cached('rentroll')
+
+    assert lookups == ['rentroll', 'rentroll']
+
+
+def test_invalidate_forces_reload(lookups):
+    registry.get_pipeline_cached('rentroll')
+    registry.get_pipeline_cached('units')
+    registry.invalidate_pipeline_cache('rentroll')
+
+    assert registry.get_pipeline_cached('rentroll')['n'] == 3
+    assert registry.get_pipeline_cached('units')['n'] == 2
+
+
+def test_resolve_pipeline_class_is_memoized():
+    path = 'sync_service.pipelines.ccws_ledgers.CcwsLedgersPipeline'
+    registry.resolve_pipeline_class.cache_clear()
+
+    first = registry.resolve_pipeline_class(path)
+    second = registry.resolve_pipeline_class(path)
+
+    assert first is second
+    assert registry.resolve_pipeline_class.cache_info().hits == 1
+
+
+def test_resolve_pipeline_class_does_not_cache_failures():
+    registry.resolve_pipeline_class.cache_clear()
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            registry.resolve_pipeline_class('NotQualified')
+
+    assert registry.resolve_pipeline_class.cache_info().currsize == 0
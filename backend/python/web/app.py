@@ -9,7 +9,7 @@ import sys
 import uuid
 from pathlib import Path
 from datetime import datetime
-from flask import Flask, g, request, jsonify
+from flask import Flask, g, has_request_context, request, jsonify
 from flask_cors import CORS
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
@@ -52,6 +52,10 @@ def create_app(config=None, db_url=None):
     if not app.config.get('DEBUG', False):
         app.config['SESSION_COOKIE_SECURE'] = True
 
+    # Faster jsonify() when orjson is installed; same output contract.
+    from web.utils.json_provider import install_json_provider
+    install_json_provider(app)
+
     # Pipeline config is now loaded from DB per-request (see _get_scheduler_config in api.py)
     app.scheduler_config = None
 
@@ -69,9 +73,30 @@ def create_app(config=None, db_url=None):
     # compatibility with existing call sites.
     from common.db import get_session as _get_session
 
-    app.get_db_session = lambda: _get_session('backend')
-    app.get_middleware_session = lambda: _get_session('middleware')
-    app.get_pbi_session = lambda: _get_session('pbi')
+    def _request_tracked(db):
+        """Session factory that registers request-time sessions on `g` so
+        teardown can return any the handler forgot to close to the pool."""
+        def factory():
+            session = _get_session(db)
+            if has_request_context():
+                g.setdefault('_db_sessions', []).append(session)
+            return session
+        return factory
+
+    app.get_db_session = _request_tracked('backend')
+    app.get_middleware_session = _request_tracked('middleware')
+    app.get_pbi_session = _request_tracked('pbi')
+
+    @app.teardown_request
+    def close_request_sessions(exc):
+        # close() is a no-op for sessions the handler already closed; for a
+        # leaked one it rolls back and releases the pooled connection now
+        # rather than whenever the object is garbage-collected.
+        for session in g.pop('_db_sessions', ()):
+            try:
+                session.close()
+            except Exception:
+                logging.getLogger(__name__).exception("closing request session failed")
 
     # Initialize CORS with restricted origins
     cors_origins = app.config.get('CORS_ORIGINS', [
@@ -170,9 +195,13 @@ def create_app(config=None, db_url=None):
         if request_id:
             response.headers['X-Request-ID'] = request_id
 
-        # Cache control for API endpoints
+        # Cache control for API endpoints. ETag-tagged responses may be kept
+        # but must be revalidated, so the client's If-None-Match can earn a 304.
         if '/api/' in request.path:
-            response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
+            if response.headers.get('ETag'):
+                response.headers['Cache-Control'] = 'private, no-cache'
+            else:
+                response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
             response.headers['Pragma'] = 'no-cache'
             response.headers['Expires'] = '0'
 
@@ -1,7 +1,8 @@
 """API call statistics model for tracking endpoint consumption."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from sqlalchemy import BigInteger, Boolean, Column, Integer, String, Float, DateTime, Index
+from sqlalchemy.sql import column, table
 
 from web.models.base import Base
 
@@ -28,6 +29,18 @@ class ApiStatistic(Base):
         Index('ix_api_stats_called_at', 'called_at'),
         Index('ix_api_stats_endpoint', 'endpoint'),
         Index('ix_api_stats_endpoint_called', 'endpoint', 'called_at'),
+        # Covers the slow-endpoints aggregate so it can run index-only.
+        Index(
+            'ix_api_stats_endpoint_method_called',
+            'endpoint', 'method', 'called_at',
+            postgresql_include=['response_time_ms', 'status_code'],
+        ),
+        # Window scans over called_at (rollup edges, top consumers).
+        Index(
+            'ix_api_stats_called_covering',
+            'called_at', 'endpoint', 'method',
+            postgresql_include=['response_time_ms', 'status_code', 'client_ip'],
+        ),
     )
 
     def to_dict(self):
@@ -43,3 +56,21 @@ class ApiStatistic(Base):
 
     def __repr__(self):
         return f"<ApiStatistic {self.method} {self.endpoint} {self.status_code}>"
+
+
+# Hourly rollup materialized view over api_statistics
+# (migrations/20261018_api_stats_hourly_backend.sql, refreshed by the
+# api_stats_rollup pipeline). A bare table() so it stays out of Base.metadata
+# and nothing tries to CREATE it as a table.
+api_stats_hourly = table(
+    'api_stats_hourly',
+    column('endpoint', String),
+    column('method', String),
+    column('is_probe', Boolean),
+    column('h', DateTime),
+    column('calls', BigInteger),
+    column('sum_rt', Float),
+    column('sum_rt_sq', Float),
+    column('max_rt', Float),
+    column('errors', BigInteger),
+)
@@ -30,6 +30,12 @@ class ExternalApiStatistic(Base):
         Index('ix_ext_api_called_at', 'called_at'),
         Index('ix_ext_api_service', 'service_name'),
         Index('ix_ext_api_service_called', 'service_name', 'called_at'),
+        # Covers the external summary/services window scans.
+        Index(
+            'ix_ext_api_called_covering',
+            'called_at', 'service_name',
+            postgresql_include=['endpoint', 'method', 'response_time_ms', 'success'],
+        ),
     )
 
     def to_dict(self):
@@ -7,6 +7,7 @@ import logging
 import bcrypt
 from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify, current_app
 from flask_login import login_required, current_user
+from web.routes.main import clear_page_cache
 from web.utils.audit import audit_log, AuditEvent
 from web.utils.validators import validate_password
 
@@ -759,6 +760,7 @@ def create_page():
             )
             db_session.add(page)
             db_session.commit()
+            clear_page_cache()
 
             audit_log(AuditEvent.PAGE_CREATED, f"Created page '{title}' ({slug}.{extension}), public={is_public}")
             flash(f'Page "{title}" created successfully.', 'success')
@@ -819,6 +821,7 @@ def edit_page(page_id):
                 page.extension = extension
 
             db_session.commit()
+            clear_page_cache()
             audit_log(AuditEvent.PAGE_UPDATED, f"Updated page '{page.title}' ({page.slug}.{page.extension})")
             flash('Page updated successfully.', 'success')
             return redirect(url_for('admin.list_pages'))
@@ -853,6 +856,7 @@ def delete_page(page_id):
             page_slug = page.slug
             db_session.delete(page)
             db_session.commit()
+            clear_page_cache()
             audit_log(AuditEvent.PAGE_DELETED, f"Deleted page '{page_title}' ({page_slug})")
             flash(f'Page "{page_title}" deleted.', 'success')
         else:
@@ -900,7 +904,7 @@ def list_configs():
 def edit_config(name):
     """Edit a configuration file."""
     import yaml
-    from common.config_loader import get_config
+    from common.config_loader import dump_yaml, get_config, parse_yaml
 
     config = get_config()
 
@@ -908,7 +912,7 @@ def edit_config(name):
         try:
             yaml_content = request.form.get('content', '')
             # Parse YAML to validate
-            data = yaml.safe_load(yaml_content)
+            data = parse_yaml(yaml_content)
             if config.update_config(name, data):
                 flash(f'Configuration "{name}" updated successfully.', 'success')
                 return redirect(url_for('admin.list_configs'))
@@ -921,7 +925,7 @@ def edit_config(name):
 
     # Get current content
     raw_data = config.get_raw_config(name)
-    content = yaml.dump(raw_data, default_flow_style=False, sort_keys=False) if raw_data else ''
+    content = dump_yaml(raw_data) if raw_data else ''
 
     return render_template('admin/config/edit.html', name=name, content=content)
 
@@ -4,26 +4,38 @@ Refactored from app.py to use blueprint pattern.
 """
 
 import os
-from datetime import datetime, timedelta
-import pytz
+import subprocess
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 from pathlib import Path
 import threading
 
 import re
 
-from functools import wraps
-from flask import Blueprint, jsonify, request, current_app, g
-from sqlalchemy import desc, func, case, text
+from functools import lru_cache, wraps
+from flask import (
+    Blueprint, Response, jsonify, request, current_app, g, stream_with_context,
+    copy_current_request_context,
+)
+from sqlalchemy import BigInteger, Float, Numeric, and_, bindparam, desc, func, case, or_, select, text, true, type_coerce, union_all
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import ARRAY, array, insert as pg_insert
 
 from web.auth.jwt_auth import require_auth, require_api_scope
+from web.models.api_statistic import ApiStatistic, api_stats_hourly
+from web.models.external_api_statistic import ExternalApiStatistic
 from web.utils.rate_limit import rate_limit_api
 from web.utils.validators import parse_site_ids
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
-# Timezones
-SGT = pytz.timezone('Asia/Singapore')
-UTC = pytz.UTC
+# Timezones — resolved once at import. zoneinfo (stdlib) rather than pytz:
+# cheaper to use and safe with datetime.replace(tzinfo=...).
+SGT = ZoneInfo('Asia/Singapore')
+UTC = timezone.utc
+
+# backend/python/datalayer — listed by /api/modules. Resolved once at import.
+_DATALAYER_PATH = Path(__file__).resolve().parents[2] / 'datalayer'
 
 
 def now_sgt():
@@ -42,11 +54,24 @@ def now_utc():
 import json
 import hashlib
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
 
 _CACHE_DIR = os.path.join(tempfile.gettempdir(), 'esa-api-cache')
 os.makedirs(_CACHE_DIR, mode=0o700, exist_ok=True)
 _cache_lock = threading.Lock()
 
+# Background recomputes for stale-while-revalidate (see cached()). Keys being
+# refreshed by this process, so a burst of hits on one stale entry submits
+# one job; the flock in _refresh_lock dedupes across workers.
+_revalidate_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='api-cache-revalidate')
+_revalidating: set = set()
+
 
 def _cache_path(key):
     """Get file path for a cache key."""
@@ -54,49 +79,188 @@ def _cache_path(key):
     return os.path.join(_CACHE_DIR, f'{safe_key}.json')
 
 
-def cached(ttl_seconds=30):
+def _read_cached(path):
+    """Return (body, age_seconds) for a cache file; (None, None) if absent/unreadable."""
+    try:
+        mtime = os.path.getmtime(path)
+        with open(path, 'rb') as f:
+            body = f.read()
+    except OSError:
+        return None, None
+    return body, datetime.now().timestamp() - mtime
+
+
+def _write_cached(path, body):
+    """Atomically replace a cache file so readers never see a partial write."""
+    fd, tmp = tempfile.mkstemp(dir=_CACHE_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(body)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def _refresh_lock(path, block):
+    """Per-key cross-worker lock for recomputing a cache entry.
+
+    Yields True if held. With block=False, yields False immediately when
+    another worker or thread is already recomputing.
+    """
+    if fcntl is None:
+        yield True
+        return
+    fd = os.open(f'{path}.lock', os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if block else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            acquired = True
+        except BlockingIOError:
+            acquired = False
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def _cached_response(body):
+    """Serve already-encoded JSON bytes without a decode/re-encode round trip."""
+    response = current_app.response_class(body, mimetype=current_app.json.mimetype)
+    return _conditional(response)
+
+
+def _conditional(response):
+    """Tag a JSON response with a content ETag; 304 it if the client already has it."""
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def _store_if_cacheable(path, response):
+    """Write a successful, non-streamed JSON response to the cache. Returns True if stored."""
+    if not (isinstance(response, current_app.response_class)
+            and response.status_code == 200
+            and response.is_json
+            and not response.is_streamed):
+        return False
+    try:
+        _write_cached(path, response.get_data())
+    except OSError:
+        pass
+    return True
+
+
+def _revalidate_in_background(path, ttl, func, args, kwargs):
+    """Recompute a stale entry off the request thread (at most one job per key)."""
+    with _cache_lock:
+        if path in _revalidating:
+            return
+        _revalidating.add(path)
+
+    @copy_current_request_context
+    def refresh():
+        try:
+            with _refresh_lock(path, block=False) as acquired:
+                if not acquired:
+                    return
+                _, age = _read_cached(path)
+                if age is not None and age < ttl:
+                    return
+                _store_if_cacheable(path, func(*args, **kwargs))
+        except Exception:
+            current_app.logger.exception("background cache refresh failed for %s", request.path)
+        finally:
+            with _cache_lock:
+                _revalidating.discard(path)
+
+    try:
+        _revalidate_pool.submit(refresh)
+    except RuntimeError:  # interpreter shutting down
+        with _cache_lock:
+            _revalidating.discard(path)
+
+
+def cached(ttl_seconds=30, version=None, stale_seconds=None):
     """
     File-based cache decorator for API responses.
     Shared across all gunicorn workers via filesystem.
 
+    Stale-while-revalidate: an entry past its TTL but younger than
+    ttl + stale_seconds is served immediately while a background thread
+    recomputes it, so no request waits on the refresh. Older entries are
+    recomputed inline by one worker/thread at a time; callers arriving while
+    it runs get the old copy, or, with no copy at all, wait for the result.
+    Either way a TTL expiry under load costs one recompute rather than one
+    per request.
+
+    Entries are the encoded body of a successful JSON response, stored and
+    served as bytes. Error responses (non-200, or a (body, status) tuple)
+    are passed through uncached. Successful responses carry an ETag of the
+    body, so a polling client sending If-None-Match gets an empty 304.
+
     Args:
         ttl_seconds: TTL in seconds, or a callable (request) -> int for per-request TTL.
             Use the callable form to tier TTL by query params (e.g. period=30d → longer).
+        version: Optional callable taking the view's arguments and returning
+            a cheap token of the underlying data (e.g. its latest extract
+            date). It becomes part of the cache key, so a new token is a miss
+            and the TTL only has to bound how long a token stays trusted.
+        stale_seconds: How long past the TTL an entry may still be served
+            while it is refreshed in the background. Defaults to the TTL.
     """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
             ttl = ttl_seconds(request) if callable(ttl_seconds) else ttl_seconds
+            stale = ttl if stale_seconds is None else stale_seconds
             cache_key = f"{func.__name__}:{request.path}:{request.query_string.decode()}"
+            if version is not None:
+                cache_key = f"{cache_key}:{version(*args, **kwargs)}"
             path = _cache_path(cache_key)
 
-            # Check file cache
-            try:
-                if os.path.exists(path):
-                    mtime = os.path.getmtime(path)
-                    if (datetime.now().timestamp() - mtime) < ttl:
-                        with open(path, 'r') as f:
-                            data = json.load(f)
-                        return jsonify(data)
-            except (OSError, json.JSONDecodeError):
-                pass
+            body, age = _read_cached(path)
+            if body is not None:
+                if age < ttl:
+                    return _cached_response(body)
+                if age < ttl + stale:
+                    _revalidate_in_background(path, ttl, func, args, kwargs)
+                    return _cached_response(body)
+
+            with _refresh_lock(path, block=body is None) as acquired:
+                if not acquired:
+                    return _cached_response(body)
+
+                # Whoever held the lock before us may have just refreshed it.
+                body, age = _read_cached(path)
+                if body is not None and age < ttl:
+                    return _cached_response(body)
+
+                response = func(*args, **kwargs)
+                if _store_if_cacheable(path, response):
+                    return _conditional(response)
+                return response
+        return wrapper
+    return decorator
 
-            # Call function and cache result
-            response = func(*args, **kwargs)
 
-            # Write to file cache (owner-only permissions)
-            try:
-                response_data = response.get_json()
-                if response_data is not None:
-                    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
-                    with os.fdopen(fd, 'w') as f:
-                        json.dump(response_data, f)
-            except (OSError, TypeError):
-                pass
+# Statistics `period` query param → lookback in days. Unknown values fall
+# back to 7. The timeline view has no 90d option.
+_PERIOD_DAYS = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}
+_TIMELINE_PERIOD_DAYS = {'1d': 1, '7d': 7, '30d': 30}
 
-            return response
-        return wrapper
-    return decorator
+_STATS_TTL_BY_PERIOD = {
+    '1d': 180,    # 3 min
+    '7d': 600,    # 10 min
+    '30d': 1800,  # 30 min
+    '90d': 3600,  # 1 hour
+}
 
 
 def stats_ttl_by_period(req):
@@ -106,13 +270,7 @@ def stats_ttl_by_period(req):
     require expensive scans of hundreds of thousands of rows and the underlying
     data shifts only by a few percent per hour — much longer TTL is fine.
     """
-    period = req.args.get('period', '7d')
-    return {
-        '1d': 180,    # 3 min
-        '7d': 600,    # 10 min
-        '30d': 1800,  # 30 min
-        '90d': 3600,  # 1 hour
-    }.get(period, 300)
+    return _STATS_TTL_BY_PERIOD.get(req.args.get('period', '7d'), 300)
 
 
 def clear_cache(pattern=None):
@@ -261,8 +419,6 @@ def api_service_action(service, action):
       service: backend-mcp | backend-orchestrator | backend-scheduler
       action:  start | stop | restart
     """
-    import subprocess
-
     if service not in _SERVICE_ALLOWLIST:
         return jsonify({'success': False, 'error': f'Unknown service: {service}'}), 400
     if action not in _ACTION_ALLOWLIST:
@@ -368,36 +524,94 @@ def api_transfer_pipeline(name):
         session.close()
 
 
-@api_bp.route('/modules')
-@require_auth
-@require_api_scope('sync:read')
-def api_list_modules():
-    """List available Python modules in datalayer."""
-    datalayer_path = Path(__file__).parent.parent.parent / 'datalayer'
-    modules = []
+# (datalayer dir st_mtime_ns, modules). Adding/removing/renaming a file bumps
+# the directory mtime, so a repeat call costs one stat instead of a scan.
+_modules_cache = None
+
+
+def _list_datalayer_modules():
+    global _modules_cache
+    try:
+        mtime_ns = os.stat(_DATALAYER_PATH).st_mtime_ns
+    except OSError:
+        return []
+    cached_entry = _modules_cache
+    if cached_entry is not None and cached_entry[0] == mtime_ns:
+        return cached_entry[1]
 
-    if datalayer_path.exists():
-        for f in datalayer_path.glob('*.py'):
-            if f.name.startswith('_'):
+    modules = []
+    with os.scandir(_DATALAYER_PATH) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith('.py') or name.startswith('_'):
                 continue
-            module_name = f.stem
+            module_name = name[:-3]
             modules.append({
                 'name': module_name,
                 'path': f'datalayer.{module_name}',
-                'file': str(f.name)
+                'file': name
             })
+    _modules_cache = (mtime_ns, modules)
+    return modules
+
 
-    return jsonify({'modules': modules})
+@api_bp.route('/modules')
+@require_auth
+@require_api_scope('sync:read')
+def api_list_modules():
+    """List available Python modules in datalayer."""
+    return jsonify({'modules': _list_datalayer_modules()})
 
 
 # =============================================================================
 # Billing Day Management
 # =============================================================================
 
+# site_id -> (fetched_at_monotonic, version). Short-lived so the billing-day
+# cache check is mostly a dict hit between rentroll loads.
+_RENTROLL_VERSION_TTL = 60.0
+_rentroll_version_cache = {}
+
+
+def _site_rentroll_version(site_id):
+    """(latest extract_date, newest updated_at on that date) for a site.
+
+    Changes whenever a rentroll run lands for the site: the current month is
+    deleted and re-inserted under a new extract_date, and a same-day re-run
+    bumps updated_at. Micro-cached per process.
+    """
+    import time
+    now = time.monotonic()
+    hit = _rentroll_version_cache.get(site_id)
+    if hit is not None and now - hit[0] < _RENTROLL_VERSION_TTL:
+        return hit[1]
+    from common.models import RentRoll
+    latest = (
+        select(func.max(RentRoll.extract_date))
+        .where(RentRoll.SiteID == site_id)
+        .correlate(None)
+        .scalar_subquery()
+    )
+    session = get_pbi_session()
+    try:
+        row = session.execute(
+            select(RentRoll.extract_date, func.max(RentRoll.updated_at))
+            .where(RentRoll.SiteID == site_id, RentRoll.extract_date == latest)
+            .group_by(RentRoll.extract_date)
+        ).first()
+    finally:
+        session.close()
+    version = tuple(row) if row else (None, None)
+    _rentroll_version_cache[site_id] = (now, version)
+    return version
+
+
 @api_bp.route('/billing-day/<int:site_id>')
 @require_auth
 @require_api_scope('sync:read')
-@cached(ttl_seconds=300)
+# Rentroll for a site only changes when a rentroll run lands, so the entry is
+# keyed on that version and kept for up to a day instead of 5 minutes.
+@cached(ttl_seconds=86400, version=lambda site_id: _site_rentroll_version(site_id))
 def api_get_billing_day_status(site_id):
     """
     Get billing day status for all rented units at a site.
@@ -406,18 +620,50 @@ def api_get_billing_day_status(site_id):
     """
     from common.models import RentRoll, SiteInfo
 
+    # Cutoff date (1 year ago) to filter out inactive tenants
+    one_year_ago = datetime.now() - timedelta(days=365)
+
+    # One round-trip: site row x latest extract_date, left-joined to the
+    # active tenants on that date. No site -> no rows; a site without
+    # rentroll data -> a single row with NULL latest_date/RentRoll columns.
+    # Active tenants only:
+    # - Unit is rented
+    # - Has valid ledger and tenant IDs
+    # - PaidThru within last year (excludes moved-out/inactive tenants)
+    latest = (
+        select(func.max(RentRoll.extract_date).label('latest_date'))
+        .where(RentRoll.SiteID == site_id)
+        .cte('latest')
+    )
+    stmt = (
+        select(
+            SiteInfo.SiteCode, SiteInfo.Name, latest.c.latest_date,
+            RentRoll.LedgerID, RentRoll.TenantID, RentRoll.UnitID,
+            RentRoll.sUnit, RentRoll.sTenant, RentRoll.sCompany,
+            RentRoll.dcRent, RentRoll.iAnnivDays, RentRoll.dPaidThru,
+        )
+        .select_from(SiteInfo)
+        .join(latest, true())
+        .outerjoin(RentRoll, and_(
+            RentRoll.SiteID == SiteInfo.SiteID,
+            RentRoll.extract_date == latest.c.latest_date,
+            RentRoll.bRented == True,
+            RentRoll.LedgerID.isnot(None),
+            RentRoll.TenantID.isnot(None),
+            RentRoll.dPaidThru >= one_year_ago,
+        ))
+        .where(SiteInfo.SiteID == site_id)
+        .order_by(RentRoll.iAnnivDays, RentRoll.sUnit)
+    )
+
     session = get_pbi_session()
     try:
-        # Get site info
-        site = session.query(SiteInfo).filter_by(SiteID=site_id).first()
-        if not site:
+        rows = session.execute(stmt).all()
+        if not rows:
             return jsonify({'error': 'Site not found'}), 404
 
-        # Get latest extract_date for this site
-        latest_date = session.query(func.max(RentRoll.extract_date)).filter(
-            RentRoll.SiteID == site_id
-        ).scalar()
-
+        site = rows[0]
+        latest_date = site.latest_date
         if not latest_date:
             return jsonify({
                 'site_id': site_id,
@@ -430,51 +676,29 @@ def api_get_billing_day_status(site_id):
                 'ledgers': []
             })
 
-        # Calculate cutoff date (1 year ago) to filter out inactive tenants
-        one_year_ago = datetime.now() - timedelta(days=365)
-
-        # Query active tenants only:
-        # - Unit is rented
-        # - Has valid ledger and tenant IDs
-        # - PaidThru within last year (excludes moved-out/inactive tenants)
-        rentroll_data = session.query(RentRoll).filter(
-            RentRoll.extract_date == latest_date,
-            RentRoll.SiteID == site_id,
-            RentRoll.bRented == True,
-            RentRoll.LedgerID.isnot(None),
-            RentRoll.TenantID.isnot(None),
-            RentRoll.dPaidThru >= one_year_ago
-        ).order_by(
-            RentRoll.iAnnivDays,
-            RentRoll.sUnit
-        ).all()
-
-        # Build response
+        # Build response. Rows are unpacked positionally (column order of
+        # the select above) rather than via per-name Row attribute lookups.
         ledgers = []
         on_first = 0
-        not_on_first = 0
-
-        for rr in rentroll_data:
-            billing_day = rr.iAnnivDays
-            needs_conversion = billing_day != 1 if billing_day is not None else False
-
+        for (_, _, _, ledger_id, tenant_id, unit_id, unit_name, tenant_name,
+             company, rent, billing_day, paid_thru) in rows:
+            if ledger_id is None:
+                continue  # the outer join's all-NULL row when nothing matched
             if billing_day == 1:
                 on_first += 1
-            else:
-                not_on_first += 1
-
             ledgers.append({
-                'LedgerID': rr.LedgerID,
-                'TenantID': rr.TenantID,
-                'UnitID': rr.UnitID,
-                'UnitName': rr.sUnit,
-                'TenantName': rr.sTenant,
-                'Company': rr.sCompany,
-                'Rent': float(rr.dcRent) if rr.dcRent else None,
+                'LedgerID': ledger_id,
+                'TenantID': tenant_id,
+                'UnitID': unit_id,
+                'UnitName': unit_name,
+                'TenantName': tenant_name,
+                'Company': company,
+                'Rent': float(rent) if rent else None,
                 'BillingDay': billing_day,
-                'PaidThruDate': rr.dPaidThru.isoformat() if rr.dPaidThru else None,
-                'NeedsConversion': needs_conversion
+                'PaidThruDate': paid_thru.isoformat() if paid_thru else None,
+                'NeedsConversion': billing_day is not None and billing_day != 1
             })
+        not_on_first = len(ledgers) - on_first
 
         return jsonify({
             'site_id': site_id,
@@ -539,43 +763,55 @@ def api_update_billing_day():
     if not isinstance(commit, bool):
         return jsonify({'error': 'commit must be a boolean'}), 400
 
-    # Validate ledger belongs to an active tenant
+    # Validate ledger belongs to an active tenant. One round-trip: the site
+    # row, its latest extract_date (LATERAL), and the ledger's rentroll row on
+    # that date if any. NULL LedgerID with a latest_date -> ledger not found.
     from common.models import RentRoll, SiteInfo
+    rr_dates = aliased(RentRoll)
+    latest = (
+        select(func.max(rr_dates.extract_date).label('latest_date'))
+        .where(rr_dates.SiteID == SiteInfo.SiteID)
+        .lateral('latest')
+    )
+    stmt = (
+        select(
+            SiteInfo.SiteID, latest.c.latest_date,
+            RentRoll.LedgerID, RentRoll.bRented, RentRoll.dPaidThru,
+        )
+        .select_from(SiteInfo)
+        .join(latest, true())
+        .outerjoin(RentRoll, and_(
+            RentRoll.SiteID == SiteInfo.SiteID,
+            RentRoll.extract_date == latest.c.latest_date,
+            RentRoll.LedgerID == ledger_id,
+        ))
+        .where(SiteInfo.SiteCode == site_code)
+        .limit(1)
+    )
+
     session = get_pbi_session()
     try:
-        # Get site by code
-        site = session.query(SiteInfo).filter_by(SiteCode=site_code).first()
-        if not site:
-            return jsonify({'error': f'Site not found: {site_code}'}), 404
-
-        # Get latest extract_date for this site
-        latest_date = session.query(func.max(RentRoll.extract_date)).filter(
-            RentRoll.SiteID == site.SiteID
-        ).scalar()
+        ledger_record = session.execute(stmt).first()
+    finally:
+        session.close()
 
-        if latest_date:
-            one_year_ago = datetime.now() - timedelta(days=365)
+    if not ledger_record:
+        return jsonify({'error': f'Site not found: {site_code}'}), 404
 
-            # Check if ledger exists and is active
-            ledger_record = session.query(RentRoll).filter(
-                RentRoll.extract_date == latest_date,
-                RentRoll.SiteID == site.SiteID,
-                RentRoll.LedgerID == ledger_id
-            ).first()
+    if ledger_record.latest_date:
+        one_year_ago = datetime.now() - timedelta(days=365)
 
-            if not ledger_record:
-                return jsonify({'error': f'Ledger {ledger_id} not found at site {site_code}'}), 404
+        if ledger_record.LedgerID is None:
+            return jsonify({'error': f'Ledger {ledger_id} not found at site {site_code}'}), 404
 
-            if not ledger_record.bRented:
-                return jsonify({'error': f'Ledger {ledger_id} is not currently rented'}), 400
+        if not ledger_record.bRented:
+            return jsonify({'error': f'Ledger {ledger_id} is not currently rented'}), 400
 
-            if ledger_record.dPaidThru and ledger_record.dPaidThru < one_year_ago:
-                return jsonify({
-                    'error': f'Ledger {ledger_id} appears inactive (PaidThru: {ledger_record.dPaidThru.date()})',
-                    'hint': 'Cannot update billing day for moved-out or inactive tenants'
-                }), 400
-    finally:
-        session.close()
+        if ledger_record.dPaidThru and ledger_record.dPaidThru < one_year_ago:
+            return jsonify({
+                'error': f'Ledger {ledger_id} appears inactive (PaidThru: {ledger_record.dPaidThru.date()})',
+                'hint': 'Cannot update billing day for moved-out or inactive tenants'
+            }), 400
 
     # Get SOAP config
     config = DataLayerConfig.from_env()
@@ -645,28 +881,32 @@ def api_update_billing_day():
 # Sites List
 # =============================================================================
 
+def _fetch_site_list(session):
+    """Dropdown site list: only the four projected columns, as plain Rows.
+
+    A read-only listing has no use for full SiteInfo entities, so this skips
+    ORM hydration and the identity map.
+    """
+    from common.models import SiteInfo
+    rows = session.execute(
+        select(SiteInfo.SiteID, SiteInfo.SiteCode, SiteInfo.Name, SiteInfo.Country)
+        .order_by(SiteInfo.Country, SiteInfo.SiteCode)
+    ).all()
+    return [
+        {'site_id': site_id, 'site_code': site_code, 'name': name, 'country': country}
+        for site_id, site_code, name, country in rows
+    ]
+
+
 @api_bp.route('/sites')
 @require_auth
 @require_api_scope('inventory:read')
 @cached(ttl_seconds=300)
 def api_list_sites():
     """List all sites for dropdown selection."""
-    from common.models import SiteInfo
-
     session = get_pbi_session()
     try:
-        sites = session.query(SiteInfo).order_by(SiteInfo.Country, SiteInfo.SiteCode).all()
-        return jsonify({
-            'sites': [
-                {
-                    'site_id': s.SiteID,
-                    'site_code': s.SiteCode,
-                    'name': s.Name,
-                    'country': s.Country
-                }
-                for s in sites
-            ]
-        })
+        return jsonify({'sites': _fetch_site_list(session)})
     finally:
         session.close()
 
@@ -684,15 +924,10 @@ def _get_all_sites_cached():
     now = time.time()
     if _ALL_SITES_CACHE['sites'] is not None and (now - _ALL_SITES_CACHE['fetched_at']) < _ALL_SITES_TTL:
         return _ALL_SITES_CACHE['sites'], None
-    from common.models import SiteInfo
     try:
         session = get_pbi_session()
         try:
-            rows = session.query(SiteInfo).order_by(SiteInfo.Country, SiteInfo.SiteCode).all()
-            sites = [
-                {'site_id': s.SiteID, 'site_code': s.SiteCode, 'name': s.Name, 'country': s.Country}
-                for s in rows
-            ]
+            sites = _fetch_site_list(session)
         finally:
             session.close()
         _ALL_SITES_CACHE['sites'] = sites
@@ -798,37 +1033,34 @@ def api_statistics_summary():
             internal = status_code != 404 (real endpoints)
             probes   = status_code == 404 (bot/scanner traffic on routes that don't exist)
     """
-    from web.models.api_statistic import ApiStatistic
-
     period = request.args.get('period', '7d')
     classification = request.args.get('classification', 'internal')
-    days = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}.get(period, 7)
+    days = _PERIOD_DAYS.get(period, 7)
     since = datetime.utcnow() - timedelta(days=days)
 
     session = get_session()
     try:
-        # Single roundtrip: total + avg + error_count in one aggregate query.
-        agg_q = session.query(
-            func.count(ApiStatistic.id).label('total'),
-            func.avg(ApiStatistic.response_time_ms).label('avg_ms'),
-            func.sum(case((ApiStatistic.status_code >= 400, 1), else_=0)).label('errors'),
-        ).filter(ApiStatistic.called_at >= since)
-        agg = _apply_classification(agg_q, classification).one()
-        total_calls = int(agg.total or 0)
-        avg_response = float(agg.avg_ms or 0)
-        error_count = int(agg.errors or 0)
-
-        # Calls per time bucket in SGT (hourly for 24h, daily otherwise)
+        # Single roundtrip over the hourly rollup: calls per time bucket in
+        # SGT (hourly for 24h, daily otherwise) with the sums needed for the
+        # totals. SGT is a whole-hour offset, so UTC hour buckets fold into
+        # SGT days exactly.
+        hourly = _api_stats_hourly(since, classification)
         trunc_unit = 'hour' if period == '1d' else 'day'
-        sgt_time = func.timezone('Asia/Singapore', func.timezone('UTC', ApiStatistic.called_at))
-        volume_q = session.query(
-            func.date_trunc(trunc_unit, sgt_time).label('bucket'),
-            func.count(ApiStatistic.id).label('count')
-        ).filter(
-            ApiStatistic.called_at >= since
-        )
-        volume_q = _apply_classification(volume_q, classification)
-        volume = volume_q.group_by('bucket').order_by('bucket').all()
+        sgt_time = func.timezone('Asia/Singapore', func.timezone('UTC', hourly.c.h))
+        bucket = func.date_trunc(trunc_unit, sgt_time)
+        volume = session.execute(
+            select(
+                bucket.label('bucket'),
+                func.sum(hourly.c.calls).cast(BigInteger).label('count'),
+                func.sum(hourly.c.sum_rt).label('sum_rt'),
+                func.sum(hourly.c.errors).cast(BigInteger).label('errors'),
+            ).group_by(bucket).order_by(bucket)
+        ).all()
+
+        total_calls = sum(v.count for v in volume)
+        sum_rt = sum(v.sum_rt or 0 for v in volume)
+        avg_response = sum_rt / total_calls if total_calls else 0.0
+        error_count = sum(v.errors for v in volume)
 
         time_unit, timeline = _build_volume_timeline(period, volume)
 
@@ -848,8 +1080,7 @@ def api_statistics_summary():
 
 
 def _apply_classification(query, classification):
-    """Filter ApiStatistic query by Internal (200/2xx/5xx on real routes) vs Probes (404s)."""
-    from web.models.api_statistic import ApiStatistic
+    """Filter an ApiStatistic Query or select() by Internal (200/2xx/5xx on real routes) vs Probes (404s)."""
     if classification == 'probes':
         return query.filter(ApiStatistic.status_code == 404)
     if classification == 'internal':
@@ -857,6 +1088,59 @@ def _apply_classification(query, classification):
     return query
 
 
+def _error_rate(errors, total):
+    """SQL percentage of errors over total, rounded to 2 places; NULL when total is 0."""
+    return func.round(errors.cast(Numeric) * 100 / func.nullif(total, 0), 2)
+
+
+def _api_stats_hourly(since, classification='all', endpoint=None):
+    """Hourly per-(endpoint, method) aggregates for called_at >= since.
+
+    Complete hours come from the api_stats_hourly materialized view. Raw
+    api_statistics rows are read only for the partial hour at the start of
+    the window and for everything from the view's latest (possibly partial)
+    hour onwards, so the totals match a raw-table aggregate exactly however
+    stale the last refresh is.
+
+    Returns a subquery with columns endpoint, method, h, calls, sum_rt,
+    max_rt, errors; several rows can share an hour and must be summed.
+    """
+    mv = api_stats_hourly
+
+    head_end = since.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    watermark = select(func.max(mv.c.h)).correlate(None).scalar_subquery()
+    cutoff = func.greatest(head_end, func.coalesce(watermark, head_end))
+
+    rolled = select(
+        mv.c.endpoint, mv.c.method, mv.c.h,
+        mv.c.calls, mv.c.sum_rt, mv.c.max_rt, mv.c.errors,
+    ).where(mv.c.h >= head_end, mv.c.h < cutoff)
+    if classification == 'probes':
+        rolled = rolled.where(mv.c.is_probe)
+    elif classification == 'internal':
+        rolled = rolled.where(~mv.c.is_probe)
+
+    hour = func.date_trunc('hour', ApiStatistic.called_at)
+    raw = select(
+        ApiStatistic.endpoint, ApiStatistic.method, hour.label('h'),
+        func.count().label('calls'),
+        func.sum(ApiStatistic.response_time_ms).label('sum_rt'),
+        func.max(ApiStatistic.response_time_ms).label('max_rt'),
+        func.sum(case((ApiStatistic.status_code >= 400, 1), else_=0)).label('errors'),
+    ).where(or_(
+        and_(ApiStatistic.called_at >= since, ApiStatistic.called_at < head_end),
+        ApiStatistic.called_at >= cutoff,
+    ))
+    raw = _apply_classification(raw, classification)
+
+    if endpoint:
+        rolled = rolled.where(mv.c.endpoint == endpoint)
+        raw = raw.where(ApiStatistic.endpoint == endpoint)
+
+    raw = raw.group_by(ApiStatistic.endpoint, ApiStatistic.method, hour)
+    return union_all(rolled, raw).subquery('hourly')
+
+
 @api_bp.route('/statistics/endpoints')
 @require_auth
 @require_api_scope('statistics:read')
@@ -869,54 +1153,56 @@ def api_statistics_endpoints():
         period: 1d, 7d, 30d, 90d (default 7d)
         sort: calls, avg_time, errors (default calls)
         classification: internal | probes | all (default internal)
+        limit: max rows returned (default 500, max 2000)
     """
-    from web.models.api_statistic import ApiStatistic
-
     period = request.args.get('period', '7d')
     sort_by = request.args.get('sort', 'calls')
     classification = request.args.get('classification', 'internal')
-    days = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}.get(period, 7)
+    try:
+        limit = max(1, min(int(request.args.get('limit', 500)), 2000))
+    except (ValueError, TypeError):
+        limit = 500
+    days = _PERIOD_DAYS.get(period, 7)
     since = datetime.utcnow() - timedelta(days=days)
 
     session = get_session()
     try:
-        q = session.query(
-            ApiStatistic.endpoint,
-            ApiStatistic.method,
-            func.count(ApiStatistic.id).label('total_calls'),
-            func.avg(ApiStatistic.response_time_ms).label('avg_response_ms'),
-            func.max(ApiStatistic.response_time_ms).label('max_response_ms'),
-            func.sum(case((ApiStatistic.status_code >= 400, 1), else_=0)).label('error_count'),
-        ).filter(
-            ApiStatistic.called_at >= since
-        )
-        q = _apply_classification(q, classification)
-        stats = q.group_by(
-            ApiStatistic.endpoint, ApiStatistic.method
+        hourly = _api_stats_hourly(since, classification)
+        total_calls = func.sum(hourly.c.calls).cast(BigInteger)
+        avg_response = func.sum(hourly.c.sum_rt) / func.sum(hourly.c.calls)
+        error_count = func.sum(hourly.c.errors)
+        sort_expr = {
+            'avg_time': avg_response,
+            'errors': error_count,
+        }.get(sort_by, total_calls)
+        stats = session.execute(
+            select(
+                hourly.c.endpoint,
+                hourly.c.method,
+                total_calls.label('total_calls'),
+                avg_response.label('avg_response_ms'),
+                func.max(hourly.c.max_rt).label('max_response_ms'),
+                error_count.label('error_count'),
+                _error_rate(error_count, func.sum(hourly.c.calls)).label('error_rate'),
+            ).group_by(
+                hourly.c.endpoint, hourly.c.method
+            ).order_by(
+                desc(sort_expr), hourly.c.endpoint, hourly.c.method
+            ).limit(limit)
         ).all()
 
-        endpoints = []
-        for s in stats:
-            total = s.total_calls
-            errors = int(s.error_count or 0)
-            endpoints.append({
+        endpoints = [
+            {
                 'endpoint': s.endpoint,
                 'method': s.method,
-                'total_calls': total,
+                'total_calls': s.total_calls,
                 'avg_response_ms': round(float(s.avg_response_ms or 0), 2),
                 'max_response_ms': round(float(s.max_response_ms or 0), 2),
-                'error_count': errors,
-                'error_rate': round(errors / total * 100, 2) if total > 0 else 0,
-            })
-
-        # Sort
-        sort_key = {
-            'calls': lambda x: x['total_calls'],
-            'avg_time': lambda x: x['avg_response_ms'],
-            'errors': lambda x: x['error_count'],
-        }.get(sort_by, lambda x: x['total_calls'])
-
-        endpoints.sort(key=sort_key, reverse=True)
+                'error_count': int(s.error_count or 0),
+                'error_rate': float(s.error_rate or 0),
+            }
+            for s in stats
+        ]
 
         return jsonify({
             'period': period,
@@ -940,11 +1226,9 @@ def api_statistics_timeline():
         period: 1d, 7d, 30d (default 7d)
         endpoint: filter to specific endpoint (optional)
     """
-    from web.models.api_statistic import ApiStatistic
-
     period = request.args.get('period', '7d')
     endpoint_filter = request.args.get('endpoint')
-    days = {'1d': 1, '7d': 7, '30d': 30}.get(period, 7)
+    days = _TIMELINE_PERIOD_DAYS.get(period, 7)
     since = datetime.utcnow() - timedelta(days=days)
 
     # Use hourly buckets for <=7d, daily for longer
@@ -952,20 +1236,16 @@ def api_statistics_timeline():
 
     session = get_session()
     try:
-        query = session.query(
-            func.date_trunc(bucket, ApiStatistic.called_at).label('bucket'),
-            func.count(ApiStatistic.id).label('count'),
-            func.avg(ApiStatistic.response_time_ms).label('avg_ms'),
-            func.sum(case((ApiStatistic.status_code >= 400, 1), else_=0)).label('errors'),
-        ).filter(
-            ApiStatistic.called_at >= since
-        )
-
-        if endpoint_filter:
-            query = query.filter(ApiStatistic.endpoint == endpoint_filter)
-
-        query = query.group_by('bucket').order_by('bucket')
-        results = query.all()
+        hourly = _api_stats_hourly(since, endpoint=endpoint_filter)
+        slot = func.date_trunc(bucket, hourly.c.h)
+        results = session.execute(
+            select(
+                slot.label('bucket'),
+                func.sum(hourly.c.calls).cast(BigInteger).label('count'),
+                (func.sum(hourly.c.sum_rt) / func.sum(hourly.c.calls)).label('avg_ms'),
+                func.sum(hourly.c.errors).label('errors'),
+            ).group_by(slot).order_by(slot)
+        ).all()
 
         return jsonify({
             'period': period,
@@ -999,7 +1279,6 @@ def api_statistics_top_consumers():
         limit: number of results (default 20)
         classification: internal | probes | all (default internal)
     """
-    from web.models.api_statistic import ApiStatistic
 
     period = request.args.get('period', '7d')
     classification = request.args.get('classification', 'internal')
@@ -1007,25 +1286,39 @@ def api_statistics_top_consumers():
         limit = min(int(request.args.get('limit', 20)), 100)
     except (ValueError, TypeError):
         limit = 20
-    days = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}.get(period, 7)
+    days = _PERIOD_DAYS.get(period, 7)
     since = datetime.utcnow() - timedelta(days=days)
 
     session = get_session()
     try:
-        q = session.query(
+        # Two-level aggregate instead of count(DISTINCT endpoint): group by
+        # (client_ip, endpoint) first — a hash aggregate — so the per-IP
+        # distinct count is just the number of inner rows, with no per-group
+        # sort. Exact, like before.
+        per_endpoint = select(
             ApiStatistic.client_ip,
-            func.count(ApiStatistic.id).label('total_calls'),
-            func.count(func.distinct(ApiStatistic.endpoint)).label('unique_endpoints'),
-            func.avg(ApiStatistic.response_time_ms).label('avg_ms'),
-        ).filter(
+            ApiStatistic.endpoint,
+            func.count().label('calls'),
+            func.sum(ApiStatistic.response_time_ms).label('sum_rt'),
+        ).where(
             ApiStatistic.called_at >= since
         )
-        q = _apply_classification(q, classification)
-        stats = q.group_by(
-            ApiStatistic.client_ip
+        per_endpoint = _apply_classification(per_endpoint, classification).group_by(
+            ApiStatistic.client_ip, ApiStatistic.endpoint
+        ).subquery('per_endpoint')
+
+        total_calls = func.sum(per_endpoint.c.calls).cast(BigInteger)
+        stmt = select(
+            per_endpoint.c.client_ip,
+            total_calls.label('total_calls'),
+            func.count().label('unique_endpoints'),
+            (func.sum(per_endpoint.c.sum_rt) / func.sum(per_endpoint.c.calls)).label('avg_ms'),
+        ).group_by(
+            per_endpoint.c.client_ip
         ).order_by(
-            desc(func.count(ApiStatistic.id))
-        ).limit(limit).all()
+            desc(total_calls)
+        ).limit(limit)
+        stats = session.execute(stmt)
 
         return jsonify({
             'period': period,
@@ -1044,6 +1337,41 @@ def api_statistics_top_consumers():
         session.close()
 
 
+_SLOW_ENDPOINT_PERCENTILES = [0.5, 0.95, 0.99]
+
+
+def _slow_endpoints_stmt(classification):
+    # One sort per group serves all three percentiles (PG returns them as an
+    # array). count(*) rather than count(id) keeps the scan on
+    # ix_api_stats_endpoint_method_called, which covers every column read here.
+    stmt = select(
+        ApiStatistic.endpoint,
+        ApiStatistic.method,
+        func.count().label('total_calls'),
+        func.avg(ApiStatistic.response_time_ms).label('avg_ms'),
+        type_coerce(
+            func.percentile_cont(array(_SLOW_ENDPOINT_PERCENTILES)).within_group(
+                ApiStatistic.response_time_ms
+            ),
+            ARRAY(Float),
+        ).label('pcts'),
+        func.max(ApiStatistic.response_time_ms).label('max_ms'),
+    ).where(
+        ApiStatistic.called_at >= bindparam('since')
+    )
+    return _apply_classification(stmt, classification).group_by(
+        ApiStatistic.endpoint, ApiStatistic.method
+    ).having(
+        func.count() >= bindparam('min_calls')
+    ).order_by(
+        desc(func.avg(ApiStatistic.response_time_ms))
+    )
+
+
+# Built once per classification; only since/min_calls vary per request.
+_SLOW_ENDPOINTS_STMTS = {c: _slow_endpoints_stmt(c) for c in ('internal', 'probes', 'all')}
+
+
 @api_bp.route('/statistics/slow-endpoints')
 @require_auth
 @require_api_scope('statistics:read')
@@ -1057,7 +1385,6 @@ def api_statistics_slow_endpoints():
         min_calls: minimum call count to include (default 5)
         classification: internal | probes | all (default internal)
     """
-    from web.models.api_statistic import ApiStatistic
 
     period = request.args.get('period', '7d')
     classification = request.args.get('classification', 'internal')
@@ -1065,31 +1392,13 @@ def api_statistics_slow_endpoints():
         min_calls = int(request.args.get('min_calls', 5))
     except (ValueError, TypeError):
         min_calls = 5
-    days = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}.get(period, 7)
+    days = _PERIOD_DAYS.get(period, 7)
     since = datetime.utcnow() - timedelta(days=days)
 
     session = get_session()
     try:
-        q = session.query(
-            ApiStatistic.endpoint,
-            ApiStatistic.method,
-            func.count(ApiStatistic.id).label('total_calls'),
-            func.avg(ApiStatistic.response_time_ms).label('avg_ms'),
-            func.percentile_cont(0.95).within_group(
-                ApiStatistic.response_time_ms
-            ).label('p95_ms'),
-            func.max(ApiStatistic.response_time_ms).label('max_ms'),
-        ).filter(
-            ApiStatistic.called_at >= since
-        )
-        q = _apply_classification(q, classification)
-        stats = q.group_by(
-            ApiStatistic.endpoint, ApiStatistic.method
-        ).having(
-            func.count(ApiStatistic.id) >= min_calls
-        ).order_by(
-            desc(func.avg(ApiStatistic.response_time_ms))
-        ).all()
+        stmt = _SLOW_ENDPOINTS_STMTS.get(classification, _SLOW_ENDPOINTS_STMTS['all'])
+        stats = session.execute(stmt, {'since': since, 'min_calls': min_calls})
 
         return jsonify({
             'period': period,
@@ -1101,10 +1410,13 @@ def api_statistics_slow_endpoints():
                     'method': s.method,
                     'total_calls': s.total_calls,
                     'avg_response_ms': round(float(s.avg_ms or 0), 2),
-                    'p95_response_ms': round(float(s.p95_ms or 0), 2),
+                    'p50_response_ms': round(float(p50 or 0), 2),
+                    'p95_response_ms': round(float(p95 or 0), 2),
+                    'p99_response_ms': round(float(p99 or 0), 2),
                     'max_response_ms': round(float(s.max_ms or 0), 2),
                 }
                 for s in stats
+                for p50, p95, p99 in (s.pcts or (None, None, None),)
             ],
         })
     finally:
@@ -1115,6 +1427,27 @@ def api_statistics_slow_endpoints():
 # External API Statistics - Outbound Call Monitoring
 # =============================================================================
 
+_EXT_SUMMARY_SQL = text("""
+    WITH base AS (
+        SELECT service_name,
+               date_trunc(:trunc, timezone('Asia/Singapore', timezone('UTC', called_at))) AS bucket,
+               response_time_ms,
+               success
+        FROM external_api_statistics
+        WHERE called_at >= :since
+    )
+    SELECT service_name,
+           bucket,
+           GROUPING(service_name, bucket) AS grp,
+           COUNT(*) AS count,
+           AVG(response_time_ms) AS avg_ms,
+           SUM(CASE WHEN NOT success THEN 1 ELSE 0 END) AS errors
+    FROM base
+    GROUP BY GROUPING SETS ((service_name), (bucket), ())
+    ORDER BY grp, bucket
+""")
+
+
 @api_bp.route('/statistics/external/summary')
 @require_auth
 @require_api_scope('statistics:read')
@@ -1125,73 +1458,28 @@ def api_ext_statistics_summary():
     Outbound API call summary.
     Query params: period (1d, 7d, 30d, 90d)
     """
-    from web.models.external_api_statistic import ExternalApiStatistic
-
     period = request.args.get('period', '7d')
-    days = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}.get(period, 7)
+    days = _PERIOD_DAYS.get(period, 7)
     since = datetime.utcnow() - timedelta(days=days)
 
-    # Run the 3 independent aggregates concurrently — they all scan the same
-    # rows but produce different groupings. For 30d (~400k rows) this drops
-    # wall time from the sum (~18 s) to the slowest single query (~11 s).
-    # Use common.db.get_session (thread-safe) — Flask's current_app proxy can't
-    # cross thread boundaries.
-    from concurrent.futures import ThreadPoolExecutor
-    from common.db import get_session as _get_db_session
-
     trunc_unit = 'hour' if period == '1d' else 'day'
 
-    def _q_aggregate():
-        s = _get_db_session('backend')
-        try:
-            return s.execute(text("""
-                SELECT COUNT(*) AS total,
-                       AVG(response_time_ms) AS avg_ms,
-                       SUM(CASE WHEN NOT success THEN 1 ELSE 0 END) AS errors
-                FROM external_api_statistics
-                WHERE called_at >= :since
-            """), {'since': since}).fetchone()
-        finally:
-            s.close()
-
-    def _q_by_service():
-        s = _get_db_session('backend')
-        try:
-            return s.execute(text("""
-                SELECT service_name,
-                       COUNT(*) AS n,
-                       AVG(response_time_ms) AS avg_ms,
-                       SUM(CASE WHEN NOT success THEN 1 ELSE 0 END) AS errors
-                FROM external_api_statistics
-                WHERE called_at >= :since
-                GROUP BY service_name
-            """), {'since': since}).fetchall()
-        finally:
-            s.close()
-
-    def _q_volume():
-        s = _get_db_session('backend')
-        try:
-            return s.execute(text("""
-                SELECT date_trunc(:trunc, timezone('Asia/Singapore', timezone('UTC', called_at))) AS bucket,
-                       COUNT(*) AS count
-                FROM external_api_statistics
-                WHERE called_at >= :since
-                GROUP BY bucket
-                ORDER BY bucket
-            """), {'since': since, 'trunc': trunc_unit}).fetchall()
-        finally:
-            s.close()
+    # Totals, per-service and per-bucket aggregates from one scan of the
+    # window: GROUPING SETS emits all three groupings, and the GROUPING()
+    # bitmask says which one a row belongs to (1 = per service, 2 = per
+    # bucket, 3 = grand total).
+    session = get_session()
+    try:
+        rows = session.execute(_EXT_SUMMARY_SQL, {'since': since, 'trunc': trunc_unit}).fetchall()
+    finally:
+        session.close()
 
-    with ThreadPoolExecutor(max_workers=3) as pool:
-        f_agg = pool.submit(_q_aggregate)
-        f_svc = pool.submit(_q_by_service)
-        f_vol = pool.submit(_q_volume)
-        agg = f_agg.result()
-        by_service = f_svc.result()
-        volume = f_vol.result()
+    by_service = [r for r in rows if r.grp == 1]
+    volume = [r for r in rows if r.grp == 2]
+    # The empty grouping set always yields exactly one row, even for no data.
+    agg = next(r for r in rows if r.grp == 3)
 
-    total = int(agg.total or 0)
+    total = int(agg.count or 0)
     avg_ms = float(agg.avg_ms or 0)
     error_count = int(agg.errors or 0)
 
@@ -1208,7 +1496,7 @@ def api_ext_statistics_summary():
         'by_service': [
             {
                 'service_name': s.service_name,
-                'total_calls': int(s.n or 0),
+                'total_calls': int(s.count or 0),
                 'avg_response_ms': round(float(s.avg_ms or 0), 2),
                 'error_count': int(s.errors or 0),
             }
@@ -1229,24 +1517,30 @@ def api_ext_statistics_services():
     Query params:
         period: 1d, 7d, 30d, 90d (default 7d)
         service: filter to specific service (optional)
+        limit: max rows returned (default 500, max 2000)
     """
-    from web.models.external_api_statistic import ExternalApiStatistic
 
     period = request.args.get('period', '7d')
     service = request.args.get('service')
-    days = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}.get(period, 7)
+    try:
+        limit = max(1, min(int(request.args.get('limit', 500)), 2000))
+    except (ValueError, TypeError):
+        limit = 500
+    days = _PERIOD_DAYS.get(period, 7)
     since = datetime.utcnow() - timedelta(days=days)
 
+    ext_errors = func.sum(case((ExternalApiStatistic.success == False, 1), else_=0))
     session = get_session()
     try:
         query = session.query(
             ExternalApiStatistic.service_name,
             ExternalApiStatistic.endpoint,
             ExternalApiStatistic.method,
-            func.count(ExternalApiStatistic.id).label('total_calls'),
+            func.count().label('total_calls'),
             func.avg(ExternalApiStatistic.response_time_ms).label('avg_ms'),
             func.max(ExternalApiStatistic.response_time_ms).label('max_ms'),
-            func.sum(case((ExternalApiStatistic.success == False, 1), else_=0)).label('errors'),
+            ext_errors.label('errors'),
+            _error_rate(ext_errors, func.count()).label('error_rate'),
         ).filter(
             ExternalApiStatistic.called_at >= since
         )
@@ -1258,7 +1552,12 @@ def api_ext_statistics_services():
             ExternalApiStatistic.service_name,
             ExternalApiStatistic.endpoint,
             ExternalApiStatistic.method,
-        ).order_by(func.count(ExternalApiStatistic.id).desc())
+        ).order_by(
+            func.count().desc(),
+            ExternalApiStatistic.service_name,
+            ExternalApiStatistic.endpoint,
+            ExternalApiStatistic.method,
+        ).limit(limit)
 
         results = query.all()
 
@@ -1274,7 +1573,7 @@ def api_ext_statistics_services():
                     'avg_response_ms': round(float(r.avg_ms or 0), 2),
                     'max_response_ms': round(float(r.max_ms or 0), 2),
                     'error_count': int(r.errors or 0),
-                    'error_rate': round(int(r.errors or 0) / r.total_calls * 100, 2) if r.total_calls > 0 else 0,
+                    'error_rate': float(r.error_rate or 0),
                 }
                 for r in results
             ],
@@ -1287,6 +1586,30 @@ def api_ext_statistics_services():
 # MCP Tool Statistics - MCP server call monitoring
 # =============================================================================
 
+# Totals and per-bucket counts from one scan; GROUPING(bucket) is 0 for the
+# bucket rows and 1 for the grand total row.
+_MCP_SUMMARY_SQL = text("""
+    WITH base AS (
+        SELECT date_trunc(:trunc_unit,
+                   timezone('Asia/Singapore', timezone('UTC', called_at))
+               ) AS bucket,
+               response_time_ms,
+               is_error
+        FROM mcp_tool_statistics
+        WHERE called_at >= :since
+    )
+    SELECT
+        bucket,
+        GROUPING(bucket) AS grp,
+        COUNT(*) AS count,
+        AVG(response_time_ms) AS avg_response_ms,
+        SUM(CASE WHEN is_error THEN 1 ELSE 0 END) AS error_count
+    FROM base
+    GROUP BY GROUPING SETS ((bucket), ())
+    ORDER BY grp, bucket
+""")
+
+
 @api_bp.route('/statistics/mcp/summary')
 @require_auth
 @require_api_scope('statistics:read')
@@ -1298,37 +1621,22 @@ def api_mcp_statistics_summary():
     Query params: period (1d, 7d, 30d, 90d)
     """
     period = request.args.get('period', '7d')
-    days = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}.get(period, 7)
+    days = _PERIOD_DAYS.get(period, 7)
     since = datetime.utcnow() - timedelta(days=days)
 
     session = get_session()
     try:
         trunc_unit = 'hour' if period == '1d' else 'day'
-        result = session.execute(text("""
-            SELECT
-                COUNT(*) AS total_calls,
-                AVG(response_time_ms) AS avg_response_ms,
-                SUM(CASE WHEN is_error THEN 1 ELSE 0 END) AS error_count
-            FROM mcp_tool_statistics
-            WHERE called_at >= :since
-        """), {'since': since}).fetchone()
-
-        total = int(result.total_calls or 0)
+        rows = session.execute(_MCP_SUMMARY_SQL, {'trunc_unit': trunc_unit, 'since': since}).fetchall()
+
+        volume_rows = [r for r in rows if r.grp == 0]
+        # The empty grouping set always yields exactly one row, even for no data.
+        result = next(r for r in rows if r.grp == 1)
+
+        total = int(result.count or 0)
         avg_ms = float(result.avg_response_ms or 0)
         error_count = int(result.error_count or 0)
 
-        volume_rows = session.execute(text("""
-            SELECT
-                date_trunc(:trunc_unit,
-                    timezone('Asia/Singapore', timezone('UTC', called_at))
-                ) AS bucket,
-                COUNT(*) AS count
-            FROM mcp_tool_statistics
-            WHERE called_at >= :since
-            GROUP BY bucket
-            ORDER BY bucket
-        """), {'trunc_unit': trunc_unit, 'since': since}).fetchall()
-
         time_unit, timeline = _build_volume_timeline(period, volume_rows)
 
         return jsonify({
@@ -1345,6 +1653,19 @@ def api_mcp_statistics_summary():
         session.close()
 
 
+_MCP_TOOLS_SQL = text("""
+    SELECT
+        tool_name,
+        COUNT(*) AS total_calls,
+        AVG(response_time_ms) AS avg_response_ms,
+        MAX(response_time_ms) AS max_response_ms,
+        SUM(CASE WHEN is_error THEN 1 ELSE 0 END) AS error_count
+    FROM mcp_tool_statistics
+    WHERE called_at >= :since
+    GROUP BY tool_name
+""")
+
+
 @api_bp.route('/statistics/mcp/tools')
 @require_auth
 @require_api_scope('statistics:read')
@@ -1359,22 +1680,12 @@ def api_mcp_statistics_tools():
     """
     period = request.args.get('period', '7d')
     sort_by = request.args.get('sort', 'calls')
-    days = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}.get(period, 7)
+    days = _PERIOD_DAYS.get(period, 7)
     since = datetime.utcnow() - timedelta(days=days)
 
     session = get_session()
     try:
-        rows = session.execute(text("""
-            SELECT
-                tool_name,
-                COUNT(*) AS total_calls,
-                AVG(response_time_ms) AS avg_response_ms,
-                MAX(response_time_ms) AS max_response_ms,
-                SUM(CASE WHEN is_error THEN 1 ELSE 0 END) AS error_count
-            FROM mcp_tool_statistics
-            WHERE called_at >= :since
-            GROUP BY tool_name
-        """), {'since': since}).fetchall()
+        rows = session.execute(_MCP_TOOLS_SQL, {'since': since}).fetchall()
 
         def _category(name):
             if name.startswith('DB_'):
@@ -1413,6 +1724,21 @@ def api_mcp_statistics_tools():
         session.close()
 
 
+_MCP_USERS_SQL = text("""
+    SELECT
+        username,
+        key_id,
+        COUNT(*) AS total_calls,
+        COUNT(DISTINCT tool_name) AS tools_used,
+        AVG(response_time_ms) AS avg_response_ms,
+        SUM(CASE WHEN is_error THEN 1 ELSE 0 END) AS error_count
+    FROM mcp_tool_statistics
+    WHERE called_at >= :since
+    GROUP BY username, key_id
+    ORDER BY COUNT(*) DESC
+""")
+
+
 @api_bp.route('/statistics/mcp/users')
 @require_auth
 @require_api_scope('statistics:read')
@@ -1424,24 +1750,12 @@ def api_mcp_statistics_users():
     Query params: period (1d, 7d, 30d, 90d)
     """
     period = request.args.get('period', '7d')
-    days = {'1d': 1, '7d': 7, '30d': 30, '90d': 90}.get(period, 7)
+    days = _PERIOD_DAYS.get(period, 7)
     since = datetime.utcnow() - timedelta(days=days)
 
     session = get_session()
     try:
-        rows = session.execute(text("""
-            SELECT
-                username,
-                key_id,
-                COUNT(*) AS total_calls,
-                COUNT(DISTINCT tool_name) AS tools_used,
-                AVG(response_time_ms) AS avg_response_ms,
-                SUM(CASE WHEN is_error THEN 1 ELSE 0 END) AS error_count
-            FROM mcp_tool_statistics
-            WHERE called_at >= :since
-            GROUP BY username, key_id
-            ORDER BY COUNT(*) DESC
-        """), {'since': since}).fetchall()
+        rows = session.execute(_MCP_USERS_SQL, {'since': since}).fetchall()
 
         return jsonify({
             'period': period,
@@ -2149,6 +2463,110 @@ def api_ccws_discount_plans_update():
 # Reservation endpoints moved to reservations.py blueprint (/api/reservations/*)
 # =============================================================================
 
+def _json_cell_handler(val):
+    """Pick the JSON conversion for a column from its first non-NULL value."""
+    if isinstance(val, (int, float, bool, str)):
+        return None  # already JSON-native
+    if hasattr(val, 'isoformat'):
+        return lambda v: v.isoformat()
+    return float  # Decimal and other numerics
+
+
+def _iter_json_rows(result):
+    """Yield each row of `result` as a JSON-ready dict.
+
+    Each column's type is fixed by the query, so its conversion is chosen
+    once (from the first non-NULL value) and only the non-JSON-native
+    columns are touched on later rows.
+    """
+    columns = list(result.keys())
+    undecided = set(columns)
+    converters = []  # (column, fn) for the non-JSON-native columns only
+    for row in result:
+        unit = dict(zip(columns, row))
+        if undecided:
+            for col in [c for c in undecided if unit[c] is not None]:
+                undecided.discard(col)
+                handler = _json_cell_handler(unit[col])
+                if handler is not None:
+                    converters.append((col, handler))
+        for col, handler in converters:
+            val = unit[col]
+            if val is not None:
+                unit[col] = handler(val)
+        yield unit
+
+
+def _parse_float_arg(name):
+    """Float query arg, or None when absent/invalid (filter ignored)."""
+    raw = request.args.get(name, '').strip()
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+# Site IDs bind as one array (= ANY(:sids)), so the SQL text depends only on
+# which optional filters are present: a handful of distinct statements that
+# are built once and reused, rather than a new string per site count.
+@lru_cache(maxsize=64)
+def _unit_availability_query(where_sql):
+    return text(f"""
+        SELECT
+            u."SiteID", u."UnitID", u."sLocationCode", u."sUnitName", u."sTypeName",
+            u."dcWidth", u."dcLength", u."bClimate", u."bInside", u."bPower", u."bAlarm",
+            u."iFloor", u."UnitTypeID",
+            u."dcStdRate", u."dcWebRate", u."dcPushRate", u."dcBoardRate",
+            u."dcPreferredRate", u."dcStdWeeklyRate", u."dcStdSecDep",
+            u."dcTax1Rate", u."dcTax2Rate",
+            u."sUnitNote", u."sUnitDesc",
+            u."iDaysVacant", u."bWaitingListReserved", u."bCorporate",
+            u."bServiceRequired", u."bMobile",
+            (u."dcWidth" * u."dcLength") AS area,
+            -- Enriched label fields from vw_units_inventory
+            v.site_code,
+            v.internal_label,
+            v.country,
+            v.category_label,
+            v.label_type_code,
+            v.label_climate_code,
+            v.label_size_category,
+            v.label_size_range,
+            v.label_shape,
+            v.label_pillar,
+            v.label_published_at,
+            v.has_pillar,
+            v.pillar_size,
+            v.is_odd_shape,
+            v.deck_position
+        FROM units_info u
+        LEFT JOIN vw_units_inventory v
+            ON v.site_id = u."SiteID" AND v.unit_id = u."UnitID"
+        WHERE {where_sql}
+        ORDER BY u."SiteID",
+                 COALESCE(v.category_label, u."sTypeName"),
+                 u."dcStdRate"
+    """)
+
+
+_UNIT_AVAILABILITY_FILTERS_SQL = text("""
+    SELECT
+        COALESCE(v.category_label, u."sTypeName") AS cat,
+        v.label_type_code,
+        v.label_climate_code,
+        v.label_shape,
+        u."iFloor"
+    FROM units_info u
+    LEFT JOIN vw_units_inventory v
+        ON v.site_id = u."SiteID" AND v.unit_id = u."UnitID"
+    WHERE u."SiteID" = ANY(:sids)
+      AND u."bRentable" = true
+      AND u."bRented" = false
+""")
+
+
 @api_bp.route('/unit-availability')
 @require_auth
 @require_api_scope('inventory:read')
@@ -2167,6 +2585,9 @@ def api_unit_availability():
         shape          — filter by label_shape
         min_size       — minimum area (width * length)
         max_size       — maximum area (width * length)
+        format         — 'ndjson' streams one unit per line
+                         (application/x-ndjson) from a server-side cursor,
+                         without the filters/label_lookups envelope
     """
     site_ids_param = request.args.get('site_ids', '')
     if not site_ids_param:
@@ -2184,16 +2605,27 @@ def api_unit_availability():
     climate = request.args.get('climate', '').strip().lower()
     floor_param = request.args.get('floor', '').strip()
     shape = request.args.get('shape', '').strip()
-    min_size = request.args.get('min_size', '').strip()
-    max_size = request.args.get('max_size', '').strip()
+    min_val = _parse_float_arg('min_size')
+    max_val = _parse_float_arg('max_size')
+    ndjson = request.args.get('format', '').lower() == 'ndjson'
+
+    def in_size_range(unit):
+        # Size filters apply to the computed area column; units without an
+        # area are dropped once either bound is given.
+        if min_val is None and max_val is None:
+            return True
+        area = unit.get('area')
+        if not area:
+            return False
+        return ((min_val is None or area >= min_val)
+                and (max_val is None or area <= max_val))
 
     pbi_session = get_pbi_session()
     try:
-        placeholders = ', '.join([f':sid{i}' for i in range(len(site_ids))])
-        params = {f'sid{i}': sid for i, sid in enumerate(site_ids)}
+        params = {'sids': list(site_ids)}
 
         where_clauses = [
-            f'u."SiteID" IN ({placeholders})',
+            'u."SiteID" = ANY(:sids)',
             'u."bRentable" = true',
             'u."bRented" = false',
             'u."bExcludeFromWebsite" = false',
@@ -2231,89 +2663,38 @@ def api_unit_availability():
 
         where_sql = ' AND '.join(where_clauses)
 
-        query = text(f"""
-            SELECT
-                u."SiteID", u."UnitID", u."sLocationCode", u."sUnitName", u."sTypeName",
-                u."dcWidth", u."dcLength", u."bClimate", u."bInside", u."bPower", u."bAlarm",
-                u."iFloor", u."UnitTypeID",
-                u."dcStdRate", u."dcWebRate", u."dcPushRate", u."dcBoardRate",
-                u."dcPreferredRate", u."dcStdWeeklyRate", u."dcStdSecDep",
-                u."dcTax1Rate", u."dcTax2Rate",
-                u."sUnitNote", u."sUnitDesc",
-                u."iDaysVacant", u."bWaitingListReserved", u."bCorporate",
-                u."bServiceRequired", u."bMobile",
-                (u."dcWidth" * u."dcLength") AS area,
-                -- Enriched label fields from vw_units_inventory
-                v.site_code,
-                v.internal_label,
-                v.country,
-                v.category_label,
-                v.label_type_code,
-                v.label_climate_code,
-                v.label_size_category,
-                v.label_size_range,
-                v.label_shape,
-                v.label_pillar,
-                v.label_published_at,
-                v.has_pillar,
-                v.pillar_size,
-                v.is_odd_shape,
-                v.deck_position
-            FROM units_info u
-            LEFT JOIN vw_units_inventory v
-                ON v.site_id = u."SiteID" AND v.unit_id = u."UnitID"
-            WHERE {where_sql}
-            ORDER BY u."SiteID",
-                     COALESCE(v.category_label, u."sTypeName"),
-                     u."dcStdRate"
-        """)
-
-        result = pbi_session.execute(query, params)
-        rows = result.fetchall()
-        columns = result.keys()
-
-        units = []
-        for row in rows:
-            unit = {}
-            for col, val in zip(columns, row):
-                if hasattr(val, 'isoformat'):
-                    unit[col] = val.isoformat()
-                elif isinstance(val, (int, float, bool, str)) or val is None:
-                    unit[col] = val
-                else:
-                    unit[col] = float(val) if val is not None else None
-            units.append(unit)
+        query = _unit_availability_query(where_sql)
 
-        # Apply size filters in Python (computed column)
-        if min_size:
-            try:
-                min_val = float(min_size)
-                units = [u for u in units if u.get('area') and u['area'] >= min_val]
-            except ValueError:
-                pass
-        if max_size:
-            try:
-                max_val = float(max_size)
-                units = [u for u in units if u.get('area') and u['area'] <= max_val]
-            except ValueError:
-                pass
+        if ndjson:
+            dumps = current_app.json.dumps
+
+            def generate():
+                stream_session = get_pbi_session()
+                try:
+                    result = stream_session.execute(
+                        query, params, execution_options={'yield_per': 1000}
+                    )
+                    for unit in _iter_json_rows(result):
+                        if in_size_range(unit):
+                            yield dumps(unit) + '\n'
+                except Exception as e:
+                    # Headers are already sent; end the stream short.
+                    current_app.logger.error(f"Unit availability stream error: {e}")
+                finally:
+                    stream_session.close()
+
+            return Response(stream_with_context(generate()),
+                            mimetype='application/x-ndjson')
+
+        # Server-side cursor in batches instead of materialising every row
+        # first.
+        result = pbi_session.execute(
+            query, params, execution_options={'yield_per': 1000}
+        )
+        units = [u for u in _iter_json_rows(result) if in_size_range(u)]
 
         # Fetch distinct filter values from enriched view for dropdowns
-        filter_query = text(f"""
-            SELECT
-                COALESCE(v.category_label, u."sTypeName") AS cat,
-                v.label_type_code,
-                v.label_climate_code,
-                v.label_shape,
-                u."iFloor"
-            FROM units_info u
-            LEFT JOIN vw_units_inventory v
-                ON v.site_id = u."SiteID" AND v.unit_id = u."UnitID"
-            WHERE u."SiteID" IN ({placeholders})
-              AND u."bRentable" = true
-              AND u."bRented" = false
-        """)
-        filter_result = pbi_session.execute(filter_query, params)
+        filter_result = pbi_session.execute(_UNIT_AVAILABILITY_FILTERS_SQL, params)
         filter_rows = filter_result.fetchall()
 
         categories_set = set()
@@ -2384,10 +2765,9 @@ def api_unit_availability_reservations():
 
     pbi_session = get_pbi_session()
     try:
-        placeholders = ', '.join([f':sc{i}' for i in range(len(site_codes))])
-        params = {f'sc{i}': sc for i, sc in enumerate(site_codes)}
+        params = {'site_codes': site_codes}
 
-        rows = pbi_session.execute(text(f"""
+        rows = pbi_session.execute(text("""
             SELECT site_code, unit_id, waiting_id, tenant_id,
                    first_name, last_name, quoted_rate, needed_date,
                    expires_date, status, source, source_name,
@@ -2395,7 +2775,7 @@ def api_unit_availability_reservations():
                    followup_date, inquiry_type, rental_type_id,
                    paid_reserve_fee, reserve_fee_receipt_id, concession_id
             FROM api_reservations
-            WHERE site_code IN ({placeholders})
+            WHERE site_code = ANY(:site_codes)
               AND status = 'created'
             ORDER BY site_code, unit_id
         """), params).fetchall()
@@ -2503,6 +2883,24 @@ def _sl_audit(session, action, entity_type, entity_id=None, site_id=None, unit_i
     session.add(entry)
 
 
+def _sl_batch_insert(session, model, id_column, rows):
+    """Insert `rows` with one INSERT ... ON CONFLICT DO NOTHING; return how many were new.
+
+    Replaces a SELECT-then-INSERT round trip per row in the CSV batch
+    uploads. Rows whose id already exists, or repeats earlier in the batch,
+    are skipped by the unique constraint on `id_column`.
+    """
+    if not rows:
+        return 0
+    stmt = (
+        pg_insert(model)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[id_column])
+        .returning(getattr(model, id_column))
+    )
+    return len(session.execute(stmt).all())
+
+
 # --- Keypads CRUD ---
 
 @api_bp.route('/smart-lock/keypads')
@@ -2660,8 +3058,7 @@ def api_sl_keypads_batch():
     username = _sl_username()
     session = current_app.get_middleware_session()
     try:
-        created = 0
-        skipped = 0
+        rows = []
         errors = []
         for i, item in enumerate(items):
             kid = (item.get('keypad_id') or '').strip()
@@ -2673,14 +3070,12 @@ def api_sl_keypads_batch():
             if len(kid) > MAX_SL_ID_LEN:
                 errors.append(f'Row {i+1}: keypad_id too long')
                 continue
-            existing = session.query(SmartLockKeypad).filter_by(keypad_id=kid).first()
-            if existing:
-                skipped += 1
-                continue
-            session.add(SmartLockKeypad(
-                keypad_id=kid, site_id=int(sid), notes=notes, created_by=username,
-            ))
-            created += 1
+            rows.append({
+                'keypad_id': kid, 'site_id': int(sid), 'notes': notes, 'created_by': username,
+            })
+
+        created = _sl_batch_insert(session, SmartLockKeypad, 'keypad_id', rows)
+        skipped = len(rows) - created
 
         if created > 0:
             _sl_audit(session, 'keypad_batch_upload', 'keypad',
@@ -2989,8 +3384,7 @@ def api_sl_padlocks_batch():
     username = _sl_username()
     session = current_app.get_middleware_session()
     try:
-        created = 0
-        skipped = 0
+        rows = []
         errors = []
         for i, item in enumerate(items):
             pid = (item.get('padlock_id') or '').strip()
@@ -3002,14 +3396,12 @@ def api_sl_padlocks_batch():
             if len(pid) > MAX_SL_ID_LEN:
                 errors.append(f'Row {i+1}: padlock_id too long')
                 continue
-            existing = session.query(SmartLockPadlock).filter_by(padlock_id=pid).first()
-            if existing:
-                skipped += 1
-                continue
-            session.add(SmartLockPadlock(
-                padlock_id=pid, site_id=int(sid), notes=notes, created_by=username,
-            ))
-            created += 1
+            rows.append({
+                'padlock_id': pid, 'site_id': int(sid), 'notes': notes, 'created_by': username,
+            })
+
+        created = _sl_batch_insert(session, SmartLockPadlock, 'padlock_id', rows)
+        skipped = len(rows) - created
 
         if created > 0:
             _sl_audit(session, 'padlock_batch_upload', 'padlock',
@@ -3565,11 +3957,25 @@ def api_sl_audit_log():
 
     session = current_app.get_middleware_session()
     try:
-        q = session.query(SmartLockAuditLog)
+        # Read-only listing: select the to_dict() columns as plain rows
+        # rather than hydrating up to `limit` ORM entities.
+        stmt = select(
+            SmartLockAuditLog.id, SmartLockAuditLog.action,
+            SmartLockAuditLog.entity_type, SmartLockAuditLog.entity_id,
+            SmartLockAuditLog.site_id, SmartLockAuditLog.unit_id,
+            SmartLockAuditLog.detail, SmartLockAuditLog.username,
+            SmartLockAuditLog.created_at,
+        )
         if site_id:
-            q = q.filter(SmartLockAuditLog.site_id == int(site_id))
-        entries = q.order_by(desc(SmartLockAuditLog.created_at)).limit(limit).all()
-        return jsonify({'entries': [e.to_dict() for e in entries]})
+            stmt = stmt.where(SmartLockAuditLog.site_id == int(site_id))
+        stmt = stmt.order_by(desc(SmartLockAuditLog.created_at)).limit(limit)
+        entries = []
+        for row in session.execute(stmt).mappings():
+            entry = dict(row)
+            created_at = entry['created_at']
+            entry['created_at'] = created_at.isoformat() if created_at else None
+            entries.append(entry)
+        return jsonify({'entries': entries})
     except Exception as e:
         current_app.logger.error(f"Smart lock audit log error: {e}")
         return jsonify({'error': 'Failed to fetch audit log'}), 500
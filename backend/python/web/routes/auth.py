@@ -5,9 +5,12 @@ Authentication routes - login, logout, OAuth callbacks.
 import secrets
 import bcrypt
 from flask import Blueprint, render_template, redirect, url_for, request, flash, session, current_app
+from sqlalchemy import select
 
 # Pre-computed bcrypt hash for constant-time comparison when user not found
 _DUMMY_BCRYPT_HASH = b'$2b$12$LJ3m4ys3Lg2VBe8jOObnzOqN0MR/XhMGHTLQEQ1ek5gNkb1M1FgC6'
+# Work factor of bcrypt.gensalt(); stored hashes below it are upgraded on login.
+_BCRYPT_ROUNDS = 12
 from flask_login import login_user, logout_user, login_required, current_user
 from web.utils.audit import audit_log, AuditEvent
 from web.utils.rate_limit import rate_limit_login, record_failed_login, reset_login_attempts
@@ -20,6 +23,14 @@ def get_session():
     return current_app.get_db_session()
 
 
+def _bcrypt_cost(hashed):
+    """Work factor of a modular-crypt bcrypt hash ('$2b$12$...' -> 12); 0 if unparseable."""
+    try:
+        return int(hashed.split('$')[2])
+    except (IndexError, ValueError):
+        return 0
+
+
 @auth_bp.route('/login', methods=['GET', 'POST'])
 @rate_limit_login(max_attempts=5, window_seconds=300)
 def login():
@@ -59,9 +70,17 @@ def login():
                 bcrypt.checkpw(password.encode('utf-8'), _DUMMY_BCRYPT_HASH)
 
             if valid:
-                # Opportunistic rehash: migrate legacy $2y$ hashes to $2b$ on login
+                # Opportunistic migration of legacy $2y$ hashes to $2b$ on login.
+                # The two prefixes are the same algorithm, so a hash already at
+                # the current work factor only needs its prefix rewritten; a
+                # full rehash is paid only to raise a lower cost.
                 if user.password.startswith('$2y$'):
-                    user.password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+                    if _bcrypt_cost(stored_hash) >= _BCRYPT_ROUNDS:
+                        user.password = stored_hash
+                    else:
+                        user.password = bcrypt.hashpw(
+                            password.encode('utf-8'), bcrypt.gensalt(_BCRYPT_ROUNDS)
+                        ).decode('utf-8')
                     db_session.commit()
 
                 login_user(user)
@@ -163,10 +182,14 @@ def oauth_callback():
 
             # Create new user with default viewer role
             username = email.split('@')[0]
-            # Ensure unique username
+            # Ensure unique username: fetch every taken name sharing the base
+            # in one query, then take the first free base, base1, base2, ...
             base_username = username
+            taken = set(db_session.scalars(
+                select(User.username).where(User.username.startswith(base_username, autoescape=True))
+            ))
             counter = 1
-            while db_session.query(User).filter_by(username=username).first():
+            while username in taken:
                 username = f"{base_username}{counter}"
                 counter += 1
 
@@ -57,8 +57,9 @@ def _load_legacy_type_map_cached() -> dict:
 def _trigger_candidates_refresh(site_codes: list) -> None:
     """Fire-and-forget refresh of mw_unit_discount_candidates for given sites.
 
-    Spawns a daemon thread that runs the pipeline scoped to the affected
-    site_codes. Returns immediately so the web request stays snappy.
+    Hands the run, scoped to the affected site_codes, to the sync
+    executor's bounded background pool. Returns immediately so the web
+    request stays snappy.
     Failures are logged but never bubble up — the 4h scheduled run will
     eventually catch up.
     """
@@ -68,7 +69,6 @@ def _trigger_candidates_refresh(site_codes: list) -> None:
     if not codes:
         return
 
-    import threading
     # Capture the real app object — `current_app` is request-scoped and not
     # safe to dereference inside the worker thread.
     app = current_app._get_current_object()
@@ -76,7 +76,6 @@ def _trigger_candidates_refresh(site_codes: list) -> None:
     def _run():
         try:
             with app.app_context():
-                from sync_service.executor import get_executor
                 result = get_executor().run(
                     pipeline_name='mw_unit_discount_candidates',
                     scope={'site_codes': codes},
@@ -91,7 +90,8 @@ def _trigger_candidates_refresh(site_codes: list) -> None:
                 f"candidates refresh failed for {codes}: {exc}"
             )
 
-    threading.Thread(target=_run, daemon=True, name='candidates-refresh').start()
+    from sync_service.executor import get_executor
+    get_executor().submit_background(_run)
 
 
 def _site_codes_from_plan(plan) -> list:
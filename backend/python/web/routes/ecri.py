@@ -5,7 +5,13 @@ Provides dashboard, eligibility review, batch management, and analytics
 for automating self-storage rent increases.
 """
 
+import io
+import json
 import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 from uuid import uuid4
 
@@ -18,7 +24,7 @@ from common.ecri_dates import (
 
 from flask import Blueprint, render_template, request, jsonify, current_app
 from flask_login import login_required, current_user
-from sqlalchemy import func, text, desc
+from sqlalchemy import func, insert, select, text, tuple_, update, desc
 
 from web.auth.decorators import (
     ecri_access_required, ecri_manage_required,
@@ -126,6 +132,44 @@ def get_app_db_session():
 # API: Data Freshness
 # =============================================================================
 
+# Source tables (and their snapshot date column) behind the ECRI freshness
+# banner, probed in one round trip. Fixed names — nothing user-supplied.
+_FRESHNESS_TABLES = {
+    'ccws_ledgers': 'extract_date',
+    'rentroll': 'extract_date',
+    'fx_rates': 'rate_date',
+}
+_FRESHNESS_PROBES = {
+    table: f"SELECT '{table}' AS source, MAX(\"{col}\")::date AS latest FROM \"{table}\""
+    for table, col in _FRESHNESS_TABLES.items()
+}
+_FRESHNESS_SQL = text(' UNION ALL '.join(_FRESHNESS_PROBES.values()))
+
+
+def _latest_source_dates(session):
+    """Return {table: latest date} for the freshness tables.
+
+    Tables are probed in one UNION query. If that fails — typically one table
+    missing or renamed — each table is probed on its own so the rest still
+    report; a table whose probe fails is left out of the result.
+    """
+    try:
+        return dict(session.execute(_FRESHNESS_SQL).fetchall())
+    except Exception as e:
+        session.rollback()
+        current_app.logger.warning(
+            f"ECRI freshness query failed, falling back to per-table queries: {e}")
+
+    latest = {}
+    for table, probe in _FRESHNESS_PROBES.items():
+        try:
+            latest.update(session.execute(text(probe)).fetchall())
+        except Exception as e:
+            session.rollback()
+            current_app.logger.error(f"ECRI freshness query error for {table}: {e}")
+    return latest
+
+
 @ecri_bp.route('/api/data-freshness')
 @login_required
 @ecri_access_required
@@ -139,24 +183,18 @@ def api_data_freshness():
     """
     session = get_pbi_session()
     try:
-        tables = {
-            'ccws_ledgers': 'extract_date',
-            'rentroll': 'extract_date',
-            'fx_rates': 'rate_date',
-        }
+        latest = _latest_source_dates(session)
+
         freshness = {}
-        for table, col in tables.items():
-            try:
-                result = session.execute(
-                    text(f'SELECT MAX("{col}") FROM "{table}"')
-                ).scalar()
-                freshness[table] = {
-                    'latest_date': result.isoformat() if result else None,
-                    'stale': (date.today() - result).days > 7 if result else True
-                }
-            except Exception as e:
-                current_app.logger.error(f"ECRI freshness query error for {table}: {e}")
+        for table in _FRESHNESS_TABLES:
+            if table not in latest:
                 freshness[table] = {'latest_date': None, 'stale': True, 'error': 'Query failed'}
+                continue
+            result = latest[table]
+            freshness[table] = {
+                'latest_date': result.isoformat() if result else None,
+                'stale': (date.today() - result).days > 7 if result else True
+            }
 
         return jsonify({'freshness': freshness})
     finally:
@@ -175,16 +213,6 @@ def _variance_pct(actual, ref):
     return round((actual - ref) / ref * 100, 1)
 
 
-def _median(values):
-    if not values:
-        return None
-    s = sorted(values)
-    n = len(s)
-    if n % 2 == 0:
-        return (s[n // 2 - 1] + s[n // 2]) / 2
-    return s[n // 2]
-
-
 def _country_size_climate_benchmarks(session, site_ids):
     """Country / Top-N benchmarks per (size_range, climate_code).
 
@@ -280,16 +308,20 @@ def _ledger_bump_history(session, site_ids):
     # matches the history_years clamp below and keeps the scan bounded
     # so Azure PG isn't burning through unbounded historical snapshots
     # on every eligibility request.
+    # Every window shares one (SiteID, LedgerID, extract_date) ordering —
+    # rn_desc is derived from the partition size rather than a second DESC
+    # sort — so idx_rentroll_site_ledger_extract feeds them without a sort.
     rows = session.execute(text("""
         WITH per_ledger AS (
             SELECT "SiteID", "LedgerID", extract_date, "dcRent",
-                   LAG("dcRent") OVER (PARTITION BY "SiteID", "LedgerID" ORDER BY extract_date) AS prev_rent,
-                   ROW_NUMBER() OVER (PARTITION BY "SiteID", "LedgerID" ORDER BY extract_date ASC)  AS rn_asc,
-                   ROW_NUMBER() OVER (PARTITION BY "SiteID", "LedgerID" ORDER BY extract_date DESC) AS rn_desc
+                   LAG("dcRent") OVER w AS prev_rent,
+                   ROW_NUMBER() OVER w AS rn_asc,
+                   COUNT(*) OVER (PARTITION BY "SiteID", "LedgerID") - ROW_NUMBER() OVER w + 1 AS rn_desc
             FROM rentroll
             WHERE "SiteID" = ANY(:site_ids)
               AND extract_date >= CURRENT_DATE - INTERVAL '3 years'
               AND "bRented" AND "LedgerID" IS NOT NULL AND "dcRent" > 0
+            WINDOW w AS (PARTITION BY "SiteID", "LedgerID" ORDER BY extract_date)
         )
         SELECT "SiteID", "LedgerID",
                COUNT(*) FILTER (WHERE prev_rent IS NOT NULL AND "dcRent" > prev_rent) AS bumps,
@@ -372,6 +404,92 @@ def _site_country_lookup(session, site_ids):
     return out
 
 
+# SiteID -> SiteCode for every site. Codes only change when a site is
+# onboarded, so the map is reused for an hour and refetched early only when
+# a requested site is missing from it. Sites that were already missing at the
+# last fetch (no SiteCode, or not in siteinfo) don't force another refetch
+# until the TTL lapses.
+_SITE_CODES_TTL = 3600
+_site_codes_cache = {'codes': None, 'missing': frozenset(), 'fetched_at': 0.0}
+_site_codes_lock = threading.Lock()
+
+
+def _site_code_map(session, site_ids):
+    """Return {site_id: site_code} for the requested sites (missing = no code)."""
+    wanted = {int(s) for s in site_ids}
+    with _site_codes_lock:
+        codes = _site_codes_cache['codes']
+        missing = _site_codes_cache['missing']
+        fresh = codes is not None and time.monotonic() - _site_codes_cache['fetched_at'] < _SITE_CODES_TTL
+    if not fresh or not wanted <= codes.keys() | missing:
+        # Query outside the lock; concurrent callers may both refetch, and
+        # whichever finishes last wins.
+        codes = {int(sid): code for sid, code in session.execute(text(
+            'SELECT "SiteID", "SiteCode" FROM siteinfo WHERE "SiteCode" IS NOT NULL'
+        )).fetchall()}
+        # Within the TTL, keep the IDs earlier callers found missing too.
+        missing = frozenset(((missing if fresh else set()) | wanted) - codes.keys())
+        with _site_codes_lock:
+            _site_codes_cache['codes'] = codes
+            _site_codes_cache['missing'] = missing
+            _site_codes_cache['fetched_at'] = time.monotonic()
+    return {sid: codes[sid] for sid in wanted if sid in codes}
+
+
+# Below this many rows the ORM executemany is cheaper than setting up a COPY.
+_COPY_MIN_ROWS = 1000
+
+
+def _copy_value(v):
+    """Render one value in COPY text format."""
+    if v is None:
+        return '\\N'
+    if isinstance(v, bool):
+        return 't' if v else 'f'
+    if isinstance(v, (dict, list)):
+        v = json.dumps(v)
+    elif isinstance(v, (date, datetime)):
+        v = v.isoformat()
+    return (str(v).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def _insert_batch_ledgers(session, ledger_rows):
+    """Insert ecri_batch_ledgers rows in the session's transaction.
+
+    Large batches are streamed with COPY FROM STDIN on the session's own
+    connection, so a later rollback still discards them. COPY skips the
+    ORM's Python-side column defaults, so those are filled in here.
+    """
+    from common.models import ECRIBatchLedger
+
+    if len(ledger_rows) < _COPY_MIN_ROWS:
+        session.execute(insert(ECRIBatchLedger), ledger_rows)
+        return
+
+    table = ECRIBatchLedger.__table__
+    cols = list(ledger_rows[0])
+    defaults = {
+        c.name: c.default.arg for c in table.columns
+        if c.name not in cols and c.default is not None and c.default.is_scalar
+    }
+    cols += list(defaults)
+
+    buf = io.StringIO()
+    for row in ledger_rows:
+        buf.write('\t'.join(_copy_value(row.get(c, defaults.get(c))) for c in cols))
+        buf.write('\n')
+    buf.seek(0)
+
+    cur = session.connection().connection.cursor()
+    try:
+        cur.copy_expert(
+            f'COPY {table.name} ({", ".join(cols)}) FROM STDIN', buf
+        )
+    finally:
+        cur.close()
+
+
 def _ecri_unit_risk_resolver(session, site_ids):
     """Build a per-(site, label-tuple) unit-risk composer.
 
@@ -501,77 +619,96 @@ def api_eligible_tenants():
         # LEFT JOIN units_info_enriched for normalized size/climate labels and sqft —
         # used downstream for cross-site (country / top-N) benchmarks.
         eligibility_sql = text("""
-            SELECT
-                l."SiteID",
-                l."LedgerID",
-                l."UnitID",
-                l."TenantName" AS tenant_name,
-                l."dMovedIn",
-                l."dMovedOut",
-                l."dSchedOut",
-                l."dRentLastChanged",
-                l."dSchedRentStrt",
-                l."dcRent" AS current_rent,
-                l."dcSchedRent",
-                l."bExcludeFromRevenueMgmt",
-                l."TenantID",
-                l."sUnit" AS unit_name,
-                l."sTypeName" AS unit_type,
-                l."dcStdRate" AS std_rate,
-                l."dAnniv",
-                l."dPaidThru" AS paid_thru,
-                u.label_size_category AS size_category,
-                u.label_size_range AS size_range,
-                u.label_type_code AS type_code,
-                u.label_climate_code AS climate_code,
-                u.label_shape AS shape,
-                u.label_pillar AS pillar,
-                u.dcarea_fixed AS sqft
-            FROM vw_ecri_eligible_ledgers l
-            LEFT JOIN units_info_enriched u ON u."UnitID" = l."UnitID"
-            WHERE l."SiteID" = ANY(:site_ids)
-              -- Step 2: Active only (ccws_ledgers is active-only by design;
-              --         dMovedIn check kept as a safety net)
-              AND l."dMovedIn" IS NOT NULL
-              -- Step 3: Not scheduled out within exclusion window
-              AND (l."dSchedOut" IS NULL OR l."dSchedOut" > :sched_out_cutoff)
-              -- Step 4: No pending increase
-              AND (l."dSchedRentStrt" IS NULL OR l."dSchedRentStrt" < CURRENT_DATE)
-              -- Step 4: Last increase 12+ months ago
-              AND (COALESCE(l."dRentLastChanged", l."dMovedIn") <= :tenure_cutoff)
-            ORDER BY l."SiteID", l."LedgerID"
+            -- One pass over the view serves both the exclusion counts and the
+            -- eligible rows (a CTE referenced twice is materialised once).
+            WITH scan AS (
+                SELECT *
+                FROM vw_ecri_eligible_ledgers
+                WHERE "SiteID" = ANY(:site_ids)
+            ),
+            excl AS (
+                SELECT
+                    COUNT(*) FILTER (WHERE "dMovedIn" IS NULL) AS excluded_inactive,
+                    COUNT(*) FILTER (WHERE "dSchedOut" IS NOT NULL AND "dSchedOut" <= :sched_out_cutoff
+                        AND "dMovedIn" IS NOT NULL) AS excluded_sched_out,
+                    COUNT(*) FILTER (WHERE "dSchedRentStrt" IS NOT NULL AND "dSchedRentStrt" >= CURRENT_DATE
+                        AND "dMovedIn" IS NOT NULL) AS excluded_pending_increase,
+                    COUNT(*) FILTER (WHERE COALESCE("dRentLastChanged", "dMovedIn") > :tenure_cutoff
+                        AND "dMovedIn" IS NOT NULL
+                        AND ("dSchedRentStrt" IS NULL OR "dSchedRentStrt" < CURRENT_DATE)) AS excluded_recent_increase,
+                    0 AS excluded_rev_mgmt,
+                    COUNT(*) AS total_ledgers
+                FROM scan
+            ),
+            elig AS (
+                SELECT
+                    l."SiteID",
+                    l."LedgerID",
+                    l."UnitID",
+                    l."TenantName" AS tenant_name,
+                    l."dMovedIn",
+                    l."dMovedOut",
+                    l."dSchedOut",
+                    l."dRentLastChanged",
+                    l."dSchedRentStrt",
+                    l."dcRent"::float8 AS current_rent,
+                    l."dcSchedRent",
+                    l."bExcludeFromRevenueMgmt",
+                    l."TenantID",
+                    l."sUnit" AS unit_name,
+                    l."sTypeName" AS unit_type,
+                    l."dcStdRate"::float8 AS std_rate,
+                    l."dAnniv",
+                    l."dPaidThru" AS paid_thru,
+                    u.label_size_category AS size_category,
+                    u.label_size_range AS size_range,
+                    u.label_type_code AS type_code,
+                    u.label_climate_code AS climate_code,
+                    u.label_shape AS shape,
+                    u.label_pillar AS pillar,
+                    u.dcarea_fixed::float8 AS sqft
+                FROM scan l
+                LEFT JOIN units_info_enriched u ON u."UnitID" = l."UnitID"
+                -- Step 2: Active only (ccws_ledgers is active-only by design;
+                --         dMovedIn check kept as a safety net)
+                WHERE l."dMovedIn" IS NOT NULL
+                  -- Step 3: Not scheduled out within exclusion window
+                  AND (l."dSchedOut" IS NULL OR l."dSchedOut" > :sched_out_cutoff)
+                  -- Step 4: No pending increase
+                  AND (l."dSchedRentStrt" IS NULL OR l."dSchedRentStrt" < CURRENT_DATE)
+                  -- Step 4: Last increase 12+ months ago
+                  AND (COALESCE(l."dRentLastChanged", l."dMovedIn") <= :tenure_cutoff)
+            ),
+            -- In-place benchmarks per (site, unit type). Missing rents count
+            -- as 0 in the rent median; $/sqft only over units with both.
+            site_type AS (
+                SELECT
+                    "SiteID",
+                    COALESCE(unit_type, 'Unknown') AS unit_type_key,
+                    percentile_cont(0.5) WITHIN GROUP (
+                        ORDER BY COALESCE(current_rent, 0)
+                    ) AS in_place_median_site,
+                    percentile_cont(0.5) WITHIN GROUP (
+                        ORDER BY current_rent / sqft
+                    ) FILTER (WHERE sqft > 0 AND current_rent <> 0) AS in_place_psf_site
+                FROM elig
+                GROUP BY 1, 2
+            )
+            -- excl always yields one row, so the counts arrive even when no
+            -- ledger is eligible (that row then has NULL ledger columns).
+            SELECT x.*, e.*, st.in_place_median_site, st.in_place_psf_site
+            FROM excl x
+            LEFT JOIN (
+                elig e
+                LEFT JOIN site_type st
+                       ON st."SiteID" = e."SiteID"
+                      AND st.unit_type_key = COALESCE(e.unit_type, 'Unknown')
+            ) ON true
+            ORDER BY e."SiteID", e."LedgerID"
         """)
 
-        result = session.execute(eligibility_sql, {
-            'site_ids': site_ids,
-            'sched_out_cutoff': sched_out_cutoff,
-            'tenure_cutoff': tenure_cutoff,
-        })
-
-        rows = result.fetchall()
-        columns = result.keys()
-
-        # Build eligible tenants list with benchmarking
-        eligible = []
-        # Group by site+unit_type for in-place median calculation (rent and $/sqft)
-        site_type_rents = {}
-        site_type_psfs = {}
-
-        for row in rows:
-            r = dict(zip(columns, row))
-            current_rent = float(r['current_rent']) if r['current_rent'] else 0
-            site_id = r['SiteID']
-            unit_type = r['unit_type'] or 'Unknown'
-            sqft_v = float(r['sqft']) if r.get('sqft') else None
-
-            key = (site_id, unit_type)
-            site_type_rents.setdefault(key, []).append(current_rent)
-            if sqft_v and sqft_v > 0 and current_rent:
-                site_type_psfs.setdefault(key, []).append(current_rent / sqft_v)
-
-        site_type_medians = {k: _median(v) for k, v in site_type_rents.items()}
-        site_type_psf_medians = {k: _median(v) for k, v in site_type_psfs.items()}
-
+        # Lookups first, so nothing else runs on the connection while the
+        # eligibility cursor below is open.
         country, country_benchmarks = _country_size_climate_benchmarks(session, site_ids)
         variance_pct = _variance_pct
         unit_risk_resolve = _ecri_unit_risk_resolver(session, site_ids)
@@ -579,22 +716,37 @@ def api_eligible_tenants():
         bump_hist = _ledger_bump_history(session, site_ids)
         tenant_ledger_n = _tenant_ledger_counts(session, site_ids)
 
-        # Build final list
-        for row in rows:
-            r = dict(zip(columns, row))
-            current_rent = float(r['current_rent']) if r['current_rent'] else 0
-            std_rate = float(r['std_rate']) if r['std_rate'] else None
+        # Server-side cursor in batches instead of materialising every row
+        # first.
+        result = session.execute(eligibility_sql, {
+            'site_ids': site_ids,
+            'sched_out_cutoff': sched_out_cutoff,
+            'tenure_cutoff': tenure_cutoff,
+        }, execution_options={'yield_per': 1000})
+
+        # Build eligible tenants list with benchmarking. Rows are read through
+        # their RowMapping view rather than copied into a dict each.
+        eligible = []
+        excl_result = None
+        for r in result.mappings():
+            if excl_result is None:
+                excl_result = r
+            if r['LedgerID'] is None:
+                continue
+            # Rents and sqft arrive as float8 (cast in SQL), not Decimal.
+            current_rent = r['current_rent'] or 0.0
+            std_rate = r['std_rate'] or None
             site_id = r['SiteID']
             unit_type = r['unit_type'] or 'Unknown'
             moved_in = r['dMovedIn']
             sz = r.get('size_range')
             cc = r.get('climate_code')
-            sqft = float(r['sqft']) if r.get('sqft') else None
+            sqft = r['sqft'] or None
             current_psf = round(current_rent / sqft, 3) if sqft and sqft > 0 and current_rent else None
 
             # In-place benchmark (rent + $/sqft)
-            in_place_median = site_type_medians.get((site_id, unit_type))
-            in_place_psf_median = site_type_psf_medians.get((site_id, unit_type))
+            in_place_median = r['in_place_median_site']
+            in_place_psf_median = r['in_place_psf_site']
             variance_vs_site = variance_pct(current_rent, in_place_median)
             variance_psf_vs_site = variance_pct(current_psf, in_place_psf_median)
 
@@ -604,7 +756,7 @@ def api_eligible_tenants():
             market_psf = None
             variance_psf_vs_market = None
             if std_rate and std_rate > 0:
-                market_rate = round(float(std_rate) * (1 - discount_ref_pct / 100), 2)
+                market_rate = round(std_rate * (1 - discount_ref_pct / 100), 2)
                 variance_vs_market = variance_pct(current_rent, market_rate)
                 if sqft and sqft > 0:
                     market_psf = round(market_rate / sqft, 3)
@@ -653,7 +805,7 @@ def api_eligible_tenants():
                 'unit_type': unit_type,
                 'tenant_name': r['tenant_name'],
                 'current_rent': current_rent,
-                'std_rate': float(std_rate) if std_rate else None,
+                'std_rate': std_rate,
                 'moved_in_date': moved_in.isoformat() if moved_in else None,
                 'last_increase_date': r['dRentLastChanged'].isoformat() if r['dRentLastChanged'] else None,
                 'tenure_months': tenure_months,
@@ -702,38 +854,16 @@ def api_eligible_tenants():
                 'tenant_ledger_count': tenant_ledger_n.get(int(r['TenantID']), 1) if r.get('TenantID') else 1,
             })
 
-        # Exclusion summary (run a separate query for counts).
+        # Exclusion summary — counts came back on every row of the query above.
         # Source = vw_ecri_eligible_ledgers which is ccws_ledgers (active-only),
         # so the "inactive" counter will always be 0.
-        exclusion_sql = text("""
-            SELECT
-                COUNT(*) FILTER (WHERE "dMovedIn" IS NULL) AS excluded_inactive,
-                COUNT(*) FILTER (WHERE "dSchedOut" IS NOT NULL AND "dSchedOut" <= :sched_out_cutoff
-                    AND "dMovedIn" IS NOT NULL) AS excluded_sched_out,
-                COUNT(*) FILTER (WHERE "dSchedRentStrt" IS NOT NULL AND "dSchedRentStrt" >= CURRENT_DATE
-                    AND "dMovedIn" IS NOT NULL) AS excluded_pending_increase,
-                COUNT(*) FILTER (WHERE COALESCE("dRentLastChanged", "dMovedIn") > :tenure_cutoff
-                    AND "dMovedIn" IS NOT NULL
-                    AND ("dSchedRentStrt" IS NULL OR "dSchedRentStrt" < CURRENT_DATE)) AS excluded_recent_increase,
-                0 AS excluded_rev_mgmt,
-                COUNT(*) AS total_ledgers
-            FROM vw_ecri_eligible_ledgers
-            WHERE "SiteID" = ANY(:site_ids)
-        """)
-
-        excl_result = session.execute(exclusion_sql, {
-            'site_ids': site_ids,
-            'sched_out_cutoff': sched_out_cutoff,
-            'tenure_cutoff': tenure_cutoff,
-        }).fetchone()
-
         exclusion_summary = {
-            'total_ledgers': excl_result[5] if excl_result else 0,
-            'excluded_inactive': excl_result[0] if excl_result else 0,
-            'excluded_sched_out': excl_result[1] if excl_result else 0,
-            'excluded_pending_increase': excl_result[2] if excl_result else 0,
-            'excluded_recent_increase': excl_result[3] if excl_result else 0,
-            'excluded_rev_mgmt': excl_result[4] if excl_result else 0,
+            'total_ledgers': excl_result['total_ledgers'] if excl_result else 0,
+            'excluded_inactive': excl_result['excluded_inactive'] if excl_result else 0,
+            'excluded_sched_out': excl_result['excluded_sched_out'] if excl_result else 0,
+            'excluded_pending_increase': excl_result['excluded_pending_increase'] if excl_result else 0,
+            'excluded_recent_increase': excl_result['excluded_recent_increase'] if excl_result else 0,
+            'excluded_rev_mgmt': excl_result['excluded_rev_mgmt'] if excl_result else 0,
             'eligible': len(eligible),
         }
 
@@ -770,9 +900,11 @@ def api_list_batches():
 
     session = get_pbi_session()
     try:
-        batches = session.query(ECRIBatch).order_by(desc(ECRIBatch.created_at)).all()
+        rows = session.execute(
+            select(ECRIBatch.__table__).order_by(desc(ECRIBatch.created_at))
+        )
         return jsonify({
-            'batches': [b.to_dict() for b in batches]
+            'batches': [ECRIBatch.dict_from_row(r) for r in rows]
         })
     finally:
         session.close()
@@ -866,6 +998,7 @@ def api_append_to_batch(batch_id):
         skipped = 0
         new_site_ids = set(batch.site_ids or [])
 
+        ledger_rows = []
         for led in new_ledgers:
             key = (int(led['site_id']), int(led['ledger_id']))
             if key in existing:
@@ -882,7 +1015,7 @@ def api_append_to_batch(batch_id):
                 anniv, paid_thru, today, notice_days
             )
 
-            session.add(ECRIBatchLedger(
+            ledger_rows.append(dict(
                 batch_id=batch.batch_id,
                 site_id=led['site_id'],
                 ledger_id=led['ledger_id'],
@@ -917,6 +1050,8 @@ def api_append_to_batch(batch_id):
             new_site_ids.add(int(led['site_id']))
             appended += 1
 
+        if ledger_rows:
+            _insert_batch_ledgers(session, ledger_rows)
         batch.total_ledgers = (batch.total_ledgers or 0) + appended
         batch.site_ids = sorted(new_site_ids)
         session.commit()
@@ -942,7 +1077,7 @@ def api_append_to_batch(batch_id):
 @ecri_manage_required
 def api_create_batch():
     """Create a new ECRI batch from eligible tenant list."""
-    from common.models import ECRIBatch, ECRIBatchLedger
+    from common.models import ECRIBatch
 
     data = request.get_json()
     if not data:
@@ -1028,14 +1163,14 @@ def api_create_batch():
         group_percentages = [target_pct] if not control_enabled else (group_config or {}).get('percentages', [0, target_pct])
         num_groups = len(group_percentages) if control_enabled else 1
 
-        # Shuffle for random assignment
-        indices = list(range(len(ledgers)))
-        if control_enabled:
-            random.shuffle(indices)
+        # Systematic assignment from a random start. The ledgers are the
+        # eligibility rows (ordered by site), so striding across them also
+        # keeps each site's groups balanced.
+        offset = random.randrange(num_groups)
 
-        for i, idx in enumerate(indices):
-            led = ledgers[idx]
-            group_idx = i % num_groups if control_enabled else 0
+        ledger_rows = []
+        for i, led in enumerate(ledgers):
+            group_idx = (i + offset) % num_groups if control_enabled else 0
             pct = group_percentages[group_idx] if control_enabled else target_pct
             old_rent = float(led['current_rent'])
             currency = led.get('currency', 'SGD') or 'SGD'
@@ -1049,7 +1184,7 @@ def api_create_batch():
                 anniv, paid_thru, today, notice_days
             )
 
-            batch_ledger = ECRIBatchLedger(
+            ledger_rows.append(dict(
                 batch_id=batch_id,
                 site_id=led['site_id'],
                 ledger_id=led['ledger_id'],
@@ -1080,9 +1215,12 @@ def api_create_batch():
                 last_increase_date=led.get('last_increase_date'),
                 tenure_months=led.get('tenure_months'),
                 api_status='pending',
-            )
-            session.add(batch_ledger)
+            ))
 
+        # The batch row has to exist before its ledgers reference it.
+        session.flush()
+        if ledger_rows:
+            _insert_batch_ledgers(session, ledger_rows)
         session.commit()
 
         return jsonify({
@@ -1144,42 +1282,49 @@ def api_advance_eligible():
     try:
         today = date.today()
 
+        # Site medians by (site_id, unit_type) — rent and $/sqft, over units
+        # with a non-zero rent — are aggregated in SQL and joined back.
         rows = session.execute(text("""
-            SELECT
-                v."SiteID", v."LedgerID", v."TenantID", v."UnitID",
-                v."TenantName", v.unit_name, v.unit_type,
-                v."dMovedIn", v.paid_thru, v."dAnniv",
-                v.current_rent, v.std_rate,
-                v."dRentLastChanged",
-                v.segment, v.discount_expires, v.projected_paid_thru,
-                u.dcarea_fixed AS sqft,
-                u.label_size_category AS size_category,
-                u.label_size_range AS size_range,
-                u.label_type_code AS type_code,
-                u.label_climate_code AS climate_code,
-                u.label_shape AS shape,
-                u.label_pillar AS pillar
-            FROM vw_ecri_advance_eligible_ledgers v
-            LEFT JOIN units_info_enriched u ON u."UnitID" = v."UnitID"
-            WHERE v."SiteID" = ANY(:site_ids)
-            ORDER BY v.segment, v."SiteID", v."LedgerID"
+            WITH adv AS (
+                SELECT
+                    v."SiteID", v."LedgerID", v."TenantID", v."UnitID",
+                    v."TenantName", v.unit_name, v.unit_type,
+                    v."dMovedIn", v.paid_thru, v."dAnniv",
+                    v.current_rent, v.std_rate,
+                    v."dRentLastChanged",
+                    v.segment, v.discount_expires, v.projected_paid_thru,
+                    u.dcarea_fixed AS sqft,
+                    u.label_size_category AS size_category,
+                    u.label_size_range AS size_range,
+                    u.label_type_code AS type_code,
+                    u.label_climate_code AS climate_code,
+                    u.label_shape AS shape,
+                    u.label_pillar AS pillar
+                FROM vw_ecri_advance_eligible_ledgers v
+                LEFT JOIN units_info_enriched u ON u."UnitID" = v."UnitID"
+                WHERE v."SiteID" = ANY(:site_ids)
+            ),
+            site_type AS (
+                SELECT
+                    "SiteID",
+                    COALESCE(unit_type, 'Unknown') AS unit_type_key,
+                    percentile_cont(0.5) WITHIN GROUP (
+                        ORDER BY current_rent::float8
+                    ) FILTER (WHERE current_rent <> 0) AS site_median,
+                    percentile_cont(0.5) WITHIN GROUP (
+                        ORDER BY current_rent::float8 / sqft
+                    ) FILTER (WHERE current_rent <> 0 AND sqft > 0) AS site_psf_median
+                FROM adv
+                GROUP BY 1, 2
+            )
+            SELECT a.*, st.site_median, st.site_psf_median
+            FROM adv a
+            LEFT JOIN site_type st
+                   ON st."SiteID" = a."SiteID"
+                  AND st.unit_type_key = COALESCE(a.unit_type, 'Unknown')
+            ORDER BY a.segment, a."SiteID", a."LedgerID"
         """), {'site_ids': site_ids}).fetchall()
 
-        # Site medians by (site_id, unit_type) — rent and $/sqft
-        site_type_rents: dict[tuple[int, str], list[float]] = {}
-        site_type_psfs: dict[tuple[int, str], list[float]] = {}
-        for r in rows:
-            cr = float(r.current_rent) if r.current_rent else 0
-            sq = float(r.sqft) if r.sqft else None
-            key = (r.SiteID, r.unit_type or 'Unknown')
-            if cr:
-                site_type_rents.setdefault(key, []).append(cr)
-                if sq and sq > 0:
-                    site_type_psfs.setdefault(key, []).append(cr / sq)
-
-        site_medians = {k: _median(v) for k, v in site_type_rents.items()}
-        site_psf_medians = {k: _median(v) for k, v in site_type_psfs.items()}
-
         # Country / Top-N benchmarks per (size_range, climate_code)
         _, country_benchmarks = _country_size_climate_benchmarks(session, site_ids)
         unit_risk_resolve = _ecri_unit_risk_resolver(session, site_ids)
@@ -1202,8 +1347,8 @@ def api_advance_eligible():
             cc = r.climate_code
             current_psf = round(cr / sqft, 3) if sqft and sqft > 0 and cr else None
 
-            ipm = site_medians.get((r.SiteID, unit_type))
-            ipm_psf = site_psf_medians.get((r.SiteID, unit_type))
+            ipm = r.site_median
+            ipm_psf = r.site_psf_median
 
             market_rate = None
             market_psf = None
@@ -1338,7 +1483,7 @@ def api_create_advance_batch():
     fields: ``segment``, ``discount_expires``. Control groups are not used
     on advance batches.
     """
-    from common.models import ECRIBatch, ECRIBatchLedger
+    from common.models import ECRIBatch
     from decimal import Decimal
 
     data = request.get_json()
@@ -1426,6 +1571,7 @@ def api_create_advance_batch():
         )
         session.add(batch)
 
+        ledger_rows = []
         for led in ledgers:
             old_rent = float(led['current_rent'])
             currency = led.get('currency', 'SGD') or 'SGD'
@@ -1464,7 +1610,7 @@ def api_create_advance_batch():
                 prepay_buffer_days=prepay_buffer,
             )
 
-            batch_ledger = ECRIBatchLedger(
+            ledger_rows.append(dict(
                 batch_id=batch_id,
                 site_id=led['site_id'],
                 ledger_id=led['ledger_id'],
@@ -1497,9 +1643,12 @@ def api_create_advance_batch():
                 moved_in_date=moved_in_date,
                 tenure_months=led.get('tenure_months'),
                 api_status='pending',
-            )
-            session.add(batch_ledger)
+            ))
 
+        # The batch row has to exist before its ledgers reference it.
+        session.flush()
+        if ledger_rows:
+            _insert_batch_ledgers(session, ledger_rows)
         session.commit()
 
         return jsonify({
@@ -1525,25 +1674,59 @@ def api_create_advance_batch():
 def api_get_batch(batch_id):
     """Get batch details with ledger list. All monetary values are
     returned both in native currency and normalized to SGD using the
-    latest fx_rates row (1 SGD = rate target_currency)."""
+    latest fx_rates row (1 SGD = rate target_currency).
+
+    Optional query params page the ledger list (the summary always covers
+    the whole batch):
+    - limit: ledgers per page (max 500); without it every ledger is returned
+    - after: `next_cursor` from the previous page ("<site_id>:<ledger_id>")
+    """
     from common.models import ECRIBatch, ECRIBatchLedger
 
+    limit = request.args.get('limit')
+    after = request.args.get('after')
+    try:
+        limit = max(1, min(int(limit), 500)) if limit else None
+        after = tuple(int(p) for p in after.split(':', 1)) if after else None
+        if after is not None and len(after) != 2:
+            raise ValueError
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer and after a "site_id:ledger_id" cursor'}), 400
+
     session = get_pbi_session()
     try:
         batch = session.query(ECRIBatch).filter_by(batch_id=batch_id).first()
         if not batch:
             return jsonify({'error': 'Batch not found'}), 404
 
-        ledgers = session.query(ECRIBatchLedger).filter_by(batch_id=batch_id).order_by(
-            ECRIBatchLedger.site_id, ECRIBatchLedger.ledger_id
-        ).all()
+        page_q = session.query(ECRIBatchLedger).filter_by(batch_id=batch_id)
+        if after is not None:
+            page_q = page_q.filter(
+                tuple_(ECRIBatchLedger.site_id, ECRIBatchLedger.ledger_id) > after
+            )
+        page_q = page_q.order_by(ECRIBatchLedger.site_id, ECRIBatchLedger.ledger_id)
+        if limit is not None:
+            page_q = page_q.limit(limit)
+        ledgers = page_q.all()
+
+        # When paging, the summary inputs for the whole batch come in as plain
+        # column rows; only the requested page is loaded as ORM objects.
+        summary_rows = ledgers if limit is None and after is None else session.query(
+            ECRIBatchLedger.site_id,
+            ECRIBatchLedger.control_group,
+            ECRIBatchLedger.currency,
+            ECRIBatchLedger.increase_amt,
+            ECRIBatchLedger.increase_pct,
+            ECRIBatchLedger.api_status,
+            ECRIBatchLedger.exclusion_status,
+            ECRIBatchLedger.bucket,
+        ).filter_by(batch_id=batch_id).all()
 
         # Auto-promote to 'executed' when all ledgers have been processed.
         # Catches partial-push batches that never hit the full-batch flip,
         # and manually patched rows that bypassed the worker.
-        if batch.status == 'draft' and ledgers:
-            pending_count = sum(1 for l in ledgers if l.api_status == 'pending')
-            if pending_count == 0:
+        if batch.status == 'draft' and summary_rows:
+            if not any(l.api_status == 'pending' for l in summary_rows):
                 batch.status = 'executed'
                 batch.executed_at = datetime.utcnow()
                 session.commit()
@@ -1552,12 +1735,12 @@ def api_get_batch(batch_id):
         # To convert native → SGD: native / rate. SGD itself is not in the
         # table; we hardcode rate=1.
         fx_rows = session.execute(text(
-            "SELECT target_currency, rate FROM fx_rates "
+            "SELECT target_currency, rate, rate_date FROM fx_rates "
             "WHERE rate_date = (SELECT MAX(rate_date) FROM fx_rates)"
         )).fetchall()
         fx_map = {row[0]: float(row[1]) for row in fx_rows}
         fx_map['SGD'] = 1.0
-        fx_date = session.execute(text("SELECT MAX(rate_date) FROM fx_rates")).scalar()
+        fx_date = fx_rows[0][2] if fx_rows else None
 
         def to_sgd(amount, currency):
             if amount is None:
@@ -1572,17 +1755,10 @@ def api_get_batch(batch_id):
 
         # site_id → site_code lookup so the UI can show codes (L001, L023…)
         # instead of the opaque numeric SiteID.
-        all_site_ids = list({int(l.site_id) for l in ledgers} | set(batch.site_ids or []))
-        site_code_map = {}
-        if all_site_ids:
-            for row in session.execute(text(
-                'SELECT "SiteID", "SiteCode" FROM siteinfo WHERE "SiteID" = ANY(:ids)'
-            ), {'ids': all_site_ids}).fetchall():
-                site_code_map[int(row[0])] = row[1]
+        all_site_ids = list({int(l.site_id) for l in summary_rows} | set(batch.site_ids or []))
+        site_code_map = _site_code_map(session, all_site_ids) if all_site_ids else {}
 
         ledger_dicts = []
-        total_increase_sgd = 0.0
-        by_group = {}
         for l in ledgers:
             ld = l.to_dict()
             ld['old_rent_sgd'] = to_sgd(l.old_rent, l.currency)
@@ -1591,7 +1767,18 @@ def api_get_batch(batch_id):
             ld['site_code'] = site_code_map.get(int(l.site_id))
             ledger_dicts.append(ld)
 
-            inc_sgd = ld['increase_amt_sgd'] or 0.0
+        total_increase_sgd = 0.0
+        by_group = {}
+        # Status tallies are gathered in the same pass as the group totals.
+        api_status_counts = Counter()
+        exclusion_counts = Counter()
+        bucket_counts = Counter()
+        for l in summary_rows:
+            api_status_counts[l.api_status] += 1
+            exclusion_counts[l.exclusion_status or 'none'] += 1
+            bucket_counts[l.bucket or 'unknown'] += 1
+
+            inc_sgd = to_sgd(l.increase_amt, l.currency) or 0.0
             total_increase_sgd += inc_sgd
 
             g = l.control_group
@@ -1610,6 +1797,9 @@ def api_get_batch(batch_id):
             del by_group[g]['pcts']
 
         batch_dict['ledgers'] = ledger_dicts
+        if limit is not None:
+            last = ledgers[-1] if len(ledgers) == limit else None
+            batch_dict['next_cursor'] = f'{last.site_id}:{last.ledger_id}' if last else None
         batch_dict['site_codes'] = [
             site_code_map.get(int(sid)) or str(sid) for sid in (batch.site_ids or [])
         ]
@@ -1625,22 +1815,13 @@ def api_get_batch(batch_id):
             'total_annual_increase_sgd': round(total_increase_sgd * 12, 2),
             'groups': by_group,
             'api_status_counts': {
-                'pending': sum(1 for l in ledgers if l.api_status == 'pending'),
-                'success': sum(1 for l in ledgers if l.api_status == 'success'),
-                'failed': sum(1 for l in ledgers if l.api_status == 'failed'),
-                'skipped': sum(1 for l in ledgers if l.api_status == 'skipped'),
+                k: api_status_counts[k] for k in ('pending', 'success', 'failed', 'skipped')
             },
             'exclusion_counts': {
-                'none': sum(1 for l in ledgers if (l.exclusion_status or 'none') == 'none'),
-                'requested': sum(1 for l in ledgers if l.exclusion_status == 'requested'),
-                'approved': sum(1 for l in ledgers if l.exclusion_status == 'approved'),
-                'rejected': sum(1 for l in ledgers if l.exclusion_status == 'rejected'),
+                k: exclusion_counts[k] for k in ('none', 'requested', 'approved', 'rejected')
             },
             'bucket_counts': {
-                'green': sum(1 for l in ledgers if l.bucket == 'green'),
-                'amber': sum(1 for l in ledgers if l.bucket == 'amber'),
-                'red': sum(1 for l in ledgers if l.bucket == 'red'),
-                'unknown': sum(1 for l in ledgers if l.bucket == 'unknown' or l.bucket is None),
+                k: bucket_counts[k] for k in ('green', 'amber', 'red', 'unknown')
             },
         }
 
@@ -1763,35 +1944,130 @@ def api_cancel_batch(batch_id):
 # API: Execute Batch (Push to SiteLink) — async background processing
 # =============================================================================
 
-import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 _ecri_logger = logging.getLogger('ecri.execute')
 
+# Concurrent ScheduleTenantRateChange calls per batch run — same ceiling the
+# CCWS sync pipelines use against SiteLink.
+_EXECUTE_WORKERS = 6
+
+# Idle CallCenterWs clients kept across batch runs and objection applies, so
+# their requests.Session keeps its pooled TLS connections to SiteLink. Keyed
+# by the SOAP config; a client is checked out by one thread at a time since
+# requests.Session is not safe to share.
+_soap_pool = {}
+_soap_pool_lock = threading.Lock()
+
+
+@contextmanager
+def _soap_client(soap_cfg):
+    """Check out a CallCenterWs SOAPClient for `soap_cfg`, returning it to
+    the idle pool afterwards (at most _EXECUTE_WORKERS kept)."""
+    from common.soap_client import SOAPClient
+
+    cc_url = soap_cfg.base_url.replace('ReportingWs.asmx', 'CallCenterWs.asmx')
+    key = (cc_url, soap_cfg.corp_code, soap_cfg.corp_user, soap_cfg.api_key,
+           soap_cfg.corp_password, soap_cfg.timeout, soap_cfg.retries)
+    with _soap_pool_lock:
+        idle = _soap_pool.get(key)
+        client = idle.pop() if idle else None
+    if client is None:
+        client = SOAPClient(
+            base_url=cc_url,
+            corp_code=soap_cfg.corp_code,
+            corp_user=soap_cfg.corp_user,
+            api_key=soap_cfg.api_key,
+            corp_password=soap_cfg.corp_password,
+            timeout=soap_cfg.timeout,
+            retries=soap_cfg.retries,
+        )
+    try:
+        yield client
+    finally:
+        stale = []
+        with _soap_pool_lock:
+            if key not in _soap_pool:
+                # Config changed (credential rotation): drop the old clients.
+                for old in _soap_pool.values():
+                    stale.extend(old)
+                _soap_pool.clear()
+            idle = _soap_pool.setdefault(key, [])
+            if len(idle) < _EXECUTE_WORKERS:
+                idle.append(client)
+            else:
+                stale.append(client)
+        for c in stale:
+            c.close()
+
+
+def _push_rate_change(soap_client, led_id, site_id, payload):
+    """One ScheduleTenantRateChange call. Returns (api_status, api_response);
+    never raises, so a pool worker can't lose a ledger's outcome."""
+    from common.soap_client import SOAPFaultError
+
+    try:
+        api_result = soap_client.call(
+            operation="ScheduleTenantRateChange",
+            parameters=payload,
+            soap_action="http://tempuri.org/CallCenterWs/CallCenterWs/ScheduleTenantRateChange",
+            namespace="http://tempuri.org/CallCenterWs/CallCenterWs",
+            result_tag="RT",
+        )
+        ret_code = api_result[0].get('Ret_Code') if api_result else None
+        ret_msg = api_result[0].get('Ret_Msg') if api_result else None
+
+        if ret_code is not None and str(ret_code) == '-1':
+            return 'failed', {'error': 'SMD rejected', 'ret_code': ret_code, 'ret_msg': ret_msg, 'payload': payload}
+        return 'success', {'ret_code': ret_code, 'ret_msg': ret_msg, 'payload': payload}
+
+    except SOAPFaultError as e:
+        _ecri_logger.error(f"SOAP fault ledger {led_id} site {site_id}: {e}")
+        return 'failed', {'error': 'SOAP API error', 'payload': payload}
+
+    except Exception as e:
+        _ecri_logger.error(f"Error ledger {led_id} site {site_id}: {e}")
+        return 'failed', {'error': 'Internal error', 'payload': payload}
+
 
 def _execute_batch_worker(batch_id, ledger_ids_filter, app_config):
-    """Background worker: push ECRI ledgers to SMD one at a time, committing
-    per-row so progress is visible via the progress endpoint."""
-    from common.models import ECRIBatch, ECRIBatchLedger, SiteInfo
+    """Background worker: push ECRI ledgers to SMD over a small thread pool.
+    The SOAP calls run concurrently; every result is applied and committed
+    per-row on this thread (the session is not shared) so progress is
+    visible via the progress endpoint."""
+    from common.models import ECRIBatch, ECRIBatchLedger
     from common.config import DataLayerConfig
-    from common.soap_client import SOAPClient, SOAPFaultError
 
     session = get_pbi_session()
-    soap_client = None
     try:
         batch = session.query(ECRIBatch).filter_by(batch_id=batch_id).first()
         if not batch:
             _ecri_logger.error(f"Batch {batch_id} not found in worker")
             return
 
-        q = session.query(ECRIBatchLedger).filter(
+        pending = [
             ECRIBatchLedger.batch_id == batch_id,
             ECRIBatchLedger.api_status == 'pending',
             ECRIBatchLedger.exclusion_status != 'approved',
-        )
+        ]
         if ledger_ids_filter:
-            q = q.filter(ECRIBatchLedger.id.in_(ledger_ids_filter))
-        ledgers = q.all()
+            pending.append(ECRIBatchLedger.id.in_(ledger_ids_filter))
+
+        # Control-group ledgers (0% increase) never reach SMD: settle them in
+        # one UPDATE instead of loading them only to skip them.
+        control_skipped = 0
+        if batch.control_group_enabled:
+            control_skipped = session.execute(
+                update(ECRIBatchLedger)
+                .where(*pending, ECRIBatchLedger.increase_pct == 0)
+                .values(api_status='skipped',
+                        api_response={'reason': 'Control group - no increase'}),
+                execution_options={'synchronize_session': False},
+            ).rowcount
+            pending.append(ECRIBatchLedger.increase_pct != 0)
+
+        ledgers = session.query(ECRIBatchLedger).filter(*pending).all()
 
         # Mark approved-exclusion rows as skipped immediately
         excluded_q = session.query(ECRIBatchLedger).filter(
@@ -1811,7 +2087,9 @@ def _execute_batch_worker(batch_id, ledger_ids_filter, app_config):
             excl_led.api_executed_at = datetime.utcnow()
         session.commit()
 
-        if not ledgers:
+        # A run of only control-group rows has settled them all above; let it
+        # fall through to the completion check rather than revert to draft.
+        if not ledgers and not control_skipped:
             batch.status = 'draft'
             session.commit()
             return
@@ -1823,87 +2101,51 @@ def _execute_batch_worker(batch_id, ledger_ids_filter, app_config):
             session.commit()
             return
 
-        cc_url = config.soap.base_url.replace('ReportingWs.asmx', 'CallCenterWs.asmx')
-        soap_client = SOAPClient(
-            base_url=cc_url,
-            corp_code=config.soap.corp_code,
-            corp_user=config.soap.corp_user,
-            api_key=config.soap.api_key,
-            corp_password=config.soap.corp_password,
-            timeout=config.soap.timeout,
-            retries=config.soap.retries
-        )
-
-        site_codes = {}
-        sites = session.query(SiteInfo).filter(SiteInfo.SiteID.in_(batch.site_ids)).all()
-        for s in sites:
-            site_codes[s.SiteID] = s.SiteCode
+        site_codes = _site_code_map(session, batch.site_ids or [])
 
+        # Rows that need no API call are settled here; the rest are queued
+        # with their ids captured before the commit expires the objects.
+        to_push = []
         for led in ledgers:
-            try:
-                site_code = site_codes.get(led.site_id)
-                if not site_code:
-                    led.api_status = 'skipped'
-                    led.api_response = {'error': f'No site code for SiteID {led.site_id}'}
-                    session.commit()
-                    continue
-
-                if batch.control_group_enabled and led.increase_pct == 0:
-                    led.api_status = 'skipped'
-                    led.api_response = {'reason': 'Control group - no increase'}
-                    session.commit()
-                    continue
-
-                if not led.effective_date:
-                    led.api_status = 'skipped'
-                    led.api_response = {'reason': 'effective_date is empty'}
-                    session.commit()
-                    continue
-
-                payload = {
+            site_code = site_codes.get(led.site_id)
+            if not site_code:
+                led.api_status = 'skipped'
+                led.api_response = {'error': f'No site code for SiteID {led.site_id}'}
+            elif not led.effective_date:
+                led.api_status = 'skipped'
+                led.api_response = {'reason': 'effective_date is empty'}
+            else:
+                to_push.append((led, led.ledger_id, led.site_id, {
                     "sLocationCode": site_code,
                     "LedgerID": str(led.ledger_id),
                     "dcNewRate": f"{float(led.new_rent):.2f}",
                     "dScheduledChange": led.effective_date.strftime('%Y-%m-%dT00:00:00'),
-                }
-
-                try:
-                    api_result = soap_client.call(
-                        operation="ScheduleTenantRateChange",
-                        parameters=payload,
-                        soap_action="http://tempuri.org/CallCenterWs/CallCenterWs/ScheduleTenantRateChange",
-                        namespace="http://tempuri.org/CallCenterWs/CallCenterWs",
-                        result_tag="RT",
-                    )
-                    ret_code = api_result[0].get('Ret_Code') if api_result else None
-                    ret_msg = api_result[0].get('Ret_Msg') if api_result else None
-
-                    if ret_code is not None and str(ret_code) == '-1':
-                        led.api_status = 'failed'
-                        led.api_response = {'error': 'SMD rejected', 'ret_code': ret_code, 'ret_msg': ret_msg, 'payload': payload}
-                    else:
-                        led.api_status = 'success'
-                        led.api_response = {'ret_code': ret_code, 'ret_msg': ret_msg, 'payload': payload}
-                    led.api_executed_at = datetime.utcnow()
-
-                except SOAPFaultError as e:
-                    _ecri_logger.error(f"SOAP fault ledger {led.ledger_id} site {led.site_id}: {e}")
-                    led.api_status = 'failed'
-                    led.api_response = {'error': 'SOAP API error', 'payload': payload}
-                    led.api_executed_at = datetime.utcnow()
-
-                except Exception as e:
-                    _ecri_logger.error(f"Error ledger {led.ledger_id} site {led.site_id}: {e}")
-                    led.api_status = 'failed'
-                    led.api_response = {'error': 'Internal error', 'payload': payload}
-                    led.api_executed_at = datetime.utcnow()
-
-                # Commit after every row so progress is visible
-                session.commit()
+                }))
+        session.commit()
 
-            except Exception as e:
-                _ecri_logger.error(f"Outer error for ledger {led.ledger_id}: {e}")
-                session.rollback()
+        def push(led_id, site_id, payload):
+            with _soap_client(config.soap) as client:
+                return _push_rate_change(client, led_id, site_id, payload)
+
+        if to_push:
+            with ThreadPoolExecutor(
+                max_workers=min(_EXECUTE_WORKERS, len(to_push)),
+                thread_name_prefix='ecri-execute',
+            ) as pool:
+                futs = {
+                    pool.submit(push, led_id, site_id, payload): (led, led_id)
+                    for led, led_id, site_id, payload in to_push
+                }
+                for fut in as_completed(futs):
+                    led, led_id = futs[fut]
+                    try:
+                        led.api_status, led.api_response = fut.result()
+                        led.api_executed_at = datetime.utcnow()
+                        # Commit after every row so progress is visible
+                        session.commit()
+                    except Exception as e:
+                        _ecri_logger.error(f"Outer error for ledger {led_id}: {e}")
+                        session.rollback()
 
         # Check if all ledgers in the batch are done (pending = not yet processed)
         remaining = session.query(ECRIBatchLedger).filter(
@@ -1928,8 +2170,6 @@ def _execute_batch_worker(batch_id, ledger_ids_filter, app_config):
         except Exception:
             pass
     finally:
-        if soap_client:
-            soap_client.close()
         session.close()
 
 
@@ -2195,9 +2435,10 @@ def api_batch_year_impact(batch_id):
 @ecri_bp.route('/api/batch/<batch_id>/outcomes')
 @login_required
 @ecri_access_required
+@cached(ttl_seconds=120, version=lambda batch_id: _analytics_summary_version())
 def api_batch_outcomes(batch_id):
     """Get outcome tracking data for a batch."""
-    from common.models import ECRIBatch, ECRIBatchLedger, ECRIOutcome
+    from common.models import ECRIBatch, ECRIOutcome
 
     session = get_pbi_session()
     try:
@@ -2205,39 +2446,52 @@ def api_batch_outcomes(batch_id):
         if not batch:
             return jsonify({'error': 'Batch not found'}), 404
 
-        ledgers = session.query(ECRIBatchLedger).filter_by(batch_id=batch_id).all()
         outcomes = session.query(ECRIOutcome).filter_by(batch_id=batch_id).all()
 
+        # Per (control group, currency) outcome tallies, aggregated in SQL.
+        # outcome_type is the trigger-maintained copy of the ledger's latest
+        # ecri_outcomes row; first_id keeps groups in ledger order and picks
+        # each group's headline increase_pct.
+        group_rows = session.execute(text("""
+            SELECT
+                l.control_group,
+                COALESCE(l.currency, 'SGD') AS currency,
+                MIN(l.id) AS first_id,
+                (array_agg(l.increase_pct ORDER BY l.id))[1] AS increase_pct,
+                COUNT(*) AS count,
+                COUNT(*) FILTER (WHERE l.outcome_type = 'stayed') AS stayed,
+                COUNT(*) FILTER (WHERE l.outcome_type = 'moved_out') AS moved_out,
+                COUNT(*) FILTER (WHERE l.outcome_type = 'scheduled_out') AS scheduled_out,
+                COALESCE(SUM(l.increase_amt) FILTER (
+                    WHERE l.outcome_type IS NULL
+                       OR l.outcome_type NOT IN ('moved_out', 'scheduled_out')
+                ), 0) AS gain,
+                COALESCE(SUM(l.new_rent) FILTER (WHERE l.outcome_type = 'moved_out'), 0) AS loss_churn,
+                COALESCE(SUM(l.new_rent) FILTER (WHERE l.outcome_type = 'scheduled_out'), 0) AS loss_scheduled
+            FROM ecri_batch_ledgers l
+            WHERE l.batch_id = :batch_id
+            GROUP BY l.control_group, COALESCE(l.currency, 'SGD')
+            ORDER BY first_id
+        """), {'batch_id': batch_id}).all()
+
         # FX rates — normalise multi-currency rents to SGD so cross-country
         # batches don't double/decuple-count raw KRW/MYR figures.
-        from sqlalchemy import text as _text
-        fx_rows = session.execute(_text(
+        fx_rows = session.execute(text(
             "SELECT target_currency, rate FROM fx_rates "
             "WHERE rate_date = (SELECT MAX(rate_date) FROM fx_rates)"
         )).fetchall()
         fx = {r[0]: float(r[1]) for r in fx_rows}
         fx['SGD'] = 1.0
 
-        def _to_sgd(amt, cur):
-            if amt is None:
-                return 0.0
-            rate = fx.get(cur or 'SGD', 1.0)
-            return float(amt) / rate
-
-        # Build outcome map
-        outcome_map = {}
-        for o in outcomes:
-            outcome_map[o.ledger_id] = o.to_dict()
-
-        # Group analysis
+        # Group analysis: fold the currency rows of each group, in SGD.
         groups = {}
-        for led in ledgers:
-            g = led.control_group
+        for r in group_rows:
+            g = r.control_group
             if g not in groups:
                 groups[g] = {
                     'group': g,
                     'count': 0,
-                    'increase_pct': float(led.increase_pct),
+                    'increase_pct': float(r.increase_pct),
                     'stayed': 0,
                     'moved_out': 0,
                     'scheduled_out': 0,
@@ -2246,25 +2500,16 @@ def api_batch_outcomes(batch_id):
                     'monthly_loss_churn': 0,
                     'monthly_loss_scheduled': 0,
                 }
-
-            groups[g]['count'] += 1
-            outcome = outcome_map.get(led.ledger_id)
-            otype = outcome['outcome_type'] if outcome else None
-            cur = led.currency or 'SGD'
-
-            if otype == 'moved_out':
-                groups[g]['moved_out'] += 1
-                groups[g]['monthly_loss_churn'] += _to_sgd(led.new_rent, cur)
-            elif otype == 'scheduled_out':
-                groups[g]['scheduled_out'] += 1
-                groups[g]['monthly_loss_scheduled'] += _to_sgd(led.new_rent, cur)
-            else:
-                # stayed or pending → presumed staying, contributes upside
-                groups[g]['monthly_gain_stayed'] += _to_sgd(led.increase_amt, cur)
-                if otype == 'stayed':
-                    groups[g]['stayed'] += 1
-                else:
-                    groups[g]['pending'] += 1
+            rate = fx.get(r.currency, 1.0)
+            groups[g]['count'] += r.count
+            groups[g]['stayed'] += r.stayed
+            groups[g]['moved_out'] += r.moved_out
+            groups[g]['scheduled_out'] += r.scheduled_out
+            # stayed or pending → presumed staying, contributes upside
+            groups[g]['pending'] += r.count - r.stayed - r.moved_out - r.scheduled_out
+            groups[g]['monthly_gain_stayed'] += float(r.gain) / rate
+            groups[g]['monthly_loss_churn'] += float(r.loss_churn) / rate
+            groups[g]['monthly_loss_scheduled'] += float(r.loss_scheduled) / rate
 
         # Calculate rates
         for g in groups:
@@ -2300,35 +2545,89 @@ def api_batch_outcomes(batch_id):
         session.close()
 
 
+def _analytics_summary_version():
+    """(executed batches, newest executed_at, newest outcome id).
+
+    Moves when a batch is executed or the outcome tracker records an
+    outcome, so the cached summary is recomputed then rather than on every
+    dashboard load. Edits that don't move it (objection applies rewriting a
+    ledger's rent) are picked up when the TTL lapses.
+    """
+    session = get_pbi_session()
+    try:
+        row = session.execute(text(
+            "SELECT (SELECT COUNT(*) FROM ecri_batches WHERE status = 'executed'), "
+            "(SELECT MAX(executed_at) FROM ecri_batches WHERE status = 'executed'), "
+            "(SELECT MAX(id) FROM ecri_outcomes)"
+        )).one()
+    finally:
+        session.close()
+    return ':'.join(str(v) for v in row)
+
+
 @ecri_bp.route('/api/analytics/summary')
 @login_required
 @ecri_access_required
+@cached(ttl_seconds=600, version=_analytics_summary_version)
 def api_analytics_summary():
     """Get overall ECRI performance summary across all batches."""
-    from common.models import ECRIBatch, ECRIBatchLedger, ECRIOutcome
-
     session = get_pbi_session()
     try:
-        # Get executed batches
-        batches = session.query(ECRIBatch).filter_by(status='executed').order_by(
-            desc(ECRIBatch.executed_at)
-        ).all()
+        # Per-batch, per-currency outcome tallies for every executed batch in
+        # one statement. outcome_type is the trigger-maintained copy of the
+        # ledger's latest ecri_outcomes row; batches with no ledgers still
+        # come back as a single zero row. Ordered so each batch's currency
+        # rows are adjacent.
+        rows = session.execute(text("""
+            SELECT
+                b.batch_id,
+                b.name,
+                b.executed_at,
+                COALESCE(l.currency, 'SGD') AS currency,
+                COUNT(l.id) AS total_ledgers,
+                COUNT(*) FILTER (WHERE l.outcome_type = 'stayed') AS stayed,
+                COUNT(*) FILTER (WHERE l.outcome_type = 'moved_out') AS churned,
+                COUNT(*) FILTER (WHERE l.outcome_type = 'scheduled_out') AS scheduled_out,
+                COALESCE(SUM(l.new_rent) FILTER (
+                    WHERE l.outcome_type IN ('moved_out', 'scheduled_out')
+                ), 0) AS loss,
+                COALESCE(SUM(l.increase_amt) FILTER (
+                    WHERE l.outcome_type IS NULL
+                       OR l.outcome_type NOT IN ('moved_out', 'scheduled_out')
+                ), 0) AS gain
+            FROM ecri_batches b
+            LEFT JOIN ecri_batch_ledgers l ON l.batch_id = b.batch_id
+            WHERE b.status = 'executed'
+            GROUP BY b.batch_id, COALESCE(l.currency, 'SGD')
+            ORDER BY b.executed_at DESC, b.batch_id
+        """)).all()
 
         # FX rates — used to normalise multi-currency rents to SGD
-        from sqlalchemy import text as _text
-        fx_rows = session.execute(_text(
+        fx_rows = session.execute(text(
             "SELECT target_currency, rate FROM fx_rates "
             "WHERE rate_date = (SELECT MAX(rate_date) FROM fx_rates)"
         )).fetchall()
         fx = {r[0]: float(r[1]) for r in fx_rows}
         fx['SGD'] = 1.0
 
-        def _to_sgd(amt, cur):
-            rate = fx.get(cur or 'SGD', 1.0)
-            return float(amt) / rate if amt is not None else 0.0
+        per_batch = {}
+        for r in rows:
+            b = per_batch.get(r.batch_id)
+            if b is None:
+                b = per_batch[r.batch_id] = {
+                    'name': r.name, 'executed_at': r.executed_at, 'total': 0,
+                    'stayed': 0, 'churned': 0, 'scheduled': 0, 'gain': 0.0, 'loss': 0.0,
+                }
+            rate = fx.get(r.currency, 1.0)
+            b['total'] += r.total_ledgers
+            b['stayed'] += r.stayed
+            b['churned'] += r.churned
+            b['scheduled'] += r.scheduled_out
+            b['gain'] += float(r.gain) / rate
+            b['loss'] += float(r.loss) / rate
 
         summary = {
-            'total_batches': len(batches),
+            'total_batches': len(per_batch),
             'total_ledgers_processed': 0,
             'total_monthly_gain': 0,
             'total_monthly_loss': 0,
@@ -2336,64 +2635,35 @@ def api_analytics_summary():
             'batches': [],
         }
 
-        total_resolved = 0
         total_churned = 0
         total_presumed_staying = 0
 
-        for batch in batches:
-            ledgers = session.query(ECRIBatchLedger).filter_by(batch_id=batch.batch_id).all()
-            outcomes = session.query(ECRIOutcome).filter_by(batch_id=batch.batch_id).all()
-
-            outcome_map = {o.ledger_id: o for o in outcomes}
-            batch_gain = 0
-            batch_loss = 0
-            batch_stayed = 0
-            batch_churned = 0
-            batch_scheduled = 0
-            batch_pending = 0
-
-            for led in ledgers:
-                o = outcome_map.get(led.ledger_id)
-                # Presumed-staying gain: everyone except confirmed churners
-                # contributes their increase_amt to monthly gain. Confirmed stayed
-                # outcomes plus pending ledgers all count toward the upside.
-                cur = getattr(led, 'currency', None) or 'SGD'
-                if o and o.outcome_type in ('moved_out', 'scheduled_out'):
-                    total_resolved += 1
-                    total_churned += 1
-                    batch_loss += _to_sgd(led.new_rent, cur)
-                    if o.outcome_type == 'moved_out':
-                        batch_churned += 1
-                    else:
-                        batch_scheduled += 1
-                else:
-                    batch_gain += _to_sgd(led.increase_amt, cur)
-                    total_presumed_staying += 1
-                    if o and o.outcome_type == 'stayed':
-                        total_resolved += 1
-                        batch_stayed += 1
-                    else:
-                        batch_pending += 1
-
-            summary['total_ledgers_processed'] += len(ledgers)
-            summary['total_monthly_gain'] += batch_gain
-            summary['total_monthly_loss'] += batch_loss
-
-            churn_count = batch_churned + batch_scheduled
-            presumed_staying = batch_stayed + batch_pending
+        for batch_id, b in per_batch.items():
+            # Presumed-staying gain: everyone except confirmed churners
+            # contributes their increase_amt to monthly gain. Confirmed stayed
+            # outcomes plus pending ledgers all count toward the upside.
+            churn_count = b['churned'] + b['scheduled']
+            presumed_staying = b['total'] - churn_count
+            total_churned += churn_count
+            total_presumed_staying += presumed_staying
+
+            summary['total_ledgers_processed'] += b['total']
+            summary['total_monthly_gain'] += b['gain']
+            summary['total_monthly_loss'] += b['loss']
+
             summary['batches'].append({
-                'batch_id': str(batch.batch_id),
-                'name': batch.name,
-                'executed_at': batch.executed_at.isoformat() if batch.executed_at else None,
-                'total_ledgers': len(ledgers),
-                'stayed': batch_stayed,
-                'pending': batch_pending,
-                'churned': batch_churned,
-                'scheduled_out': batch_scheduled,
-                'monthly_gain': round(batch_gain, 2),
-                'monthly_loss': round(batch_loss, 2),
-                'churn_rate': round(churn_count / (presumed_staying + churn_count) * 100, 1)
-                    if (presumed_staying + churn_count) > 0 else None,
+                'batch_id': str(batch_id),
+                'name': b['name'],
+                'executed_at': b['executed_at'].isoformat() if b['executed_at'] else None,
+                'total_ledgers': b['total'],
+                'stayed': b['stayed'],
+                'pending': presumed_staying - b['stayed'],
+                'churned': b['churned'],
+                'scheduled_out': b['scheduled'],
+                'monthly_gain': round(b['gain'], 2),
+                'monthly_loss': round(b['loss'], 2),
+                'churn_rate': round(churn_count / b['total'] * 100, 1)
+                    if b['total'] > 0 else None,
             })
 
         # Churn rate denom = presumed-staying (stayed + pending) + churned/scheduled,
@@ -3180,9 +3450,9 @@ def api_reject_objection(obj_id):
 @ecri_objection_required
 def api_apply_objection(obj_id):
     """Push the approved objection rate to SMD via ScheduleTenantRateChange."""
-    from common.models import ECRIObjection, ECRIBatchLedger, SiteInfo
+    from common.models import ECRIObjection, ECRIBatchLedger
     from common.config import DataLayerConfig
-    from common.soap_client import SOAPClient, SOAPFaultError
+    from common.soap_client import SOAPFaultError
     from web.utils.audit import audit_log, AuditEvent
 
     session = get_pbi_session()
@@ -3207,37 +3477,27 @@ def api_apply_objection(obj_id):
         if not config.soap:
             return jsonify({'error': 'SOAP not configured'}), 500
 
-        site = session.query(SiteInfo).filter_by(SiteID=obj.site_id).first()
-        if not site or not site.SiteCode:
+        site_code = _site_code_map(session, [obj.site_id]).get(int(obj.site_id))
+        if not site_code:
             return jsonify({'error': f'No site code for SiteID {obj.site_id}'}), 500
 
-        cc_url = config.soap.base_url.replace('ReportingWs.asmx', 'CallCenterWs.asmx')
-        soap_client = SOAPClient(
-            base_url=cc_url,
-            corp_code=config.soap.corp_code,
-            corp_user=config.soap.corp_user,
-            api_key=config.soap.api_key,
-            corp_password=config.soap.corp_password,
-            timeout=config.soap.timeout,
-            retries=config.soap.retries,
-        )
-
         new_rent_val = float(obj.new_new_rent)
         payload = {
-            "sLocationCode": site.SiteCode,
+            "sLocationCode": site_code,
             "LedgerID": str(obj.ledger_id),
             "dcNewRate": f"{new_rent_val:.2f}",
             "dScheduledChange": led.effective_date.strftime('%Y-%m-%dT00:00:00') if led.effective_date else datetime.utcnow().strftime('%Y-%m-%dT00:00:00'),
         }
 
         try:
-            api_result = soap_client.call(
-                operation="ScheduleTenantRateChange",
-                parameters=payload,
-                soap_action="http://tempuri.org/CallCenterWs/CallCenterWs/ScheduleTenantRateChange",
-                namespace="http://tempuri.org/CallCenterWs/CallCenterWs",
-                result_tag="RT",
-            )
+            with _soap_client(config.soap) as soap_client:
+                api_result = soap_client.call(
+                    operation="ScheduleTenantRateChange",
+                    parameters=payload,
+                    soap_action="http://tempuri.org/CallCenterWs/CallCenterWs/ScheduleTenantRateChange",
+                    namespace="http://tempuri.org/CallCenterWs/CallCenterWs",
+                    result_tag="RT",
+                )
             ret_code = api_result[0].get('Ret_Code') if api_result else None
             ret_msg = api_result[0].get('Ret_Msg') if api_result else None
 
@@ -3249,8 +3509,6 @@ def api_apply_objection(obj_id):
         except Exception as e:
             current_app.logger.error(f"ECRI apply objection error: {e}")
             return jsonify({'error': 'Failed to push to SMD'}), 500
-        finally:
-            soap_client.close()
 
         # Update objection
         obj.status = 'applied'
@@ -2,11 +2,18 @@
 Main routes - dashboard, landing pages, healthcheck.
 """
 
+import hashlib
+import os
 import sys
+import tempfile
+import threading
+import time
 from datetime import datetime
-from flask import Blueprint, render_template, redirect, url_for, jsonify, current_app, Response, abort
+from flask import Blueprint, render_template, redirect, url_for, jsonify, current_app, Response, abort, request
 from flask_login import login_required, current_user
 
+from web.routes.api import cached
+
 main_bp = Blueprint('main', __name__)
 
 
@@ -21,6 +28,64 @@ CONTENT_TYPES = {
 }
 
 
+# Served pages per (slug, extension), detached from their session, with the
+# content ETag computed once. Each worker keeps its own copy; an admin edit
+# touches a shared stamp file, and an entry loaded before the stamp's last
+# change is refetched, so every worker drops it (ACL included) on its next hit.
+_PAGE_CACHE_TTL = 60
+_PAGE_CACHE_MAX = 256
+_PAGE_CACHE_STAMP = os.path.join(tempfile.gettempdir(), 'esa-pages.stamp')
+_page_cache = {}
+_page_cache_lock = threading.Lock()
+
+
+def _page_stamp():
+    try:
+        return os.stat(_PAGE_CACHE_STAMP).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def clear_page_cache():
+    """Invalidate cached pages in every worker (call after a page is created,
+    edited or deleted)."""
+    with open(_PAGE_CACHE_STAMP, 'a'):
+        pass
+    os.utime(_PAGE_CACHE_STAMP)
+    with _page_cache_lock:
+        _page_cache.clear()
+
+
+def _load_page(slug, extension):
+    """Return (page, etag) for slug.extension, or (None, None) if it doesn't exist."""
+    key = (slug, extension)
+    now = time.monotonic()
+    stamp = _page_stamp()
+    with _page_cache_lock:
+        hit = _page_cache.get(key)
+    if hit is not None and now - hit[0] < _PAGE_CACHE_TTL and hit[1] == stamp:
+        return hit[2], hit[3]
+
+    from web.models import Page
+
+    session = current_app.get_db_session()
+    try:
+        page = session.query(Page).filter_by(slug=slug, extension=extension).first()
+        if page is None:
+            return None, None
+        # Detach so can_view() and content stay readable after close.
+        session.expunge(page)
+    finally:
+        session.close()
+
+    etag = hashlib.md5((page.content or '').encode()).hexdigest()
+    with _page_cache_lock:
+        if len(_page_cache) >= _PAGE_CACHE_MAX:
+            _page_cache.clear()
+        _page_cache[key] = (now, stamp, page, etag)
+    return page, etag
+
+
 @main_bp.route('/robots.txt')
 def robots_txt():
     """Block all search engine crawling — this is an internal backend."""
@@ -63,9 +128,15 @@ def dashboard():
 
 
 @main_bp.route('/healthcheck')
+@cached(ttl_seconds=5, stale_seconds=0)
 def healthcheck():
-    """System health check endpoint."""
-    import requests
+    """System health check endpoint.
+
+    Load balancers and dashboards poll this every few seconds; the shared
+    response cache lets one probe per 5s serve all of them. The scheduler
+    status comes from the sync daemon's heartbeat row (web.utils.health).
+    """
+    from web.utils.health import scheduler_status
 
     # Check database connection
     db_status = 'unknown'
@@ -79,15 +150,8 @@ def healthcheck():
         current_app.logger.error(f"Database health check failed: {e}")
         db_status = 'error'
 
-    # Check scheduler API
-    scheduler_status = 'unknown'
-    try:
-        resp = requests.get('http://127.0.0.1:5000/api/status', timeout=2)
-        if resp.status_code == 200:
-            data = resp.json()
-            scheduler_status = data.get('status', 'unknown')
-    except Exception:
-        scheduler_status = 'unavailable'
+    # Sync daemon, from its heartbeat
+    sched_status, sched_stale = scheduler_status()
 
     # Calculate uptime
     uptime_seconds = None
@@ -98,7 +162,8 @@ def healthcheck():
         'status': 'healthy',
         'python_version': sys.version,
         'database': db_status,
-        'scheduler': scheduler_status,
+        'scheduler': sched_status,
+        'scheduler_stale': sched_stale,
         'uptime_seconds': uptime_seconds,
         'timestamp': datetime.utcnow().isoformat()
     })
@@ -125,23 +190,22 @@ def serve_page(slug, extension):
     """
     Serve dynamic pages stored in database.
     URLs like /ops.html, /report.json, /styles.css
-    """
-    from web.models import Page
 
-    session = current_app.get_db_session()
-    try:
-        page = session.query(Page).filter_by(slug=slug, extension=extension).first()
+    Responses carry a content ETag; a client revalidating with a matching
+    If-None-Match gets an empty 304 (after the access check).
+    """
+    page, etag = _load_page(slug, extension)
 
-        if not page:
-            abort(404)
+    if not page:
+        abort(404)
 
-        # Check if user can view the page
-        if not page.can_view(current_user):
-            if not current_user.is_authenticated:
-                return redirect(url_for('auth.login'))
-            abort(403)
+    # Check if user can view the page
+    if not page.can_view(current_user):
+        if not current_user.is_authenticated:
+            return redirect(url_for('auth.login'))
+        abort(403)
 
-        content_type = CONTENT_TYPES.get(extension, 'text/plain; charset=utf-8')
-        return Response(page.content or '', mimetype=content_type)
-    finally:
-        session.close()
+    content_type = CONTENT_TYPES.get(extension, 'text/plain; charset=utf-8')
+    response = Response(page.content or '', mimetype=content_type)
+    response.set_etag(etag)
+    return response.make_conditional(request)
@@ -6,7 +6,6 @@ GET  /api/smart-lock/refresh/<chain_id> — poll aggregated status
 """
 
 import logging
-import threading
 import uuid
 from datetime import datetime, timedelta
 
@@ -113,12 +112,8 @@ def refresh():
     finally:
         db.close()
 
-    threading.Thread(
-        target=_run_chain,
-        args=(site_ids, chain_id, user_id),
-        daemon=True,
-        name=f'smartlock-refresh-{chain_id[:8]}',
-    ).start()
+    from sync_service.executor import get_executor
+    get_executor().submit_background(_run_chain, site_ids, chain_id, user_id)
 
     return jsonify({
         'chain_id': chain_id,
@@ -132,6 +127,7 @@ def refresh():
 def refresh_status(chain_id):
     mw_session = current_app.get_middleware_session()
     try:
+        # Served by the idx_sync_runs_chain_id expression index.
         rows = mw_session.execute(
             text("""
                 SELECT pipeline_name, status, started_at, completed_at
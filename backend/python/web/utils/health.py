@@ -17,6 +17,11 @@ _health_cache = {'body': None, 'status': None, 'expires_at': 0.0}
 _health_cache_lock = Lock()
 _HEALTH_CACHE_TTL = 5  # seconds
 
+# The sync daemon writes mw_sync_service_state.last_heartbeat every 30s; three
+# missed beats means it is gone even if the row still says 'running' (same
+# threshold as the orchestrator /status endpoint).
+_SCHEDULER_HEARTBEAT_STALE = 90  # seconds
+
 
 def run_health_checks():
     """
@@ -134,3 +139,33 @@ def run_health_checks():
         _health_cache['expires_at'] = time.monotonic() + _HEALTH_CACHE_TTL
 
     return body, http_status
+
+
+_SCHEDULER_STATE_SQL = text(
+    "SELECT status, last_heartbeat FROM mw_sync_service_state WHERE id = 1"
+)
+
+
+def scheduler_status():
+    """Return (status, stale) for the sync daemon from its state row.
+
+    One indexed read of the singleton row, no HTTP. stale is True when the
+    heartbeat is missing or older than three beats. ('unknown', True) before
+    the daemon has ever written its row; ('unavailable', True) if the read
+    fails.
+    """
+    from sync_service.config import session_scope
+
+    try:
+        with session_scope() as session:
+            row = session.execute(_SCHEDULER_STATE_SQL).first()
+    except Exception as e:
+        logger.warning("Health check: scheduler state read failed: %s", e)
+        return 'unavailable', True
+    if row is None:
+        return 'unknown', True
+    status, heartbeat = row
+    if heartbeat is None:
+        return status, True
+    age = (datetime.now(timezone.utc) - heartbeat).total_seconds()
+    return status, age > _SCHEDULER_HEARTBEAT_STALE
@@ -0,0 +1,79 @@
+"""
+orjson-backed JSON provider for Flask.
+
+orjson is optional: when it is not installed, create_app keeps Flask's
+DefaultJSONProvider and nothing changes. When it is, jsonify() encodes
+through orjson while keeping the default provider's output contract:
+
+  - keys sorted (Flask's sort_keys=True)
+  - datetime/date rendered as HTTP dates, Decimal as str, dataclasses as
+    dicts — via Flask's own default() hook, so the wire format for those
+    types is identical
+  - NaN/Infinity become null rather than the stdlib's non-standard tokens
+  - anything orjson refuses (ints beyond 64 bits, unserializable objects)
+    or any call with json.dumps kwargs beyond compact separators (e.g.
+    debug-mode indent) is handed to the stdlib path, which raises exactly
+    as before
+
+response() (what jsonify() calls) hands orjson's bytes, trailing newline
+included, straight to the Response instead of decoding to str and having
+Werkzeug encode it again — on the multi-thousand-row statistics payloads
+that round trip was a full extra copy of the body.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# What DefaultJSONProvider.response() passes outside debug mode; orjson's
+# output is already compact.
+_COMPACT_SEPARATORS = (',', ':')
+
+if orjson is not None:
+    _ORJSON_OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider whose dumps() goes through orjson when it can."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        extra = set(kwargs) - {'separators'}
+        if not extra and kwargs.get('separators', _COMPACT_SEPARATORS) == _COMPACT_SEPARATORS:
+            try:
+                return orjson.dumps(
+                    obj, default=self.default, option=_ORJSON_OPTIONS
+                ).decode()
+            except orjson.JSONEncodeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(
+                obj, default=self.default,
+                option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE,
+            )
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def install_json_provider(app) -> bool:
+    """Switch `app` to OrjsonProvider if orjson is importable."""
+    if orjson is None:
+        return False
+    app.json_provider_class = OrjsonProvider
+    app.json = OrjsonProvider(app)
+    return True
@@ -154,58 +154,71 @@ class RateLimiter:
         Returns (is_limited: bool, retry_after: int | None).
         Raises on Redis error so the caller can fall back.
         """
+        return self._redis_is_limited_many([(key, max_attempts, window_seconds)])[0]
+
+    def _redis_is_limited_many(self, checks):
+        """
+        _redis_is_limited for several (key, max_attempts, window_seconds)
+        checks in one pipeline, i.e. one Redis round trip.
+        Raises on Redis error.
+        """
         client = _get_redis()
         if client is None:
             raise RuntimeError("Redis not available")
 
-        rk = self._redis_key(key)
         now = time.time()
-        cutoff = now - window_seconds
-
         pipe = client.pipeline()
-        # Remove expired entries
-        pipe.zremrangebyscore(rk, '-inf', cutoff)
-        # Count remaining
-        pipe.zcard(rk)
-        # Fetch oldest score (needed for retry_after calculation)
-        pipe.zrange(rk, 0, 0, withscores=True)
-        # Set TTL so keys clean themselves up
-        pipe.expire(rk, window_seconds + 10)
+        for key, _, window_seconds in checks:
+            rk = self._redis_key(key)
+            # Remove expired entries
+            pipe.zremrangebyscore(rk, '-inf', now - window_seconds)
+            # Count remaining
+            pipe.zcard(rk)
+            # Fetch oldest score (needed for retry_after calculation)
+            pipe.zrange(rk, 0, 0, withscores=True)
+            # Set TTL so keys clean themselves up
+            pipe.expire(rk, window_seconds + 10)
         results = pipe.execute()
 
-        count = results[1]
-        if count >= max_attempts:
-            oldest_entries = results[2]
-            if oldest_entries:
-                oldest_score = oldest_entries[0][1]
-                retry_after = int((oldest_score + window_seconds) - now) + 1
+        verdicts = []
+        for i, (_, max_attempts, window_seconds) in enumerate(checks):
+            count = results[4 * i + 1]
+            if count >= max_attempts:
+                oldest_entries = results[4 * i + 2]
+                if oldest_entries:
+                    oldest_score = oldest_entries[0][1]
+                    retry_after = int((oldest_score + window_seconds) - now) + 1
+                else:
+                    retry_after = 1
+                verdicts.append((True, max(retry_after, 1)))
             else:
-                retry_after = 1
-            return True, max(retry_after, 1)
-
-        return False, None
+                verdicts.append((False, None))
+        return verdicts
 
     def _redis_record(self, key: str, window_seconds: int) -> None:
         """
         Record one attempt in the Redis sorted set.
         Raises on Redis error.
         """
+        self._redis_record_many([key], window_seconds)
+
+    def _redis_record_many(self, keys, window_seconds: int) -> None:
+        """Record one attempt for each key in a single pipeline. Raises on Redis error."""
         client = _get_redis()
         if client is None:
             raise RuntimeError("Redis not available")
 
-        rk = self._redis_key(key)
         now = time.time()
-
-        # Use counter suffix to keep members unique at the same timestamp
-        with self._lock:
-            self._counters[key] += 1
-            suffix = self._counters[key]
-
-        member = f"{now:.6f}:{suffix}"
         pipe = client.pipeline()
-        pipe.zadd(rk, {member: now})
-        pipe.expire(rk, window_seconds + 10)
+        for key in keys:
+            # Use counter suffix to keep members unique at the same timestamp
+            with self._lock:
+                self._counters[key] += 1
+                suffix = self._counters[key]
+
+            rk = self._redis_key(key)
+            pipe.zadd(rk, {f"{now:.6f}:{suffix}": now})
+            pipe.expire(rk, window_seconds + 10)
         pipe.execute()
 
     def _redis_reset(self, key: str) -> None:
@@ -273,6 +286,31 @@ class RateLimiter:
         except Exception:
             self._mem_record(key)
 
+    def is_rate_limited_many(self, checks):
+        """
+        is_rate_limited() for several (key, max_attempts, window_seconds)
+        checks at once — one Redis round trip instead of one per key.
+
+        Returns:
+            list of (is_limited, retry_after_seconds) in the order of `checks`
+        """
+        global _redis_log_warned
+        try:
+            return self._redis_is_limited_many(checks)
+        except Exception:
+            if not _redis_log_warned:
+                logger.warning("Rate limiter Redis check failed — using in-memory fallback")
+                _redis_log_warned = True
+            return [self._mem_is_limited(*check) for check in checks]
+
+    def record_attempts(self, keys, window_seconds: int = 3600) -> None:
+        """record_attempt() for several keys in one Redis round trip."""
+        try:
+            self._redis_record_many(keys, window_seconds)
+        except Exception:
+            for key in keys:
+                self._mem_record(key)
+
     def reset(self, key: str) -> None:
         """Reset attempts for a key (e.g. on successful login)."""
         try:
@@ -317,11 +355,14 @@ def rate_limit_login(max_attempts: int = 5, window_seconds: int = 300):
             ip = get_client_ip()
             username = request.form.get('username', '').strip().lower()
 
-            # Check IP-based rate limit (2× headroom for shared IPs)
-            ip_key = f"ip:{ip}"
-            is_limited, retry_after = login_limiter.is_rate_limited(
-                ip_key, max_attempts * 2, window_seconds
-            )
+            # IP limit (2× headroom for shared IPs) and, if a username was
+            # given, the per-account limit — checked in one round trip.
+            checks = [(f"ip:{ip}", max_attempts * 2, window_seconds)]
+            if username:
+                checks.append((f"user:{username}", max_attempts, window_seconds))
+            verdicts = login_limiter.is_rate_limited_many(checks)
+
+            is_limited, retry_after = verdicts[0]
             if is_limited:
                 current_app.logger.warning("Rate limit exceeded for IP %s", ip)
                 from flask import flash, render_template
@@ -331,12 +372,8 @@ def rate_limit_login(max_attempts: int = 5, window_seconds: int = 300):
                 )
                 return render_template('login.html'), 429
 
-            # Check username-based rate limit (if username provided)
             if username:
-                user_key = f"user:{username}"
-                is_limited, retry_after = login_limiter.is_rate_limited(
-                    user_key, max_attempts, window_seconds
-                )
+                is_limited, retry_after = verdicts[1]
                 if is_limited:
                     current_app.logger.warning(
                         "Rate limit exceeded for user '%s'", username
@@ -386,10 +423,10 @@ def rate_limit_api(max_requests: int = 30, window_seconds: int = 60):
 
 def record_failed_login(username: str = None) -> None:
     """Record a failed login attempt (IP and optionally username)."""
-    ip = get_client_ip()
-    login_limiter.record_attempt(f"ip:{ip}", window_seconds=300)
+    keys = [f"ip:{get_client_ip()}"]
     if username:
-        login_limiter.record_attempt(f"user:{username.lower()}", window_seconds=300)
+        keys.append(f"user:{username.lower()}")
+    login_limiter.record_attempts(keys, window_seconds=300)
 
 
 def reset_login_attempts(username: str = None) -> None: